@@ -2,6 +2,7 @@ from Domain.Repository.Prediction import InterfasePrediction
 from Core.Api.Request import Request
 from Core.Api.Response import Response
 from Application.Serializer.Prediction import PredictionSerializer
+from Core.NeuronalNetwork import ModelNotReady, PREDICT_MAX_INPUTS
 
 
 interfase = InterfasePrediction()
@@ -15,6 +16,36 @@ def create_prediction(req: Request, res: Response):
         prediction = interfase.create_for_user(user_id, prompt)
         send = PredictionSerializer.from_model(prediction)
         res.json({"data": send}, 201)
+    except ModelNotReady as e:
+        res.headers["Retry-After"] = "1"
+        res.json({"message": "Model not ready", "state": e.state, "error": e.error}, 503)
+    except Exception as e:
+        res.json({"message": "Error with Server", "error": str(e)}, 500)
+
+
+def create_predictions_batch(req: Request, res: Response):
+    user_id = req.body["user"]
+    prompts = req.body["prompts"]
+
+    if not isinstance(prompts, list) or not prompts:
+        return res.json({"message": "prompts must be a non-empty list"}, 400)
+    if len(prompts) > PREDICT_MAX_INPUTS:
+        return res.json(
+            {"message": f"prompts accepts at most {PREDICT_MAX_INPUTS} values"}, 413
+        )
+    if any(
+        isinstance(prompt, bool) or not isinstance(prompt, (int, float))
+        for prompt in prompts
+    ):
+        return res.json({"message": "prompts must contain only numbers"}, 400)
+
+    try:
+        predictions = interfase.create_many_for_user(user_id, prompts)
+        send = PredictionSerializer.from_model(predictions, many=True)
+        res.json({"data": send}, 201)
+    except ModelNotReady as e:
+        res.headers["Retry-After"] = "1"
+        res.json({"message": "Model not ready", "state": e.state, "error": e.error}, 503)
     except Exception as e:
         res.json({"message": "Error with Server", "error": str(e)}, 500)
 
@@ -26,8 +57,9 @@ def get_by_user(req: Request, res: Response):
         return res.json({"message": "User parameter required"}, 400)
 
     try:
-        predictions = interfase.get_by_user(user)
-        if len(predictions) == 0:
+        predictions = interfase.get_records_by_user(user)
+        # Un solo SELECT: el serializer reutiliza el resultado ya evaluado
+        if not predictions:
             res.json({"message": "User don`t have Predictions"}, 400)
         else:
             send = PredictionSerializer.from_model(predictions, many=True)
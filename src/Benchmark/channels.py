@@ -0,0 +1,182 @@
+"""
+Benchmark del servidor WebSocket.
+
+Levanta `src/__main__.py` con el servidor WebSocket, abre miles de
+conexiones ociosas (handshake + evento 'connected') y reporta el tiempo,
+la memoria y los threads del servidor. Con esas conexiones abiertas, un
+grupo de clientes activos envía eventos 'ping' en ráfaga (fan-in) y se
+mide cuántos pong/s responde el servidor.
+
+    python src/Benchmark/channels.py --idle 5000 --active 100 --messages 200
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import resource
+import socket
+import struct
+import subprocess
+import sys
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def proc_status(pid: int) -> dict:
+    """VmRSS (KB) y Threads del proceso, leídos de /proc"""
+    values = {}
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "Threads"):
+                values[key] = int(value.split()[0])
+    return values
+
+
+def raise_fd_limit(needed: int):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+
+def wait_port(port: int, timeout: float = 30) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def client_frame(payload: bytes) -> bytes:
+    mask = os.urandom(4)
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return struct.pack(">BB", 0x81, 0x80 | len(payload)) + mask + masked
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    header = await reader.readexactly(2)
+    length = header[1] & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", await reader.readexactly(8))[0]
+    return await reader.readexactly(length)
+
+
+async def open_client(port: int):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(
+        (
+            "GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode()
+    )
+    await reader.readuntil(b"\r\n\r\n")
+    await read_frame(reader)  # 'connected'
+    return reader, writer
+
+
+async def open_many(port: int, total: int, concurrency: int = 200):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            return await open_client(port)
+
+    return await asyncio.gather(*(one() for _ in range(total)))
+
+
+async def fan_in(clients, messages: int) -> int:
+    """Cada cliente envía `messages` pings seguidos y espera sus pongs"""
+    ping = client_frame(json.dumps({"event": "ping", "data": {}}).encode())
+
+    async def one(reader, writer):
+        writer.write(ping * messages)
+        await writer.drain()
+        for _ in range(messages):
+            assert json.loads(await read_frame(reader))["event"] == "pong"
+        return messages
+
+    return sum(await asyncio.gather(*(one(r, w) for r, w in clients)))
+
+
+async def run(port: int, pid: int, args):
+    before = proc_status(pid)
+
+    begin = time.perf_counter()
+    idle = await open_many(port, args.idle)
+    elapsed = time.perf_counter() - begin
+    await asyncio.sleep(0.5)
+    after = proc_status(pid)
+
+    rss = (after["VmRSS"] - before["VmRSS"]) / 1024
+    print(f"conexiones ociosas: {args.idle} en {elapsed:.2f}s ({args.idle / elapsed:.0f}/s)")
+    print(
+        f"memoria del servidor: +{rss:.1f} MB "
+        f"({(after['VmRSS'] - before['VmRSS']) / args.idle:.1f} KB por conexión)"
+    )
+    print(f"threads del servidor: {before['Threads']} -> {after['Threads']}")
+
+    active = await open_many(port, args.active)
+    begin = time.perf_counter()
+    total = await fan_in(active, args.messages)
+    elapsed = time.perf_counter() - begin
+    print(
+        f"fan-in: {args.active} clientes x {args.messages} pings = {total} "
+        f"en {elapsed:.2f}s ({total / elapsed:.0f} mensajes/s)"
+    )
+
+    for _, writer in idle + active:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--idle", type=int, default=5000, help="Conexiones ociosas")
+    parser.add_argument("--active", type=int, default=100, help="Clientes activos")
+    parser.add_argument("--messages", type=int, default=200, help="Pings por cliente")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8200)
+    args = parser.parse_args()
+
+    raise_fd_limit(2 * (args.idle + args.active) + 256)
+    ws_port = args.port + 1
+    command = [
+        sys.executable,
+        os.path.join(SRC, "__main__.py"),
+        "--mode",
+        "async",
+        "--port",
+        str(args.port),
+        "--ws-port",
+        str(ws_port),
+        "--threads",
+        str(args.threads),
+    ]
+    env = dict(os.environ, PYTHONPATH=SRC)
+    server = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_port(ws_port):
+            print("el servidor WebSocket no quedó listo")
+            return
+        asyncio.run(run(ws_port, server.pid, args))
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+if __name__ == "__main__":
+    main()
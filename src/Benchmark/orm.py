@@ -0,0 +1,193 @@
+"""
+Benchmark de escrituras del ORM sobre `Prediction`.
+
+Compara `Prediction.create` fila por fila (un commit por fila) contra
+`bulk_create` y `bulk_update`, sobre una base SQLite temporal en disco, y
+mide leer e hidratar todas las filas con `Prediction.all()` frente a la
+versión anterior de `_from_db` (sqlite3.Row y setattr por columna), los
+modos de solo lectura (`records()`, `values_list()`) en tiempo y memoria, y
+el pico de memoria de recorrer la tabla con `iterator()` frente a `execute()`.
+
+    python src/Benchmark/orm.py --rows 100000 --create-rows 5000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from Domain.Model.User import User
+from Domain.Model.Predicts import Prediction
+
+
+def setup(path: str):
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    for model in (User, Prediction):
+        model.setup_db(db)
+        model.create_table()
+    user = User.create(username="bench", password="bench")
+    return db, user.id
+
+
+def rows(user_id: int, count: int):
+    return [
+        Prediction(user=user_id, prompt=i % 24 / 2, response=50 + i % 50)
+        for i in range(count)
+    ]
+
+
+def legacy_from_db(cls, row, description):
+    """Hidratación anterior: recorre description y hace setattr por columna"""
+    obj = cls.__new__(cls)
+    obj._is_new = False
+
+    for i, col in enumerate(description):
+        name = col[0]
+        value = row[i]
+
+        if name in cls._fields:
+            field = cls._fields[name]
+            value = field.to_python(value)
+
+        setattr(obj, name, value)
+
+    for name, field in cls._many_to_many_fields.items():
+        setattr(obj, name, field.get_manager(obj))
+
+    return obj
+
+
+def legacy_all(db):
+    """Camino anterior de QuerySet.execute: filas sqlite3.Row + _from_db por fila"""
+    cursor = db.cursor()
+    cursor.execute(Prediction._select_sql)
+    return [
+        legacy_from_db(Prediction, row, cursor.description) for row in cursor.fetchall()
+    ]
+
+
+def memory_per_row(func) -> float:
+    """Bytes retenidos por fila del resultado de `func`"""
+    tracemalloc.start()
+    result = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / max(len(result), 1)
+
+
+def peak_memory(func) -> int:
+    """Pico de memoria (bytes) mientras corre `func`"""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def scan(rows) -> int:
+    total = 0
+    for row in rows:
+        total += row.response
+    return total
+
+
+def timed(label: str, count: int, func):
+    begin = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - begin
+    print(f"{label:<28} {count:>7} filas  {elapsed:>8.3f} s  {count / elapsed:>10.0f} filas/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--create-rows",
+        type=int,
+        default=None,
+        help="Filas para el camino create() (por defecto --rows; es lento)",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    create_rows = args.create_rows or args.rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = setup(os.path.join(tmp, "bench.db"))
+
+        def create_path():
+            for i in range(create_rows):
+                Prediction.create(user=user_id, prompt=i % 24 / 2, response=50 + i % 50)
+
+        create = timed("create() por fila", create_rows, create_path)
+
+        objs = rows(user_id, args.rows)
+        bulk = timed(
+            f"bulk_create(batch={args.batch_size})",
+            args.rows,
+            lambda: Prediction.bulk_create(objs, batch_size=args.batch_size),
+        )
+
+        for obj in objs:
+            obj.response += 1
+        timed(
+            f"bulk_update(batch={args.batch_size})",
+            args.rows,
+            lambda: Prediction.bulk_update(
+                objs, ["response"], batch_size=args.batch_size
+            ),
+        )
+
+        total = Prediction.all().count()
+        legacy_all(db)  # calienta el cache de páginas
+        legacy = timed("all() con _from_db anterior", total, lambda: legacy_all(db))
+        fast = timed("all() con _hydrate", total, lambda: Prediction.all().execute())
+        print(f"_hydrate es {legacy / fast:.1f}x más rápido")
+
+        from Core.Serializer import Serializer
+
+        timed("records()", total, lambda: Prediction.all().records().execute())
+        timed("values_list()", total, lambda: Prediction.all().values_list().execute())
+        instances = Prediction.all().execute()
+        records = Prediction.all().records().execute()
+        slow = timed(
+            "serialize_many(instancias)",
+            total,
+            lambda: Serializer.serialize_many(instances),
+        )
+        quick = timed(
+            "serialize_many(records)", total, lambda: Serializer.serialize_many(records)
+        )
+        print(f"serialize_many con records es {slow / quick:.1f}x más rápido")
+        del instances, records
+
+        heavy = memory_per_row(lambda: Prediction.all().execute())
+        light = memory_per_row(lambda: Prediction.all().records().execute())
+        print(
+            f"memoria por fila: instancia {heavy:.0f} B, record {light:.0f} B "
+            f"({heavy / light:.1f}x menos)"
+        )
+
+        full = peak_memory(lambda: scan(Prediction.all().execute()))
+        streamed = peak_memory(lambda: scan(Prediction.all().iterator(2000)))
+        print(
+            f"pico al recorrer la tabla: execute() {full / 1e6:.1f} MB, "
+            f"iterator(2000) {streamed / 1e6:.1f} MB"
+        )
+
+        per_row_create = create / create_rows
+        per_row_bulk = bulk / args.rows
+        print(f"bulk_create es {per_row_create / per_row_bulk:.0f}x más rápido por fila")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark de `Router.find_route`.
+
+Registra unos cientos de rutas sintéticas y compara la búsqueda lineal
+original (urlparse + una regex por ruta) con el árbol de segmentos, con y
+sin el cache de resultados.
+
+    python src/Benchmark/router.py --routes 300 --lookups 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import urllib.parse
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+
+def linear_find_route(router, method: str, path: str):
+    """Implementación anterior: prueba cada regex del método en orden"""
+    clean_path = urllib.parse.urlparse(path).path
+    for route in router.routes.get(method, []):
+        match = route["pattern"].match(clean_path)
+        if match:
+            return route["handler"], match.groupdict()
+    return None, {}
+
+
+def build_router(count: int):
+    from Core.Api.Router import Router
+    from Core.Logger import Logger
+
+    # El log de cada ruta registrada no interesa aquí
+    success, Logger.success = Logger.success, lambda *args, **kwargs: None
+    try:
+        router = Router()
+        handler = lambda req, res: None
+        for i in range(count):
+            kind = i % 3
+            if kind == 0:
+                router.get(f"/static/section{i}/page")(handler)
+            elif kind == 1:
+                router.get(f"/api/v{i % 5}/resource{i}/:id")(handler)
+            else:
+                router.get(f"/api/v{i % 5}/resource{i}/:id/items/:item")(handler)
+    finally:
+        Logger.success = success
+    return router
+
+
+def sample_paths(count: int, lookups: int, unique: int, seed: int = 7):
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(unique):
+        i = rng.randrange(count)
+        kind = i % 3
+        if kind == 0:
+            paths.append(f"/static/section{i}/page")
+        elif kind == 1:
+            paths.append(f"/api/v{i % 5}/resource{i}/{rng.randrange(10**6)}?x=1")
+        else:
+            paths.append(f"/api/v{i % 5}/resource{i}/{rng.randrange(100)}/items/a")
+    return [paths[rng.randrange(unique)] for _ in range(lookups)]
+
+
+def measure(find, paths: list[str]) -> float:
+    """Latencia media por búsqueda en µs"""
+    begin = time.perf_counter()
+    for path in paths:
+        find("GET", path)
+    return (time.perf_counter() - begin) / len(paths) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routes", type=int, default=300)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument(
+        "--unique", type=int, default=200, help="Paths distintos en la muestra"
+    )
+    args = parser.parse_args()
+
+    router = build_router(args.routes)
+    paths = sample_paths(args.routes, args.lookups, args.unique)
+
+    for path in paths[:200]:
+        assert router.find_route("GET", path) == linear_find_route(
+            router, "GET", path
+        )
+
+    linear = measure(lambda m, p: linear_find_route(router, m, p), paths)
+
+    uncached = build_router(args.routes)
+    uncached._lookup = uncached._resolve
+    tree = measure(uncached.find_route, paths)
+
+    cached = measure(router.find_route, paths)
+
+    print(f"{args.routes} rutas, {args.lookups} búsquedas ({args.unique} paths)")
+    print(f"lineal (regex)      {linear:>8.2f} µs/búsqueda")
+    print(f"árbol               {tree:>8.2f} µs/búsqueda  ({linear / tree:.1f}x)")
+    print(f"árbol + cache LRU   {cached:>8.2f} µs/búsqueda  ({linear / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Load test de los modos del servidor HTTP.
+
+Levanta `src/__main__.py` en cada modo (single, threaded, prefork, async),
+dispara peticiones concurrentes contra `/`, `/predictions` y
+`/user/me/:name` y reporta requests/seg y latencias p50/p99.
+
+    python src/Benchmark/server.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+BENCH_USER = "bench"
+
+
+def ensure_user():
+    """Crea el usuario del benchmark directamente con el ORM"""
+    from Domain.Service.User import UserService
+
+    service = UserService()
+    user = service.get_by_username(BENCH_USER)
+    if user is None:
+        user = service.create_user(BENCH_USER, BENCH_USER)
+    return user.id
+
+
+def request(port: int, method: str, path: str, body: dict = None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload else {}
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    return response.status
+
+
+def wait_ready(port: int, timeout: float = 30):
+    """Espera a que el servidor responda y, si es posible, a que el modelo cargue"""
+    up = False
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if request(port, "GET", "/health") == 200:
+                return True
+            up = True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return up
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load(port: int, method: str, path: str, body, total: int, concurrency: int):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    remaining = [total]
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            begin = time.perf_counter()
+            try:
+                status = request(port, method, path, body)
+                ok = status < 500
+            except OSError:
+                ok = False
+            elapsed = time.perf_counter() - begin
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    begin = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - begin
+
+    return {
+        "rps": total / wall,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors[0],
+    }
+
+
+def run_mode(mode: str, port: int, args, user_id: int):
+    command = [
+        sys.executable,
+        os.path.join(SRC, "__main__.py"),
+        "--mode",
+        mode,
+        "--port",
+        str(port),
+        "--threads",
+        str(args.threads),
+        "--ws-port",
+        "0",
+    ]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+
+    env = dict(os.environ, PYTHONPATH=SRC)
+    server = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_ready(port):
+            print(f"{mode:<9} el servidor no quedó listo, se omite")
+            return
+
+        endpoints = [
+            ("GET", "/", None),
+            ("POST", "/predictions", {"user": user_id, "prompt": 5}),
+            ("GET", f"/user/me/{BENCH_USER}", None),
+        ]
+        for method, path, body in endpoints:
+            result = load(port, method, path, body, args.requests, args.concurrency)
+            print(
+                f"{mode:<9} {method:<5} {path:<22} "
+                f"{result['rps']:>9.1f} req/s  "
+                f"p50 {result['p50_ms']:>7.2f} ms  "
+                f"p99 {result['p99_ms']:>7.2f} ms  "
+                f"errores {result['errors']}"
+            )
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--modes", nargs="+", default=["single", "threaded", "prefork", "async"]
+    )
+    args = parser.parse_args()
+
+    user_id = ensure_user()
+    for offset, mode in enumerate(args.modes):
+        run_mode(mode, args.port + offset, args, user_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark de la máscara de los frames WebSocket.
+
+Compara el XOR byte a byte (como estaba) con int.from_bytes, con numpy y con
+`Core.Channels.Frame.unmask` (que usa uno u otro según el tamaño), para
+payloads de 1 KB, 64 KB y 1 MB. También mide FrameParser completo con
+frames de esos tamaños.
+
+    python src/Benchmark/unmask.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from Core.Channels.Frame import FrameParser, unmask
+
+SIZES = (1024, 64 * 1024, 1024 * 1024)
+
+
+def unmask_loop(data, mask: bytes) -> bytes:
+    """Implementación anterior: un XOR por byte en Python"""
+    payload = bytearray(data)
+    for i in range(len(payload)):
+        payload[i] ^= mask[i % 4]
+    return bytes(payload)
+
+
+def unmask_int(data, mask: bytes) -> bytes:
+    length = len(data)
+    key = (mask * (length // 4 + 1))[:length]
+    value = int.from_bytes(data, "little") ^ int.from_bytes(key, "little")
+    return value.to_bytes(length, "little")
+
+
+def unmask_numpy(data, mask: bytes) -> bytes:
+    length = len(data)
+    payload = np.frombuffer(data, dtype=np.uint8).copy()
+    key = np.resize(np.frombuffer(mask, dtype=np.uint8), length)
+    payload ^= key
+    return payload.tobytes()
+
+
+def client_frame(payload: bytes, mask: bytes) -> bytes:
+    header = bytes([0x82, 0x80 | 127]) + len(payload).to_bytes(8, "big")
+    return header + mask + unmask(payload, mask)
+
+
+def measure(func, budget: float) -> float:
+    """Segundos por llamada, repitiendo hasta gastar ~`budget` segundos"""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= budget:
+            return elapsed / number
+        number *= 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=0.2, help="Segundos por medida")
+    args = parser.parse_args()
+
+    candidates = [
+        ("loop (antes)", unmask_loop),
+        ("int.from_bytes", unmask_int),
+        ("numpy uint8", unmask_numpy),
+        ("unmask", unmask),
+    ]
+
+    print(f"{'tamaño':>8}  {'implementación':<15} {'por llamada':>12} {'MB/s':>9}")
+    for size in SIZES:
+        data = os.urandom(size)
+        mask = os.urandom(4)
+        view = memoryview(data)
+        expected = unmask_loop(view, mask)
+        base = None
+        for name, func in candidates:
+            assert func(view, mask) == expected, name
+            seconds = measure(lambda: func(view, mask), args.budget)
+            base = base or seconds
+            print(
+                f"{size // 1024:>6}KB  {name:<15} {seconds * 1e6:>10.1f}us "
+                f"{size / seconds / 1e6:>9.1f}  ({base / seconds:.0f}x)"
+            )
+
+        frame = client_frame(data, mask)
+
+        def parse():
+            frames = FrameParser(max_message_size=size)
+            frames.feed(frame)
+            return frames.next_frame()
+
+        assert parse()[1] == data
+        seconds = measure(parse, args.budget)
+        print(f"{size // 1024:>6}KB  {'FrameParser':<15} {seconds * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,13 @@
-import json, urllib
+from .body import (
+    BodyStream,
+    RequestBodyError,
+    MAX_BODY_SIZE,
+    STREAM_CHUNK_SIZE,
+    iter_json_array,
+    loads,
+)
+
+import urllib
 
 
 class Request:
@@ -11,24 +20,55 @@ class Request:
         self.headers = handler.headers
         self.client_ip = handler.client_address[0]
         self._body = None
+        self._stream = None
+        self._body_error = None
         self._params = {}
         self._query = {}
 
+    @property
+    def max_body_size(self) -> int:
+        return getattr(self.handler, "max_body_size", MAX_BODY_SIZE)
+
+    def stream(self) -> BodyStream:
+        """Body como stream de bytes (RequestBodyError 413 si es muy grande)"""
+        if self._stream is None:
+            self._stream = BodyStream(
+                self.handler.rfile, self.headers, self.max_body_size
+            )
+        return self._stream
+
     @property
     def body(self) -> dict[str, any]:
-        """Lee el body JSON de la petición"""
+        """Lee el body JSON de la petición (RequestBodyError si es inválido)"""
         if self._body is None and self.method in ["POST", "PUT", "PATCH"]:
+            if self._body_error is not None:
+                raise self._body_error
             try:
-                content_length = int(self.headers.get("Content-Length", 0))
-                if content_length > 0:
-                    raw_data = self.handler.rfile.read(content_length)
-                    self._body = json.loads(raw_data.decode("utf-8"))
-                else:
-                    self._body = {}
-            except:
-                self._body = {}
+                raw_data = self.stream().readall()
+                self._body = loads(raw_data) if raw_data else {}
+            except RequestBodyError as e:
+                self._body_error = e
+                raise
         return self._body or {}
 
+    def iter_json_array(self, chunk_size: int = STREAM_CHUNK_SIZE):
+        """Itera un body `[...]` elemento a elemento, sin cargarlo completo"""
+        return iter_json_array(self.stream(), chunk_size)
+
+    def drain(self, limit: int) -> bool:
+        """
+        Descarta el body que el handler no leyó para poder reutilizar la
+        conexión. Devuelve False si es mayor que `limit` (hay que cerrarla).
+        """
+        try:
+            if self._stream is None:
+                self._stream = BodyStream(self.handler.rfile, self.headers, limit)
+            while self._stream.read(STREAM_CHUNK_SIZE):
+                pass
+            return True
+        except RequestBodyError:
+            return False
+
     @property
     def params(self) -> dict[str, str]:
         """Parámetros de la URL (ej: /user/:id)"""
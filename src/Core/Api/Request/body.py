@@ -0,0 +1,253 @@
+"""
+Lectura del body de la petición.
+
+El tamaño se valida antes de leer (Content-Length) o mientras se lee
+(chunked), el JSON se parsea directo de los bytes y los arrays grandes se
+pueden consumir elemento a elemento sin materializarlos completos.
+"""
+
+import codecs
+import json
+
+# Body máximo por defecto (bytes)
+MAX_BODY_SIZE = 1024 * 1024
+# Línea máxima con el tamaño de un chunk (hex + extensiones)
+MAX_CHUNK_LINE = 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class RequestBodyError(Exception):
+    """Body inválido: lleva el status HTTP con el que se debe responder"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def is_chunked(headers) -> bool:
+    return "chunked" in (headers.get("Transfer-Encoding") or "").lower()
+
+
+def content_length(headers) -> int:
+    try:
+        length = int(headers.get("Content-Length") or 0)
+    except ValueError:
+        raise RequestBodyError(400, "Content-Length inválido")
+    if length < 0:
+        raise RequestBodyError(400, "Content-Length inválido")
+    return length
+
+
+def parse_chunk_size(line: bytes) -> int:
+    """`1a;ext=1\\r\\n` -> 26"""
+    try:
+        return int(line.split(b";", 1)[0].strip(), 16)
+    except ValueError:
+        raise RequestBodyError(400, "Chunk mal formado")
+
+
+def decode_chunked(buffer, start: int, max_size: int = MAX_BODY_SIZE):
+    """
+    Decodifica un body chunked que ya está en `buffer` desde `start`.
+    Devuelve (body, fin) o None si todavía no llegó completo. Primero solo
+    recorre los tamaños; los datos se copian una vez, al estar completo.
+    """
+    spans, total, pos = [], 0, start
+    while True:
+        eol = buffer.find(b"\r\n", pos)
+        if eol < 0:
+            if len(buffer) - pos > MAX_CHUNK_LINE:
+                raise RequestBodyError(400, "Chunk mal formado")
+            return None
+
+        size = parse_chunk_size(bytes(buffer[pos:eol]))
+        pos = eol + 2
+        if size == 0:
+            break
+
+        total += size
+        if total > max_size:
+            raise RequestBodyError(413, "Body demasiado grande")
+        if len(buffer) < pos + size + 2:
+            return None
+        if buffer[pos + size : pos + size + 2] != b"\r\n":
+            raise RequestBodyError(400, "Chunk mal formado")
+        spans.append((pos, pos + size))
+        pos += size + 2
+
+    # Trailers (se ignoran) hasta la línea vacía
+    while True:
+        eol = buffer.find(b"\r\n", pos)
+        if eol < 0:
+            return None
+        if eol == pos:
+            break
+        pos = eol + 2
+
+    body = b"".join(buffer[begin:end] for begin, end in spans)
+    return body, pos + 2
+
+
+class BodyStream:
+    """
+    Stream de solo lectura sobre el body, con Content-Length o chunked.
+    Lanza RequestBodyError(413) si se pasa de `max_size`.
+    """
+
+    def __init__(self, rfile, headers, max_size: int = MAX_BODY_SIZE):
+        self.rfile = rfile
+        self.max_size = max_size
+        self.chunked = is_chunked(headers)
+        self.total = 0
+        self.done = False
+        # Bytes pendientes del chunk actual (o del body completo)
+        self.remaining = 0
+
+        if not self.chunked:
+            self.remaining = content_length(headers)
+            if self.remaining > max_size:
+                raise RequestBodyError(413, "Body demasiado grande")
+            self.done = self.remaining == 0
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self.rfile.read(size)
+        if len(data) < size:
+            raise RequestBodyError(400, "Body incompleto")
+        return data
+
+    def _next_chunk(self):
+        """Lee la línea de tamaño del siguiente chunk; 0 termina el body"""
+        line = self.rfile.readline(MAX_CHUNK_LINE + 1)
+        if not line.endswith(b"\n"):
+            raise RequestBodyError(400, "Chunk mal formado")
+
+        size = parse_chunk_size(line)
+        if size == 0:
+            # Trailers (se ignoran) hasta la línea vacía
+            while True:
+                line = self.rfile.readline(MAX_CHUNK_LINE + 1)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            self.done = True
+            return
+
+        if self.total + size > self.max_size:
+            raise RequestBodyError(413, "Body demasiado grande")
+        self.total += size
+        self.remaining = size
+
+    def read(self, size: int = -1) -> bytes:
+        """Hasta `size` bytes (todo si es -1); b"" al terminar"""
+        if size < 0:
+            return bytes(self.readall())
+
+        while not self.done and self.remaining == 0:
+            self._next_chunk()
+        if self.done and self.remaining == 0:
+            return b""
+
+        data = self._read_exact(min(size, self.remaining))
+        self.remaining -= len(data)
+        if self.remaining == 0:
+            if not self.chunked:
+                self.done = True
+            elif self._read_exact(2) != b"\r\n":
+                raise RequestBodyError(400, "Chunk mal formado")
+        return data
+
+    def readall(self):
+        """El body completo: una sola lectura si hay Content-Length"""
+        if not self.chunked:
+            data = self._read_exact(self.remaining) if self.remaining else b""
+            self.remaining = 0
+            self.done = True
+            return data
+
+        buffer = bytearray()
+        while True:
+            data = self.read(STREAM_CHUNK_SIZE)
+            if not data:
+                return buffer
+            buffer += data
+
+
+def loads(raw) -> any:
+    """json.loads sobre bytes (sin decodificar a str antes)"""
+    try:
+        return json.loads(raw)
+    except (ValueError, UnicodeDecodeError):
+        raise RequestBodyError(400, "JSON inválido")
+
+
+def iter_json_array(stream, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Itera los elementos de un array JSON leyendo `stream` por partes.
+    Solo se mantiene en memoria el elemento actual y lo que falta parsear.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, eof = "", 0, False
+    state = "start"
+
+    def fill():
+        nonlocal buffer, pos, eof
+        if eof:
+            raise RequestBodyError(400, "JSON incompleto")
+        data = stream.read(chunk_size)
+        try:
+            decoded = text.decode(data, final=not data)
+        except UnicodeDecodeError:
+            raise RequestBodyError(400, "JSON inválido")
+        eof = not data
+        buffer, pos = buffer[pos:] + decoded, 0
+
+    while state != "end":
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos == len(buffer):
+            fill()
+            continue
+
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise RequestBodyError(400, "Se esperaba un array JSON")
+            pos += 1
+            state = "first"
+        elif state in ("first", "sep") and char == "]":
+            pos += 1
+            state = "end"
+        elif state == "sep":
+            if char != ",":
+                raise RequestBodyError(400, "JSON inválido")
+            pos += 1
+            state = "value"
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise RequestBodyError(400, "JSON inválido")
+                fill()
+                continue
+            # Un número cortado (`12` de `123`, `1.5` de `1.5e3`) parsea bien:
+            # solo se acepta si después viene un delimitador
+            if not eof and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                fill()
+                continue
+            pos = end
+            state = "sep"
+            yield value
+
+    # Después del array solo puede haber espacios
+    while True:
+        if buffer[pos:].strip(_WHITESPACE):
+            raise RequestBodyError(400, "JSON inválido")
+        if eof:
+            return
+        buffer, pos = "", 0
+        fill()
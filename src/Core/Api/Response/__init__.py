@@ -7,6 +7,7 @@ class Response:
     def __init__(self, handler):
         self.handler = handler
         self.status_code = 200
+        self.sent = False
         self.headers = {
             "Content-Type": "application/json",
             "Access-Control-Allow-Origin": "*",
@@ -14,22 +15,24 @@ class Response:
             "Access-Control-Allow-Headers": "Content-Type",
         }
 
-    def json(self, data: dict[str, any], status: int = 200):
-        """Envía respuesta JSON"""
+    def _send(self, payload: bytes, status: int, headers: dict[str, str]):
+        """Escribe status, headers (con Content-Length) y body"""
         self.status_code = status
         self.handler.send_response(status)
-        for key, value in self.headers.items():
+        for key, value in headers.items():
             self.handler.send_header(key, value)
+        self.handler.send_header("Content-Length", str(len(payload)))
         self.handler.end_headers()
-        self.handler.wfile.write(json.dumps(data).encode())
+        self.handler.wfile.write(payload)
+        self.sent = True
+
+    def json(self, data: dict[str, any], status: int = 200):
+        """Envía respuesta JSON"""
+        # Se serializa antes de enviar headers: si falla, aún se puede responder 500
+        payload = json.dumps(data).encode()
+        self._send(payload, status, self.headers)
 
     def text(self, data: str, status: int = 200):
         """Envía respuesta de texto plano"""
-        self.status_code = status
-        self.handler.send_response(status)
-        self.handler.send_header("Content-Type", "text/plain")
-        for key, value in self.headers.items():
-            if key != "Content-Type":
-                self.handler.send_header(key, value)
-        self.handler.end_headers()
-        self.handler.wfile.write(data.encode())
+        payload = data.encode()
+        self._send(payload, status, {**self.headers, "Content-Type": "text/plain"})
@@ -1,12 +1,18 @@
 from Core.Logger import Logger
+from Core.Api.Request import RequestBodyError
+from .tree import RouteNode, split_path, is_simple
 
+import functools
 import re, urllib
 
+# Paths resueltos que se recuerdan (método, path) -> (handler, params)
+MATCH_CACHE_SIZE = 1024
+
 
 class Router:
     """Router para registrar rutas con decoradores"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = MATCH_CACHE_SIZE):
         self.routes = {
             "GET": [],
             "POST": [],
@@ -15,6 +21,11 @@ class Router:
             "PATCH": [],
             "OPTIONS": [],
         }
+        # Rutas simples en un árbol por método; las que tienen params dentro
+        # de un segmento (ej: /file/:name.json) quedan con su regex
+        self._trees = {method: RouteNode() for method in self.routes}
+        self._fallback = {method: [] for method in self.routes}
+        self._lookup = functools.lru_cache(maxsize=cache_size)(self._resolve)
 
     def _add_route(self, method: str, path: str, handler: callable):
         """Agrega una ruta al router"""
@@ -22,9 +33,14 @@ class Router:
         pattern = re.sub(r":(\w+)", r"(?P<\1>[^/]+)", path)
         pattern = f"^{pattern}$"
 
-        self.routes[method].append(
-            {"pattern": re.compile(pattern), "path": path, "handler": handler}
-        )
+        route = {"pattern": re.compile(pattern), "path": path, "handler": handler}
+        self.routes.setdefault(method, []).append(route)
+
+        if is_simple(path):
+            self._trees.setdefault(method, RouteNode()).insert(path, handler)
+        else:
+            self._fallback.setdefault(method, []).append(route)
+        self._lookup.cache_clear()
         Logger.success(f"Ruta registrada: {method} {path}")
 
     def route(self, path: str, methods: list = ["GET"]):
@@ -53,14 +69,62 @@ class Router:
         """Decorador para DELETE"""
         return self.route(path, ["DELETE"])
 
-    def find_route(self, method: str, path: str):
-        """Busca una ruta que coincida con el path"""
-        parsed = urllib.parse.urlparse(path)
-        clean_path = parsed.path
+    def _resolve(self, method: str, path: str):
+        tree = self._trees.get(method)
+        if tree is not None:
+            handler, params = tree.match(split_path(path))
+            if handler:
+                return handler, tuple(params.items())
 
-        for route in self.routes.get(method, []):
-            match = route["pattern"].match(clean_path)
+        for route in self._fallback.get(method, []):
+            match = route["pattern"].match(path)
             if match:
-                return route["handler"], match.groupdict()
+                return route["handler"], tuple(match.groupdict().items())
 
-        return None, {}
+        return None, ()
+
+    def find_route(self, method: str, path: str):
+        """Busca una ruta que coincida con el path"""
+        if path.startswith("/"):
+            clean_path = path.partition("?")[0].partition("#")[0]
+        else:
+            clean_path = urllib.parse.urlparse(path).path
+
+        handler, params = self._lookup(method, clean_path)
+        return handler, dict(params)
+
+    def _fail(self, req, res, message: str, status: int):
+        if res.sent:
+            # La respuesta ya salió: no se puede enviar otra por el socket
+            req.handler.close_connection = True
+        else:
+            res.json({"error": message}, status)
+
+    def handle_error(self, req, res, error: Exception):
+        """
+        Respuesta para una excepción del handler: el status del
+        RequestBodyError (400 / 413) o 500. La usan los handlers sync y async.
+        """
+        if isinstance(error, RequestBodyError):
+            Logger.warning(f"Body inválido en {req.method} {req.path}: {error}")
+            self._fail(req, res, error.message, error.status)
+        else:
+            Logger.error(f"Error en handler: {error}")
+            self._fail(req, res, "Error interno del servidor", 500)
+
+    def not_found(self, req, res):
+        Logger.warning(f"Ruta no encontrada: {req.method} {req.path}")
+        res.json({"error": "Ruta no encontrada"}, 404)
+
+    def handle(self, req, res):
+        """Despacha la petición al handler de la ruta (404 / 500 si falla)"""
+        handler, params = self.find_route(req.method, req.path)
+
+        if handler:
+            req._params = params
+            try:
+                handler(req, res)
+            except Exception as e:
+                self.handle_error(req, res, e)
+        else:
+            self.not_found(req, res)
@@ -0,0 +1,83 @@
+"""
+Árbol de segmentos para resolver rutas.
+
+Cada nodo corresponde a un segmento del path. Los segmentos estáticos se
+resuelven con un dict (O(1) por segmento) y los `:param` se prueban
+después, así que el costo depende de la profundidad del path y no del
+número de rutas registradas.
+"""
+
+import re
+
+_PARAM = re.compile(r"^:(\w+)$")
+
+
+def split_path(path: str) -> list[str]:
+    """`/user/me/ana` -> ["user", "me", "ana"]; `/` -> [""]"""
+    return path[1:].split("/") if path.startswith("/") else path.split("/")
+
+
+def is_simple(path: str) -> bool:
+    """El path solo tiene segmentos estáticos o `:param` completos"""
+    for segment in split_path(path):
+        if ":" in segment and not _PARAM.match(segment):
+            return False
+    return True
+
+
+class RouteNode:
+    """Nodo del árbol: hijos estáticos, hijos `:param` y handler terminal"""
+
+    __slots__ = ("static", "params", "handler")
+
+    def __init__(self):
+        self.static: dict[str, RouteNode] = {}
+        self.params: list[tuple[str, RouteNode]] = []
+        self.handler = None
+
+    def insert(self, path: str, handler: callable):
+        node = self
+        for segment in split_path(path):
+            match = _PARAM.match(segment)
+            if match is None:
+                node = node.static.setdefault(segment, RouteNode())
+                continue
+
+            name = match.group(1)
+            for param, child in node.params:
+                if param == name:
+                    node = child
+                    break
+            else:
+                child = RouteNode()
+                node.params.append((name, child))
+                node = child
+
+        # Igual que con la lista de regex, gana la primera ruta registrada
+        if node.handler is None:
+            node.handler = handler
+
+    def match(self, segments: list[str], index: int = 0, params: dict = None):
+        """Devuelve (handler, params) o (None, None); los estáticos tienen prioridad"""
+        if params is None:
+            params = {}
+
+        if index == len(segments):
+            return (self.handler, params) if self.handler else (None, None)
+
+        segment = segments[index]
+        child = self.static.get(segment)
+        if child is not None:
+            handler, found = child.match(segments, index + 1, params)
+            if handler:
+                return handler, found
+
+        if segment:
+            for name, child in self.params:
+                params[name] = segment
+                handler, found = child.match(segments, index + 1, params)
+                if handler:
+                    return handler, found
+                del params[name]
+
+        return None, None
@@ -0,0 +1,337 @@
+from Core.Logger import Logger
+
+from concurrent.futures import ThreadPoolExecutor
+import socketserver
+import selectors
+import threading
+import signal
+import socket
+import time
+import sys
+import os
+
+
+# Cada cuánto el accept que espera un thread libre revisa si hay shutdown
+WORKER_POLL_INTERVAL = 0.5
+
+
+class ThreadPoolHTTPServer(socketserver.TCPServer):
+    """
+    TCPServer que atiende cada conexión en un pool de threads acotado.
+
+    Solo se acepta una conexión cuando hay un thread libre para atenderla:
+    nada queda esperando en la cola del executor y el resto lo encola el
+    kernel en el backlog. Mientras el accept espera un thread sigue
+    atento al shutdown.
+
+    Una conexión keep-alive ociosa no ocupa un thread: el handler la
+    devuelve (`park_idle`) y espera en el mismo selector que el accept
+    hasta que llega la siguiente petición, que vuelve al pool, o hasta que
+    vence el timeout del handler y se cierra.
+    """
+
+    allow_reuse_address = True
+    request_queue_size = 128
+    keep_alive = True
+    park_idle = True
+
+    def __init__(
+        self,
+        server_address,
+        RequestHandlerClass,
+        max_workers: int = 32,
+        bind_and_activate: bool = True,
+    ):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="http-worker"
+        )
+        self._workers = threading.Semaphore(max_workers)
+        self._stopping = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+        # Los workers dejan las conexiones ociosas en `_parked`; el thread
+        # del accept las pasa a su selector (`_idle`) y las retoma
+        self._parked = []
+        self._parked_lock = threading.Lock()
+        self._serving = False
+        self._idle = {}  # socket -> (client_address, peticiones atendidas, vencimiento)
+        # Peticiones ya atendidas de cada conexión retomada (para max_requests)
+        self.resumed = {}
+        self._wakeup, self._wakeup_writer = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+
+    def serve_forever(self, poll_interval=0.5):
+        self._stopped.clear()
+        with self._parked_lock:
+            self._serving = True
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self, selectors.EVENT_READ)
+                selector.register(self._wakeup, selectors.EVENT_READ)
+                while not self._stopping.is_set():
+                    ready = selector.select(self._select_timeout(poll_interval))
+                    for key, _ in ready:
+                        if self._stopping.is_set():
+                            break
+                        if key.fileobj is self:
+                            self._handle_request_noblock()
+                        elif key.fileobj is self._wakeup:
+                            self._drain_wakeup()
+                        else:
+                            selector.unregister(key.fileobj)
+                            self._resume(key.fileobj)
+                    self._watch_parked(selector)
+                    self._close_expired(selector)
+                    self.service_actions()
+        finally:
+            with self._parked_lock:
+                self._serving = False
+                parked, self._parked = self._parked, []
+            for request, *_ in parked:
+                self.shutdown_request(request)
+            for request in list(self._idle):
+                self.shutdown_request(request)
+            self._idle.clear()
+            self._stopping.clear()
+            self._stopped.set()
+
+    def shutdown(self):
+        self._stopping.set()
+        self._wake()
+        self._stopped.wait()
+
+    def _wake(self):
+        try:
+            self._wakeup_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Ya hay un aviso pendiente o el servidor se cerró
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _select_timeout(self, poll_interval: float) -> float:
+        deadlines = [deadline for _, _, deadline in self._idle.values() if deadline]
+        if not deadlines:
+            return poll_interval
+        return max(0, min(min(deadlines) - time.monotonic(), poll_interval))
+
+    def _acquire_worker(self) -> bool:
+        """Espera un thread libre; False si mientras tanto se pidió shutdown"""
+        while not self._workers.acquire(timeout=WORKER_POLL_INTERVAL):
+            if self._stopping.is_set():
+                return False
+        return True
+
+    def process_request(self, request, client_address):
+        if not self._acquire_worker():
+            self.shutdown_request(request)
+            return
+        try:
+            self.executor.submit(self._process_in_thread, request, client_address)
+        except RuntimeError:
+            # El executor ya se cerró
+            self._workers.release()
+            self.shutdown_request(request)
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def _process_in_thread(self, request, client_address):
+        handler = None
+        try:
+            handler = self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            if getattr(handler, "idle", False):
+                self._park(request, client_address, handler)
+            else:
+                self.shutdown_request(request)
+            self._workers.release()
+
+    # --- Conexiones keep-alive ociosas ---
+
+    def _park(self, request, client_address, handler):
+        """Desde un worker: la conexión espera su próxima petición sin thread"""
+        deadline = time.monotonic() + handler.timeout if handler.timeout else None
+        with self._parked_lock:
+            parked = self._serving
+            if parked:
+                self._parked.append(
+                    (request, client_address, handler.requests_served, deadline)
+                )
+        if parked:
+            self._wake()
+        else:
+            self.shutdown_request(request)
+
+    def _watch_parked(self, selector):
+        with self._parked_lock:
+            parked, self._parked = self._parked, []
+        for request, client_address, served, deadline in parked:
+            self._idle[request] = (client_address, served, deadline)
+            selector.register(request, selectors.EVENT_READ)
+
+    def _resume(self, request):
+        """Llegó algo por una conexión ociosa: vuelve al pool"""
+        client_address, served, _ = self._idle.pop(request)
+        self.resumed[request] = served
+        self.process_request(request, client_address)
+
+    def _close_expired(self, selector):
+        now = time.monotonic()
+        expired = [
+            request
+            for request, (_, _, deadline) in self._idle.items()
+            if deadline and deadline <= now
+        ]
+        for request in expired:
+            selector.unregister(request)
+            del self._idle[request]
+            self.shutdown_request(request)
+
+    def shutdown_request(self, request):
+        self.resumed.pop(request, None)
+        super().shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        Logger.error(
+            f"Error atendiendo a {client_address[0]}:{client_address[1]}: "
+            f"{sys.exc_info()[1]}"
+        )
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self._wakeup.close()
+        self._wakeup_writer.close()
+
+
+class ReusePortHTTPServer(ThreadPoolHTTPServer):
+    """Variante con SO_REUSEPORT: varios procesos escuchan el mismo puerto"""
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+class PreforkServer:
+    """
+    Pre-fork: `workers` procesos hijos, cada uno con su propio socket
+    SO_REUSEPORT y su pool de threads. El kernel reparte las conexiones.
+    """
+
+    def __init__(
+        self,
+        server_address,
+        RequestHandlerClass,
+        workers: int = None,
+        threads: int = 8,
+        post_fork: callable = None,
+    ):
+        if not hasattr(os, "fork") or not hasattr(socket, "SO_REUSEPORT"):
+            raise RuntimeError("El modo prefork requiere os.fork y SO_REUSEPORT")
+
+        self.server_address = server_address
+        self.RequestHandlerClass = RequestHandlerClass
+        self.workers = workers or os.cpu_count() or 1
+        self.threads = threads
+        self.post_fork = post_fork
+        self.children: dict[int, int] = {}  # pid -> slot
+        self.running = False
+
+    def _spawn(self, slot: int):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = slot
+            return
+
+        # Proceso hijo
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            if self.post_fork:
+                self.post_fork()
+            self._serve_child()
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            Logger.error(f"Worker {os.getpid()} terminó con error: {e}")
+            code = 1
+        finally:
+            Logger.shutdown()
+            os._exit(code)
+
+    def _serve_child(self):
+        with ReusePortHTTPServer(
+            self.server_address, self.RequestHandlerClass, max_workers=self.threads
+        ) as httpd:
+
+            def stop(signum, frame):
+                threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+            signal.signal(signal.SIGTERM, stop)
+            Logger.info(
+                f"Worker {os.getpid()} escuchando en el puerto {self.server_address[1]}"
+            )
+            httpd.serve_forever()
+
+    def serve_forever(self):
+        self.running = True
+        for slot in range(self.workers):
+            self._spawn(slot)
+
+        while self.running:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            slot = self.children.pop(pid, None)
+            if self.running and slot is not None:
+                Logger.warning(f"Worker {pid} terminó ({status}), levantando otro")
+                time.sleep(0.1)
+                self._spawn(slot)
+
+    def shutdown(self, timeout: float = 5):
+        """Envía SIGTERM a los hijos y espera a que terminen"""
+        self.running = False
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+        deadline = time.monotonic() + timeout
+        while self.children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.05)
+
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.children.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
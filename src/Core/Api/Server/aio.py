@@ -0,0 +1,401 @@
+"""
+Front end HTTP/1.1 sobre asyncio.
+
+Un solo event loop atiende todas las conexiones (miles de sockets ociosos
+sin un thread por socket). El parseo de la petición se hace sobre el buffer
+completo, no línea por línea (incluido el body chunked), y los handlers del `Router` se ejecutan en un
+executor porque son bloqueantes (SQLite, inferencia). Los handlers
+definidos con `async def` se ejecutan directamente en el loop.
+"""
+
+from Core.Logger import Logger
+from Core.Api import KEEP_ALIVE_TIMEOUT, KEEP_ALIVE_MAX_REQUESTS
+from Core.Api.Router import Router
+from Core.Api.Request import Request
+from Core.Api.Request.body import (
+    MAX_BODY_SIZE,
+    RequestBodyError,
+    content_length,
+    decode_chunked,
+    is_chunked,
+)
+from Core.Api.Response import Response
+
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+import asyncio
+import io
+import time
+
+
+MAX_HEADER_SIZE = 64 * 1024
+
+_REASONS = {status.value: status.phrase for status in HTTPStatus}
+
+_date_cache = [0, ""]
+
+
+def _http_date() -> str:
+    """Fecha HTTP cacheada por segundo"""
+    now = int(time.time())
+    if _date_cache[0] != now:
+        _date_cache[0] = now
+        _date_cache[1] = formatdate(now, usegmt=True)
+    return _date_cache[1]
+
+
+class Headers(dict):
+    """Headers insensibles a mayúsculas (como http.client.HTTPMessage)"""
+
+    def __init__(self, items=()):
+        super().__init__()
+        for key, value in items:
+            self[key] = value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key.lower(), value)
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    def __delitem__(self, key):
+        super().__delitem__(key.lower())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+
+class AsyncRequestHandler:
+    """
+    Adaptador con la interfaz de BaseHTTPRequestHandler que usan Request y
+    Response: la respuesta se acumula en memoria y el loop la escribe.
+    """
+
+    server_version = "AsyncHTTP/0.1"
+
+    def __init__(self, command, path, request_version, headers, body, client_address):
+        self.command = command
+        self.path = path
+        self.request_version = request_version
+        self.headers = headers
+        self.client_address = client_address
+        self.rfile = io.BytesIO(body)
+        self.wfile = io.BytesIO()
+        self.close_connection = False
+        self.status = None
+        self._headers_buffer = []
+
+    def send_response(self, code, message=None):
+        # Un handler que falla a mitad de la respuesta envía un 500: como
+        # nada se ha escrito al socket todavía, se descarta lo anterior
+        if self.status is not None:
+            self._headers_buffer = []
+            self.wfile = io.BytesIO()
+        self.status = code
+        reason = message or _REASONS.get(code, "")
+        self._headers_buffer.append(f"HTTP/1.1 {code} {reason}\r\n")
+        self.send_header("Server", self.server_version)
+        self.send_header("Date", _http_date())
+
+    def send_header(self, keyword, value):
+        self._headers_buffer.append(f"{keyword}: {value}\r\n")
+        if keyword.lower() == "connection":
+            if value.lower() == "close":
+                self.close_connection = True
+            elif value.lower() == "keep-alive":
+                self.close_connection = False
+
+    def end_headers(self):
+        pass
+
+    def output(self) -> bytes:
+        """Serializa la respuesta completa (status, headers y body)"""
+        body = self.wfile.getvalue()
+        lines = self._headers_buffer
+        names = {line.split(":", 1)[0].lower() for line in lines[1:]}
+
+        extra = []
+        if "content-length" not in names:
+            extra.append(f"Content-Length: {len(body)}\r\n")
+        if self.close_connection and "connection" not in names:
+            extra.append("Connection: close\r\n")
+
+        head = "".join(lines) + "".join(extra) + "\r\n"
+        return head.encode("latin-1") + body
+
+
+class HTTPProtocol(asyncio.Protocol):
+    """Una instancia por conexión; atiende peticiones en orden (pipelining)"""
+
+    def __init__(self, server: "AsyncHTTPServer"):
+        self.server = server
+        self.loop = server.loop
+        self.transport = None
+        self.peer = ("", 0)
+        self.buffer = bytearray()
+        self.pending = []
+        self.busy = False
+        self.served = 0
+        self.closing = False
+        # Petición inválida: no se parsea nada más de esta conexión
+        self.rejected = False
+        self.idle_handle = None
+
+    # --- Ciclo de vida de la conexión ---
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.peer = transport.get_extra_info("peername") or ("", 0)
+        self.server.connections.add(self)
+        self._arm_idle_timer()
+
+    def connection_lost(self, exc):
+        self.server.connections.discard(self)
+        self.closing = True
+        self._cancel_idle_timer()
+
+    def _arm_idle_timer(self):
+        self._cancel_idle_timer()
+        timeout = self.server.keep_alive_timeout
+        if timeout:
+            self.idle_handle = self.loop.call_later(timeout, self._on_idle)
+
+    def _cancel_idle_timer(self):
+        if self.idle_handle is not None:
+            self.idle_handle.cancel()
+            self.idle_handle = None
+
+    def _on_idle(self):
+        if not self.busy and not self.pending:
+            self.transport.close()
+
+    # --- Parseo ---
+
+    def data_received(self, data):
+        if self.rejected:
+            return
+        self.buffer += data
+        self._cancel_idle_timer()
+
+        while not self.closing and not self.rejected:
+            request = self._parse()
+            if request is None:
+                break
+            self.pending.append(request)
+
+        if len(self.pending) > self.server.max_pipeline:
+            self.transport.pause_reading()
+
+        self._next()
+
+    def _error(self, status: int, message: str):
+        """
+        Encola la respuesta de error detrás de las peticiones anteriores de
+        la conexión: se escribe (y se cierra) cuando les toque en `_next`
+        """
+        response = AsyncRequestHandler("", "", "HTTP/1.1", Headers(), b"", self.peer)
+        response.close_connection = True
+        Response(response).json({"error": message}, status)
+        self.pending.append(response)
+        self.rejected = True
+        self.buffer.clear()
+
+    def _parse(self):
+        end = self.buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self.buffer) > MAX_HEADER_SIZE:
+                self._error(431, "Headers demasiado grandes")
+            return None
+
+        head = bytes(self.buffer[:end]).decode("latin-1")
+        lines = head.split("\r\n")
+
+        try:
+            command, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            self._error(400, "Petición mal formada")
+            return None
+
+        headers = Headers()
+        for line in lines[1:]:
+            key, sep, value = line.partition(":")
+            if sep:
+                headers[key.strip()] = value.strip()
+
+        start = end + 4
+        try:
+            if is_chunked(headers):
+                decoded = decode_chunked(self.buffer, start, self.server.max_body_size)
+                if decoded is None:
+                    return None
+                body, stop = decoded
+                # El handler ve un body normal con Content-Length
+                del headers["Transfer-Encoding"]
+                headers["Content-Length"] = str(len(body))
+            else:
+                length = content_length(headers)
+                if length > self.server.max_body_size:
+                    raise RequestBodyError(413, "Body demasiado grande")
+                stop = start + length
+                if len(self.buffer) < stop:
+                    return None
+                body = bytes(self.buffer[start:stop])
+        except RequestBodyError as e:
+            self._error(e.status, e.message)
+            return None
+
+        del self.buffer[:stop]
+
+        handler = AsyncRequestHandler(command, path, version, headers, body, self.peer)
+        handler.max_body_size = self.server.max_body_size
+        return handler
+
+    # --- Despacho ---
+
+    def _wants_close(self, handler: AsyncRequestHandler) -> bool:
+        connection = (handler.headers.get("Connection") or "").lower()
+        if handler.request_version == "HTTP/1.0":
+            return connection != "keep-alive"
+        return connection == "close"
+
+    def _next(self):
+        if self.busy or not self.pending or self.closing:
+            if not self.busy and not self.pending and not self.closing:
+                self._arm_idle_timer()
+            return
+
+        handler = self.pending.pop(0)
+        if handler.status is not None:
+            # Error de parseo: la respuesta ya está armada
+            self.closing = True
+            self.transport.write(handler.output())
+            self.transport.close()
+            return
+
+        self.busy = True
+        self.served += 1
+
+        if self._wants_close(handler) or self.served >= self.server.max_requests:
+            handler.close_connection = True
+
+        if len(self.pending) <= self.server.max_pipeline:
+            self.transport.resume_reading()
+
+        task = self.loop.create_task(self.server.dispatch(handler))
+        task.add_done_callback(lambda task: self._done(task, handler))
+
+    def _done(self, task: asyncio.Task, handler: AsyncRequestHandler):
+        self.busy = False
+        if self.transport.is_closing():
+            return
+
+        if task.cancelled() or task.exception() or handler.status is None:
+            if not task.cancelled() and task.exception():
+                Logger.error(f"Error despachando la petición: {task.exception()}")
+            handler = AsyncRequestHandler(
+                handler.command, handler.path, "HTTP/1.1", Headers(), b"", self.peer
+            )
+            handler.close_connection = True
+            Response(handler).json({"error": "Error interno del servidor"}, 500)
+
+        self.transport.write(handler.output())
+
+        if handler.close_connection:
+            self.closing = True
+            self.transport.close()
+            return
+
+        self._next()
+
+
+class AsyncHTTPServer:
+    """Servidor asyncio que reutiliza el mismo Router que RestAPIHandler"""
+
+    def __init__(
+        self,
+        server_address,
+        RequestHandlerClass=None,
+        router: Router = None,
+        max_workers: int = 32,
+        keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT,
+        max_requests: int = KEEP_ALIVE_MAX_REQUESTS,
+        max_pipeline: int = 16,
+        max_body_size: int = MAX_BODY_SIZE,
+    ):
+        self.server_address = server_address
+        self.router = router or RequestHandlerClass.router
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="aio-worker"
+        )
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_requests = max_requests
+        self.max_pipeline = max_pipeline
+        self.max_body_size = max_body_size
+
+        self.loop = None
+        self.connections: set[HTTPProtocol] = set()
+        self._server = None
+
+    def _handle_sync(self, handler: AsyncRequestHandler):
+        req = Request(handler)
+        res = Response(handler)
+        Logger.info(f"{req.method} {req.path} from {req.client_ip}")
+        if req.method == "OPTIONS":
+            res.json({}, 200)
+        else:
+            self.router.handle(req, res)
+
+    async def dispatch(self, handler: AsyncRequestHandler):
+        route, params = self.router.find_route(handler.command, handler.path)
+
+        if route is not None and asyncio.iscoroutinefunction(route):
+            req = Request(handler)
+            res = Response(handler)
+            req._params = params
+            Logger.info(f"{req.method} {req.path} from {req.client_ip}")
+            try:
+                await route(req, res)
+            except Exception as e:
+                self.router.handle_error(req, res, e)
+            return
+
+        await self.loop.run_in_executor(self.executor, self._handle_sync, handler)
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        host, port = self.server_address
+        self._server = await self.loop.create_server(
+            lambda: HTTPProtocol(self),
+            host or None,
+            port,
+            reuse_address=True,
+            backlog=1024,
+        )
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+            finally:
+                for connection in list(self.connections):
+                    connection.transport.close()
+
+    def serve_forever(self):
+        asyncio.run(self.serve())
+
+    def shutdown(self):
+        if self.loop is not None and self._server is not None:
+            self.loop.call_soon_threadsafe(self._server.close)
+
+    def server_close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.server_close()
@@ -3,7 +3,13 @@ import http.server
 from Core.Logger import Logger
 from .Router import Router
 from .Response import Response
-from .Request import Request
+from .Request import Request, MAX_BODY_SIZE
+
+# Conexiones persistentes: segundos de espera entre peticiones, peticiones
+# máximas por conexión y body máximo que se descarta sin cerrar la conexión
+KEEP_ALIVE_TIMEOUT = 15
+KEEP_ALIVE_MAX_REQUESTS = 1000
+KEEP_ALIVE_MAX_DRAIN = 64 * 1024
 
 
 class RestAPIHandler(http.server.BaseHTTPRequestHandler):
@@ -11,10 +17,62 @@ class RestAPIHandler(http.server.BaseHTTPRequestHandler):
 
     router: Router = None  # Se asigna desde fuera
 
+    # HTTP/1.1: la conexión se reutiliza mientras el cliente no pida cerrarla
+    protocol_version = "HTTP/1.1"
+    # Timeout del socket: una conexión ociosa se cierra al vencer
+    timeout = KEEP_ALIVE_TIMEOUT
+    max_requests = KEEP_ALIVE_MAX_REQUESTS
+    max_drain = KEEP_ALIVE_MAX_DRAIN
+    # Body máximo que acepta Request.body (413 por encima)
+    max_body_size = MAX_BODY_SIZE
+    # Headers y body salen en dos writes; sin Nagle no se espera el ACK
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.requests_served = 0
+        # Solo los servidores concurrentes declaran keep_alive: en el modo
+        # single una conexión ociosa bloquearía a todos los demás clientes
+        self.keep_alive = getattr(self.server, "keep_alive", False)
+        # Si el servidor lo soporta, entre peticiones la conexión se le
+        # devuelve en vez de ocupar este thread esperando (ver `handle`)
+        self.park_idle = getattr(self.server, "park_idle", False)
+        self.idle = False
+        resumed = getattr(self.server, "resumed", None)
+        if resumed:
+            self.requests_served = resumed.pop(self.request, 0)
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if self.park_idle and not self._request_buffered():
+                self.idle = True
+                return
+            self.handle_one_request()
+
+    def _request_buffered(self) -> bool:
+        """Si ya llegó (al menos en parte) otra petición, sin bloquear"""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
     def log_message(self, format, *args):
         """Override para usar nuestro logger"""
         pass
 
+    def end_headers(self):
+        self.requests_served += 1
+        if not self.close_connection and (
+            not self.keep_alive or self.requests_served >= self.max_requests
+        ):
+            self.send_header("Connection", "close")
+        super().end_headers()
+
     def _handle_request(self):
         """Procesa la petición usando el router"""
         req = Request(self)
@@ -22,19 +80,10 @@ class RestAPIHandler(http.server.BaseHTTPRequestHandler):
 
         Logger.info(f"{req.method} {req.path} from {req.client_ip}")
 
-        # Buscar ruta
-        handler, params = self.router.find_route(req.method, req.path)
+        self.router.handle(req, res)
 
-        if handler:
-            req._params = params
-            try:
-                handler(req, res)
-            except Exception as e:
-                Logger.error(f"Error en handler: {e}")
-                res.json({"error": "Error interno del servidor"}, 500)
-        else:
-            Logger.warning(f"Ruta no encontrada: {req.method} {req.path}")
-            res.json({"error": "Ruta no encontrada"}, 404)
+        if not req.drain(self.max_drain):
+            self.close_connection = True
 
     def do_GET(self):
         self._handle_request()
@@ -52,5 +101,9 @@ class RestAPIHandler(http.server.BaseHTTPRequestHandler):
         self._handle_request()
 
     def do_OPTIONS(self):
+        req = Request(self)
         res = Response(self)
         res.json({}, 200)
+
+        if not req.drain(self.max_drain):
+            self.close_connection = True
@@ -0,0 +1,229 @@
+"""
+Frames WebSocket (RFC 6455).
+
+`FrameParser` guarda lo recibido en un bytearray por conexión y entrega los
+frames a medida que se completan: un frame puede llegar en varios `recv` y
+un `recv` puede traer varios frames. Los mensajes fragmentados se
+reensamblan y los frames de control (close, ping, pong) se entregan aparte,
+aunque lleguen entre fragmentos.
+
+El buffer no se recorta por cada frame: se avanza un offset y lo consumido
+se descarta una sola vez en el siguiente `feed`.
+"""
+
+import numpy as np
+import struct
+
+
+MAX_MESSAGE_SIZE = 1024 * 1024
+# Desde este tamaño la máscara se aplica con numpy; por debajo
+# int.from_bytes es más rápido (no paga el costo fijo de crear arrays)
+NUMPY_UNMASK_MIN = 1536
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+_OPCODES = (OP_CONTINUATION, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG)
+
+CLOSE_NORMAL = 1000
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_UNSUPPORTED = 1003
+CLOSE_INVALID_DATA = 1007
+CLOSE_TOO_BIG = 1009
+
+
+class FrameError(Exception):
+    """Frame inválido: la conexión se cierra con `code`"""
+
+    def __init__(self, code: int, message: str):
+        self.code = code
+        super().__init__(message)
+
+
+def unmask(data, mask: bytes) -> bytes:
+    """
+    Aplica la máscara de 4 bytes del cliente a `data` en bloque: XOR de un
+    solo entero (int.from_bytes) o, con payloads grandes, palabras de 32 bits
+    en numpy. Equivale a `data[i] ^ mask[i % 4]` byte a byte.
+    """
+    length = len(data)
+    if length < NUMPY_UNMASK_MIN:
+        key = (mask * (length // 4 + 1))[:length]
+        value = int.from_bytes(data, "little") ^ int.from_bytes(key, "little")
+        return value.to_bytes(length, "little")
+
+    source = np.frombuffer(data, dtype=np.uint8)
+    payload = np.empty(length, dtype=np.uint8)
+    words = length - length % 4
+    np.bitwise_xor(
+        source[:words].view(np.uint32),
+        np.frombuffer(mask, dtype=np.uint32),
+        out=payload[:words].view(np.uint32),
+    )
+    np.bitwise_xor(
+        source[words:],
+        np.frombuffer(mask[: length - words], dtype=np.uint8),
+        out=payload[words:],
+    )
+    return payload.tobytes()
+
+
+def encode_frame(payload, opcode: int = OP_TEXT) -> bytes:
+    """Frame final del servidor (sin máscara); `payload` str o bytes"""
+    if isinstance(payload, str):
+        payload = payload.encode()
+
+    length = len(payload)
+    if length < 126:
+        header = struct.pack(">BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack(">BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def close_frame(code: int = CLOSE_NORMAL) -> bytes:
+    return encode_frame(struct.pack(">H", code), OP_CLOSE)
+
+
+class FrameParser:
+    """Parser incremental de los frames que envía un cliente"""
+
+    def __init__(self, max_message_size: int = MAX_MESSAGE_SIZE, require_mask=True):
+        self.max_message_size = max_message_size
+        self.require_mask = require_mask
+        self.buffer = bytearray()
+        self._start = 0  # Inicio del primer frame sin leer
+        self._fragments = []
+        self._fragments_size = 0
+        self._fragments_opcode = None
+
+    def feed(self, data):
+        """Agrega bytes recibidos (descarta lo ya leído, una vez)"""
+        if self._start:
+            del self.buffer[: self._start]
+            self._start = 0
+        self.buffer += data
+
+    def __iter__(self):
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def next_frame(self):
+        """
+        (opcode, payload) del siguiente mensaje completo o frame de control,
+        o None si falta recibir. Los mensajes de texto se entregan como str.
+        Lanza FrameError si el cliente viola el protocolo.
+        """
+        while True:
+            frame = self._read()
+            if frame is None:
+                return None
+
+            fin, opcode, payload = frame
+            if opcode >= OP_CLOSE:
+                return opcode, payload
+
+            if opcode == OP_CONTINUATION:
+                if self._fragments_opcode is None:
+                    raise FrameError(CLOSE_PROTOCOL_ERROR, "Continuación sin mensaje")
+                self._fragments.append(payload)
+                self._fragments_size += len(payload)
+                if not fin:
+                    continue
+                opcode = self._fragments_opcode
+                payload = b"".join(self._fragments)
+                self._fragments = []
+                self._fragments_size = 0
+                self._fragments_opcode = None
+            elif self._fragments_opcode is not None:
+                raise FrameError(
+                    CLOSE_PROTOCOL_ERROR, "Mensaje fragmentado sin terminar"
+                )
+            elif not fin:
+                self._fragments_opcode = opcode
+                self._fragments = [payload]
+                self._fragments_size = len(payload)
+                continue
+
+            if opcode == OP_TEXT:
+                try:
+                    return opcode, payload.decode()
+                except UnicodeDecodeError:
+                    raise FrameError(CLOSE_INVALID_DATA, "Texto que no es UTF-8")
+            return opcode, payload
+
+    def _read(self):
+        """(fin, opcode, payload) del frame en `_start`, o None si está incompleto"""
+        buffer = self.buffer
+        start = self._start
+        available = len(buffer) - start
+        if available < 2:
+            return None
+
+        byte1, byte2 = buffer[start], buffer[start + 1]
+        fin = bool(byte1 & 0x80)
+        opcode = byte1 & 0x0F
+        masked = byte2 & 0x80
+        length = byte2 & 0x7F
+        header = 2
+
+        if byte1 & 0x70:
+            raise FrameError(CLOSE_PROTOCOL_ERROR, "Bits RSV sin extensión")
+        if opcode not in _OPCODES:
+            raise FrameError(CLOSE_PROTOCOL_ERROR, f"Opcode desconocido: {opcode}")
+        if opcode >= OP_CLOSE and (not fin or length > 125):
+            raise FrameError(CLOSE_PROTOCOL_ERROR, "Frame de control inválido")
+        if not masked and self.require_mask:
+            raise FrameError(CLOSE_PROTOCOL_ERROR, "Frame del cliente sin máscara")
+
+        if length == 126:
+            if available < 4:
+                return None
+            length = struct.unpack_from(">H", buffer, start + 2)[0]
+            header = 4
+        elif length == 127:
+            if available < 10:
+                return None
+            length = struct.unpack_from(">Q", buffer, start + 2)[0]
+            header = 10
+
+        # Se corta antes de recibir el payload completo
+        if opcode < OP_CLOSE:
+            size = length
+            if opcode == OP_CONTINUATION:
+                size += self._fragments_size
+            if size > self.max_message_size:
+                raise FrameError(
+                    CLOSE_TOO_BIG, f"Mensaje de más de {self.max_message_size} bytes"
+                )
+
+        mask = None
+        if masked:
+            if available < header + 4:
+                return None
+            mask = bytes(buffer[start + header : start + header + 4])
+            header += 4
+
+        begin = start + header
+        end = begin + length
+        if len(buffer) < end:
+            return None
+
+        # Una vista, no una copia del buffer; la copia es el payload mismo
+        view = memoryview(buffer)[begin:end]
+        try:
+            payload = unmask(view, mask) if mask else bytes(view)
+        finally:
+            view.release()
+
+        self._start = end
+        return fin, opcode, payload
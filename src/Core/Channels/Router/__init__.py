@@ -10,7 +10,8 @@ class WebSocketRouter:
     def __init__(self):
         self.events: dict[str, callable] = {}
         self.middlewares = []
-        self.clients = []  # Lista de clientes conectados
+        # Clientes conectados (set: con miles de clientes, quitar uno es O(1))
+        self.clients = set()
 
     def on(self, event: str):
         """Decorador para registrar eventos"""
@@ -50,19 +51,19 @@ class WebSocketRouter:
 
     def add_client(self, client):
         """Agrega un cliente a la lista"""
-        self.clients.append(client)
+        self.clients.add(client)
 
     def remove_client(self, client):
         """Remueve un cliente de la lista"""
-        if client in self.clients:
-            self.clients.remove(client)
+        self.clients.discard(client)
 
     def broadcast_to_all(self, event: str, data: any, exclude=None):
-        """Broadcast a todos los clientes"""
+        """Broadcast a todos los clientes (el frame se codifica una sola vez)"""
         message = json.dumps({"event": event, "data": data})
-        for client in self.clients:
+        frame = None
+        # Copia: el servidor asyncio agrega y quita clientes desde otro thread
+        for client in list(self.clients):
             if client != exclude and client.connected:
-                try:
-                    client.send_raw(message)
-                except Exception as e:
-                    Logger.error(f"Error en broadcast: {e}")
+                if frame is None:
+                    frame = client.encode_frame(message)
+                client.send_frame(frame)
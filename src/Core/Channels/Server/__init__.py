@@ -0,0 +1,256 @@
+"""
+Servidor WebSocket sobre asyncio.
+
+Un solo event loop atiende todas las conexiones: un cliente ocioso no ocupa
+un thread, solo su socket y un buffer. El handshake y los frames se leen en
+el loop (con el mismo FrameParser que el handler bloqueante); los eventos
+se pasan al `WebSocketRouter` en un executor porque los handlers son
+bloqueantes (inferencia, SQLite), en orden por conexión. Lo que los
+handlers envían desde el executor vuelve al loop con `call_soon_threadsafe`.
+"""
+
+from Core.Logger import Logger
+from Core.Channels import WebSocketHandler, MAX_HANDSHAKE_SIZE
+from Core.Channels.Frame import MAX_MESSAGE_SIZE, CLOSE_NORMAL, close_frame
+from Core.Channels.Router import WebSocketRouter
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+
+
+# Un cliente que no lee no puede acumular memoria sin límite en el servidor
+MAX_WRITE_BUFFER = 4 * 1024 * 1024
+
+_BAD_REQUEST = (
+    b"HTTP/1.1 400 Bad Request\r\n"
+    b"Connection: close\r\n"
+    b"Content-Length: 0\r\n\r\n"
+)
+
+
+class AsyncWebSocketHandler(WebSocketHandler):
+    """WebSocketHandler cuyo socket es el transport del protocolo asyncio"""
+
+    def __init__(self, protocol: "WebSocketProtocol", address: tuple[str, int]):
+        self.max_message_size = protocol.server.max_message_size
+        super().__init__(None, address)
+        self._protocol = protocol
+        self.router = protocol.server.router
+
+    def _send(self, data: bytes):
+        self._protocol.write(data)
+
+    def close(self, code: int = CLOSE_NORMAL):
+        self.connected = False
+        self._protocol.close(code)
+
+
+class WebSocketProtocol(asyncio.Protocol):
+    """Una instancia por conexión: handshake, frames y despacho en orden"""
+
+    def __init__(self, server: "WebSocketServer"):
+        self.server = server
+        self.loop = server.loop
+        self.transport = None
+        self.handler = None
+        self.buffer = bytearray()
+        self.pending = []
+        self.busy = False
+        self.closing = False
+        self.opened = False
+
+    # --- Ciclo de vida de la conexión ---
+
+    def connection_made(self, transport):
+        self.transport = transport
+        peer = transport.get_extra_info("peername") or ("", 0)
+        self.handler = AsyncWebSocketHandler(self, peer[:2])
+        self.server.connections.add(self)
+
+    def connection_lost(self, exc):
+        self.server.connections.discard(self)
+        self.closing = True
+        if self.opened:
+            self.handler.closed()
+
+    # --- Escritura (desde el loop o desde el executor) ---
+
+    def write(self, data: bytes):
+        if threading.get_ident() == self.server.loop_thread:
+            self._write(data)
+        else:
+            self.loop.call_soon_threadsafe(self._write, data)
+
+    def _write(self, data: bytes):
+        if self.transport.is_closing():
+            return
+        self.transport.write(data)
+        if self.transport.get_write_buffer_size() > self.server.max_write_buffer:
+            Logger.warning(
+                f"WebSocket client {self.handler._address[0]} no lee: se desconecta"
+            )
+            self.closing = True
+            self.transport.abort()
+
+    def close(self, code: int = CLOSE_NORMAL):
+        if threading.get_ident() == self.server.loop_thread:
+            self._close(code)
+        else:
+            self.loop.call_soon_threadsafe(self._close, code)
+
+    def _close(self, code: int):
+        if self.transport.is_closing():
+            return
+        self.closing = True
+        self.handler.connected = False
+        self.transport.write(close_frame(code))
+        self.transport.close()
+
+    # --- Lectura ---
+
+    def data_received(self, data):
+        if self.closing:
+            return
+
+        if not self.opened:
+            data = self._handshake(data)
+            if data is None:
+                return
+
+        self.pending.extend(self.handler.receive(data))
+
+        if len(self.pending) > self.server.max_pending:
+            self.transport.pause_reading()
+
+        self._next()
+
+    def _handshake(self, data: bytes):
+        """Lo recibido después del handshake, o None si todavía no terminó"""
+        self.buffer += data
+        end = self.buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self.buffer) > MAX_HANDSHAKE_SIZE:
+                self._reject()
+            return None
+
+        response = self.handler.handshake_response(bytes(self.buffer[: end + 4]))
+        rest = bytes(self.buffer[end + 4 :])
+        self.buffer = None
+        if response is None:
+            self._reject()
+            return None
+
+        self.transport.write(response)
+        self.handler.connected = True
+        self.opened = True
+        self.handler.opened()
+        return rest
+
+    def _reject(self):
+        self.closing = True
+        self.transport.write(_BAD_REQUEST)
+        self.transport.close()
+
+    # --- Despacho ---
+
+    def _next(self):
+        if self.busy or not self.pending or self.closing:
+            return
+
+        # Todo lo que llegó mientras tanto va en una sola ida al executor
+        batch, self.pending = self.pending, []
+        self.busy = True
+        self.transport.resume_reading()
+
+        future = self.loop.run_in_executor(self.server.executor, self._dispatch, batch)
+        future.add_done_callback(self._done)
+
+    def _dispatch(self, batch: list[str]):
+        for raw_message in batch:
+            if not self.handler.connected:
+                return
+            self.handler.dispatch(raw_message)
+
+    def _done(self, future: asyncio.Future):
+        self.busy = False
+        if not future.cancelled() and future.exception():
+            Logger.error(f"Error despachando evento WebSocket: {future.exception()}")
+        self._next()
+
+
+class WebSocketServer:
+    """Servidor asyncio que usa el mismo WebSocketRouter que WebSocketHandler"""
+
+    def __init__(
+        self,
+        server_address,
+        router: WebSocketRouter = None,
+        max_workers: int = 32,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        max_pending: int = 64,
+        max_write_buffer: int = MAX_WRITE_BUFFER,
+    ):
+        self.server_address = server_address
+        self.router = router or WebSocketHandler.router
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ws-worker"
+        )
+        self.max_message_size = max_message_size
+        self.max_pending = max_pending
+        self.max_write_buffer = max_write_buffer
+
+        self.loop = None
+        self.loop_thread = None
+        self.connections: set[WebSocketProtocol] = set()
+        self.started = threading.Event()
+        self._server = None
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        host, port = self.server_address
+        self._server = await self.loop.create_server(
+            lambda: WebSocketProtocol(self),
+            host or None,
+            port,
+            reuse_address=True,
+            backlog=1024,
+        )
+        # Con puerto 0 el sistema elige uno libre
+        self.server_address = self._server.sockets[0].getsockname()[:2]
+        self.started.set()
+
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+            finally:
+                for connection in list(self.connections):
+                    connection._close(CLOSE_NORMAL)
+
+    def serve_forever(self):
+        asyncio.run(self.serve())
+
+    def serve_in_thread(self) -> threading.Thread:
+        """Arranca el servidor en un thread daemon (junto al servidor REST)"""
+        thread = threading.Thread(
+            target=self.serve_forever, name="websocket", daemon=True
+        )
+        thread.start()
+        self.started.wait(5)
+        return thread
+
+    def shutdown(self):
+        if self.loop is not None and self._server is not None:
+            self.loop.call_soon_threadsafe(self._server.close)
+
+    def server_close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.server_close()
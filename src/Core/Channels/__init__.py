@@ -1,46 +1,84 @@
 from Core.Logger import Logger
 from Core.Channels.Router import WebSocketRouter
 from Core.Channels.Message import WebSocketMessage
+from Core.Channels.Frame import (
+    CLOSE_NORMAL,
+    CLOSE_UNSUPPORTED,
+    MAX_MESSAGE_SIZE,
+    OP_BINARY,
+    OP_CLOSE,
+    OP_PING,
+    OP_PONG,
+    OP_TEXT,
+    FrameError,
+    FrameParser,
+    close_frame,
+    encode_frame,
+)
 from Core.Channels.Utils.accept_key import generateAcceptKey
 
 import socket as webSocket
-import struct, json
+import json
+
+
+MAX_HANDSHAKE_SIZE = 16 * 1024
+RECV_SIZE = 64 * 1024
 
 
 class WebSocketHandler:
     """Handler WebSocket con soporte de eventos"""
 
     router: WebSocketRouter = None  # Se asigna desde fuera
+    max_message_size: int = MAX_MESSAGE_SIZE
 
     def __init__(self, client: webSocket.socket, address: tuple[str, int]):
         self._socket = client
         self._address = address
         self.connected = False
         self.client_data = {}  # Datos del cliente (ej: user_id, tokens, etc)
+        self.parser = FrameParser(self.max_message_size)
+
+    def handshake_response(self, request: bytes):
+        """Respuesta 101 para la petición de upgrade, o None si no es válida"""
+        headers: dict = {}
+
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            if ": " in line:
+                key, value = line.split(": ", 1)
+                headers[key] = value
+
+        if "Sec-WebSocket-Key" not in headers:
+            return None
+
+        key: str = generateAcceptKey(headers)
+        response = (
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {key}\r\n\r\n"
+        )
+        return response.encode()
 
     def handshake(self):
         """Handshake WebSocket según RFC 6455"""
         try:
-            data = self._socket.recv(1024).decode()
-            headers: dict = {}
-
-            for line in data.split("\r\n")[1:]:
-                if ": " in line:
-                    key, value = line.split(": ", 1)
-                    headers[key] = value
+            request = bytearray()
+            while b"\r\n\r\n" not in request:
+                if len(request) > MAX_HANDSHAKE_SIZE:
+                    return False
+                data = self._socket.recv(4096)
+                if not data:
+                    return False
+                request += data
 
-            if "Sec-WebSocket-Key" not in headers:
+            end = request.index(b"\r\n\r\n") + 4
+            response = self.handshake_response(bytes(request[:end]))
+            if response is None:
                 return False
 
-            key: str = generateAcceptKey(headers)
-            response = (
-                "HTTP/1.1 101 Switching Protocols\r\n"
-                "Upgrade: websocket\r\n"
-                "Connection: Upgrade\r\n"
-                f"Sec-WebSocket-Accept: {key}\r\n\r\n"
-            )
-
-            self._socket.send(response.encode())
+            # Frames que el cliente envió junto con el handshake
+            self.parser.feed(request[end:])
+            self._send(response)
             self.connected = True
 
             Logger.success(
@@ -52,70 +90,83 @@ class WebSocketHandler:
             Logger.error(f"Handshake Error: {e}")
             return False
 
+    def receive(self, data: bytes) -> list[str]:
+        """
+        Pasa `data` al parser de la conexión y devuelve los mensajes de texto
+        completos (ninguno, uno o varios). Responde ping y close; un frame
+        inválido cierra la conexión con el código que corresponde.
+        """
+        self.parser.feed(data)
+        messages = []
+        try:
+            for opcode, payload in self.parser:
+                if opcode == OP_TEXT:
+                    messages.append(payload)
+                elif opcode == OP_PING:
+                    self._send(encode_frame(payload, OP_PONG))
+                elif opcode == OP_CLOSE:
+                    self.close()
+                    break
+                elif opcode == OP_BINARY:
+                    self.close(CLOSE_UNSUPPORTED)
+                    break
+        except FrameError as e:
+            Logger.warning(f"Frame inválido de {self._address[0]}: {e}")
+            self.close(e.code)
+        return messages
+
     def decode_frame(self, data):
-        """Decodifica un frame WebSocket"""
+        """
+        Decodifica el primer frame completo de `data` como texto, o None.
+        Se mantiene por compatibilidad: no guarda lo incompleto entre
+        lecturas; la conexión usa `receive`.
+        """
+        parser = FrameParser(self.max_message_size, require_mask=False)
+        parser.feed(data)
         try:
-            if len(data) < 2:
+            frame = parser.next_frame()
+            if frame is None:
                 return None
-
-            byte1, byte2 = data[0], data[1]
-            opcode = byte1 & 0x0F
-            masked = byte2 & 0x80
-            payload_length = byte2 & 0x7F
-
-            offset = 2
-
-            if payload_length == 126:
-                payload_length = struct.unpack(">H", data[offset : offset + 2])[0]
-                offset += 2
-            elif payload_length == 127:
-                # data[2:10] contiene la longitud del payload en 8 bytes
-                payload_length = struct.unpack(">Q", data[offset : offset + 8])[0]
-                offset += 8
-
-            if masked:
-                mask = data[offset : offset + 4]
-                offset += 4
-                payload = bytearray(data[offset : offset + payload_length])
-                for i in range(len(payload)):
-                    payload[i] ^= mask[i % 4]
-                return payload.decode()
-
-            return data[offset : offset + payload_length].decode()
-        except Exception as e:
+            payload = frame[1]
+            return payload if isinstance(payload, str) else payload.decode()
+        except (FrameError, UnicodeDecodeError) as e:
             Logger.error(f"Error decoding frame: {e}")
             return None
 
     def encode_frame(self, message):
         """Codifica un mensaje en frame WebSocket"""
-        message_bytes = message.encode()
-        frame = bytearray([0x81])  # Text frame
-
-        length = len(message_bytes)
-        if length < 126:
-            frame.append(length)
-        elif length < 65536:
-            frame.append(126)
-            frame.extend(struct.pack(">H", length))
-        else:
-            frame.append(127)
-            frame.extend(struct.pack(">Q", length))
-
-        frame.extend(message_bytes)
-        return bytes(frame)
+        return encode_frame(message)
 
-    def send_raw(self, message: str):
-        """Envía mensaje raw (sin formato de evento)"""
+    def _send(self, data: bytes):
+        """Escribe bytes al cliente (el servidor asyncio lo redefine)"""
+        self._socket.sendall(data)
+
+    def close(self, code: int = CLOSE_NORMAL):
+        """Envía el frame de cierre y cierra la conexión con el cliente"""
+        if self.connected:
+            self.connected = False
+            try:
+                self._send(close_frame(code))
+            except OSError:
+                pass
+        self._socket.close()
+
+    def send_frame(self, frame: bytes):
+        """Envía un frame ya codificado (broadcast lo codifica una sola vez)"""
         try:
-            self._socket.send(self.encode_frame(message))
+            self._send(frame)
         except Exception as e:
             Logger.error(f"Error enviando mensaje: {e}")
 
+    def send_raw(self, message: str):
+        """Envía mensaje raw (sin formato de evento)"""
+        self.send_frame(self.encode_frame(message))
+
     def emit(self, event: str, data: any):
         """Emite un evento al cliente"""
         try:
             message = json.dumps({"event": event, "data": data})
-            self._socket.send(self.encode_frame(message))
+            self._send(self.encode_frame(message))
             Logger.log(f"→ [{event}] to {self._address[0]}: {data}")
         except Exception as e:
             Logger.error(f"Error enviando evento: {e}")
@@ -125,13 +176,8 @@ class WebSocketHandler:
         exclude = None if include_self else self
         self.router.broadcast_to_all(event, data, exclude)
 
-    def handle(self):
-        """Maneja la conexión WebSocket"""
-        if not self.handshake():
-            self._socket.close()
-            return
-
-        # Agregar a lista de clientes
+    def opened(self):
+        """Registra al cliente tras el handshake y le avisa"""
         self.router.add_client(self)
 
         Logger.info(
@@ -147,23 +193,41 @@ class WebSocketHandler:
             },
         )
 
+    def closed(self):
+        """Quita al cliente de la lista al desconectarse"""
+        self.connected = False
+        self.router.remove_client(self)
+        Logger.warning(
+            f"WebSocket client disconnected: {self._address[0]}:{self._address[1]}"
+        )
+
+    def dispatch(self, raw_message: str):
+        """Pasa un mensaje de texto al router"""
+        msg = WebSocketMessage(self, raw_message)
+        self.router.handle_event(msg)
+
+    def handle(self):
+        """Maneja la conexión WebSocket"""
+        if not self.handshake():
+            self._socket.close()
+            return
+
+        self.opened()
+
         try:
+            data = b""
             while self.connected:
-                data = self._socket.recv(4096)
+                for raw_message in self.receive(data):
+                    if not self.connected:
+                        break
+                    self.dispatch(raw_message)
+
+                data = self._socket.recv(RECV_SIZE)
                 if not data:
                     break
 
-                raw_message = self.decode_frame(data)
-                if raw_message:
-                    msg = WebSocketMessage(self, raw_message)
-                    self.router.handle_event(msg)
-
         except Exception as e:
             Logger.error(f"WebSocket connection error: {e}")
         finally:
-            self.connected = False
-            self.router.remove_client(self)
+            self.closed()
             self._socket.close()
-            Logger.warning(
-                f"WebSocket client disconnected: {self._address[0]}:{self._address[1]}"
-            )
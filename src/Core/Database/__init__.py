@@ -1,15 +1,27 @@
 from Core.Logger import Logger
+from Core.Database.pool import SqliteOptions, ThreadLocalConnection
 import sqlite3
 
 
+DATABASE_PATH = "sqlite3.db"
+
+
 class GlobalSqlite:
+    """
+    Punto de acceso a la base: una conexión de escritura y otra de solo
+    lectura por thread (ver Core.Database.pool), en modo WAL.
+    """
+
     _instance = None
+    path = DATABASE_PATH
+    options = SqliteOptions()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
             cls._instance._db = None
+            cls._instance._reader = None
             cls._instance.running = False
         return cls._instance
 
@@ -18,15 +30,51 @@ class GlobalSqlite:
             return
 
         try:
-            self._db = sqlite3.connect("sqlite3.db", check_same_thread=False)
-            self._db.row_factory = sqlite3.Row
+            self._db = ThreadLocalConnection(self.path, self.options)
+            # Abre la primera conexión ya: crea el archivo y lo pasa a WAL
+            # antes de que un lector de solo lectura intente abrirlo
+            mode = self._db.execute("PRAGMA journal_mode").fetchone()[0]
+            self._reader = ThreadLocalConnection(
+                self.path, self.options, readonly=True
+            )
             self._initialized = True
             self.running = True
-            Logger.start(f"Creating Database Sqlite 3 {sqlite3.version}")
+            Logger.start(
+                f"Creating Database Sqlite 3 {sqlite3.sqlite_version} (journal {mode})"
+            )
         except sqlite3.Error as e:
             Logger.error(f"Error connecting to Database:\n{e}")
 
+    @classmethod
+    def configure(cls, path: str = None, **options):
+        """
+        Cambia archivo y PRAGMAs (cache_size, mmap_size, busy_timeout,
+        synchronous, journal_mode). Llamar antes del primer get_database().
+        """
+        if path is not None:
+            cls.path = path
+        current = vars(cls.options).copy()
+        current.update(options)
+        cls.options = SqliteOptions(**current)
+
+    @staticmethod
+    def reconnect():
+        """
+        Cierra las conexiones de este proceso; se reabren al usarlas. En un
+        worker forkeado las heredadas del padre se descartan sin cerrarlas.
+        """
+        instance = GlobalSqlite()
+        instance._db.close_all()
+        instance._reader.close_all()
+        return instance._db
+
     @staticmethod
     def get_database():
         instance = GlobalSqlite()
         return instance._db
+
+    @staticmethod
+    def get_reader():
+        """Conexiones de solo lectura para las consultas del QuerySet"""
+        instance = GlobalSqlite()
+        return instance._reader
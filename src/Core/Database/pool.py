@@ -0,0 +1,174 @@
+"""
+Conexiones SQLite por thread (y por proceso).
+
+`ThreadLocalConnection` se usa como si fuera un `sqlite3.Connection`, pero
+cada thread recibe la suya, abierta la primera vez que la usa; tras un fork
+el proceso hijo abre conexiones nuevas en vez de heredar las del padre.
+La conexión de un thread se cierra sola cuando el thread termina.
+Con WAL los lectores (pool de solo lectura) no esperan a las escrituras.
+"""
+
+from pathlib import Path
+import os
+import sqlite3
+import threading
+import weakref
+
+
+class SqliteOptions:
+    """PRAGMAs que se aplican a cada conexión nueva"""
+
+    def __init__(
+        self,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        # Negativo: KiB (-16000 ~ 16 MB de cache de páginas por conexión)
+        cache_size: int = -16000,
+        mmap_size: int = 64 * 1024 * 1024,
+        busy_timeout: int = 5000,  # ms
+    ):
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+
+
+def connect(
+    path: str, options: SqliteOptions = None, readonly: bool = False
+) -> sqlite3.Connection:
+    """Abre una conexión con row_factory=sqlite3.Row y los PRAGMAs de `options`"""
+    options = options or SqliteOptions()
+    if readonly:
+        uri = f"{Path(path).absolute().as_uri()}?mode=ro"
+        db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    else:
+        db = sqlite3.connect(path, check_same_thread=False)
+    db.row_factory = sqlite3.Row
+
+    # journal_mode se guarda en el archivo: solo lo cambia el que escribe
+    if not readonly:
+        db.execute(f"PRAGMA journal_mode={options.journal_mode}")
+    db.execute(f"PRAGMA synchronous={options.synchronous}")
+    db.execute(f"PRAGMA cache_size={int(options.cache_size)}")
+    db.execute(f"PRAGMA mmap_size={int(options.mmap_size)}")
+    db.execute(f"PRAGMA busy_timeout={int(options.busy_timeout)}")
+    if readonly:
+        db.execute("PRAGMA query_only=ON")
+    return db
+
+
+class _ThreadConnection:
+    """
+    Lo que se guarda en el `threading.local`: cuando el thread termina Python
+    libera sus valores y `release` cierra la conexión
+    """
+
+    __slots__ = ("db", "release", "__weakref__")
+
+    def __init__(self, owner: "ThreadLocalConnection", db: sqlite3.Connection):
+        self.db = db
+        self.release = weakref.finalize(self, owner._release, db, os.getpid())
+
+
+class ThreadLocalConnection:
+    """
+    Proxy de `sqlite3.Connection` con una conexión por (proceso, thread).
+    Todo lo que no define (cursor, execute, commit, in_transaction...) se
+    delega a la conexión del thread actual.
+    """
+
+    def __init__(
+        self, path: str, options: SqliteOptions = None, readonly: bool = False
+    ):
+        self.path = path
+        self.options = options or SqliteOptions()
+        self.readonly = readonly
+        self._local = threading.local()
+        # Reentrante: los finalizers pueden ejecutarse con el lock tomado
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._connections = []
+        self._trace = None
+
+    def _check_fork(self):
+        """
+        Tras un fork olvida las conexiones heredadas del padre: SQLite no
+        permite usarlas en el hijo, y cerrarlas también cuenta como usarlas.
+        """
+        pid = os.getpid()
+        if pid != self._pid:
+            with self._lock:
+                if pid != self._pid:
+                    self._pid = pid
+                    self._connections = []
+                    self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """La conexión del thread actual (la abre si hace falta)"""
+        self._check_fork()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            db = connect(self.path, self.options, self.readonly)
+            if self._trace is not None:
+                db.set_trace_callback(self._trace)
+            with self._lock:
+                self._connections.append(db)
+            conn = self._local.conn = _ThreadConnection(self, db)
+        return conn.db
+
+    def _release(self, db: sqlite3.Connection, pid: int):
+        """Cierra la conexión de un thread que terminó (o que llamó a close)"""
+        if os.getpid() != pid:
+            return  # heredada del padre: no se puede ni cerrar
+        with self._lock:
+            if db not in self._connections:
+                return  # ya la cerró close_all
+            self._connections.remove(db)
+        try:
+            db.close()
+        except sqlite3.ProgrammingError:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def set_trace_callback(self, callback):
+        """Se aplica a todas las conexiones del proceso, también a las futuras"""
+        self._trace = callback
+        self._check_fork()
+        with self._lock:
+            connections = list(self._connections)
+        for db in connections:
+            db.set_trace_callback(callback)
+
+    def close(self):
+        """Cierra la conexión del thread actual"""
+        self._check_fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        conn.release()
+
+    def close_all(self):
+        """
+        Cierra las conexiones de todos los threads de este proceso; en un
+        hijo recién forkeado solo descarta (sin cerrar) las del padre
+        """
+        self._check_fork()
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for db in connections:
+            try:
+                db.close()
+            except sqlite3.ProgrammingError:
+                pass
+
+    @property
+    def open_connections(self) -> int:
+        self._check_fork()
+        return len(self._connections)
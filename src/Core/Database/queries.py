@@ -0,0 +1,61 @@
+"""
+Registro de las sentencias SQL que ejecuta una conexión, para fijar en los
+tests cuántas queries hace un endpoint o una operación del ORM.
+
+    with assert_num_queries(db, 1):
+        Prediction.filter(user=1).select_related("user").execute()
+"""
+
+from contextlib import contextmanager
+
+# Control de transacciones: no cuenta como query salvo que se pida
+_TRANSACTION = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+class CapturedQueries:
+    """Sentencias vistas por el trace callback de sqlite3, en orden"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def queries(self) -> list[str]:
+        return [
+            sql
+            for sql in self.statements
+            if not sql.lstrip().upper().startswith(_TRANSACTION)
+        ]
+
+    def __len__(self):
+        return len(self.queries)
+
+    def __iter__(self):
+        return iter(self.queries)
+
+
+@contextmanager
+def capture_queries(db):
+    """
+    Registra todo lo que ejecuta `db` dentro del bloque. Usa
+    set_trace_callback, así que reemplaza cualquier otro callback activo.
+    """
+    captured = CapturedQueries()
+    db.set_trace_callback(captured.statements.append)
+    try:
+        yield captured
+    finally:
+        db.set_trace_callback(None)
+
+
+@contextmanager
+def assert_num_queries(db, expected: int, include_transactions: bool = False):
+    """AssertionError si el bloque no ejecuta exactamente `expected` queries"""
+    with capture_queries(db) as captured:
+        yield captured
+
+    statements = captured.statements if include_transactions else captured.queries
+    if len(statements) != expected:
+        listing = "\n".join(f"  {sql}" for sql in statements)
+        raise AssertionError(
+            f"Se esperaban {expected} queries y se ejecutaron {len(statements)}:\n{listing}"
+        )
@@ -1,5 +1,6 @@
 import threading
 import queue
+import os
 from datetime import datetime
 
 
@@ -27,6 +28,13 @@ class Logger:
             return
 
         self._initialized = True
+        self._start_worker()
+
+        # Tras un fork el thread no existe en el hijo: se vuelve a crear
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._start_worker)
+
+    def _start_worker(self):
         self.queue = queue.Queue()
         self.running = True
         self.thread = threading.Thread(target=self._log_worker, daemon=True)
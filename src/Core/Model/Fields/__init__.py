@@ -1,3 +1,5 @@
+from Core.Model.Transaction import maybe_commit
+
 import sqlite3
 from datetime import datetime
 
@@ -11,6 +13,7 @@ class Field:
         null=True,
         unique=False,
         default=None,
+        db_index=False,
     ):
         self.sql_type = sql_type
         self.primary_key = primary_key
@@ -18,6 +21,8 @@ class Field:
         self.null = null
         self.unique = unique
         self.default = default
+        # Índice simple sobre la columna (ver Model.sync_indexes)
+        self.db_index = db_index
         self.column_name = None
 
     def to_sql(self):
@@ -93,6 +98,8 @@ class DateTimeField(Field):
 
 class ForeignKey(Field):
     def __init__(self, to, on_delete="CASCADE", related_name=None, **kwargs):
+        # Se filtra y se hace JOIN por la FK: indexada salvo que se pida lo contrario
+        kwargs.setdefault("db_index", True)
         super().__init__("INTEGER", **kwargs)
         self.to = to
         self.on_delete = on_delete
@@ -127,6 +134,11 @@ class ForeignKey(Field):
         if fk_value is None:
             return None
 
+        # Ya cargado por select_related / prefetch_related (si sigue vigente)
+        related = instance.__dict__.get("_related", {}).get(self.column_name)
+        if related is not None and getattr(related, self.to._pk_field) == fk_value:
+            return related
+
         return self.to.get(id=fk_value)
 
 
@@ -169,7 +181,12 @@ class ManyToManyField:
 
         cursor = source_model._db.cursor()
         cursor.execute(sql)
-        source_model._db.commit()
+        # UNIQUE(origen, destino) ya indexa por origen; esto cubre el lado inverso
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{through_table_name}_{target_table}_id "
+            f"ON {through_table_name} ({target_table}_id)"
+        )
+        maybe_commit(source_model._db)
 
         self.through_table = through_table_name
         self.source_column = f"{source_table}_id"
@@ -179,6 +196,23 @@ class ManyToManyField:
         return ManyToManyManager(instance, self)
 
 
+class ManyToManyDescriptor:
+    """
+    Crea el manager la primera vez que se accede al atributo y lo guarda en
+    la instancia; las filas que nunca lo usan no pagan su construcción.
+    """
+
+    def __init__(self, field: ManyToManyField):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.field
+        manager = self.field.get_manager(instance)
+        instance.__dict__[self.field.column_name] = manager
+        return manager
+
+
 class ManyToManyManager:
     def __init__(self, instance, field):
         self.instance = instance
@@ -187,6 +221,9 @@ class ManyToManyManager:
         self.source_column = field.source_column
         self.target_column = field.target_column
 
+    def _forget_prefetched(self):
+        self.instance.__dict__.get("_prefetched", {}).pop(self.field.column_name, None)
+
     def add(self, *objects):
         cursor = self.instance._db.cursor()
         for obj in objects:
@@ -197,7 +234,8 @@ class ManyToManyManager:
                 )
             except sqlite3.IntegrityError:
                 pass
-        self.instance._db.commit()
+        maybe_commit(self.instance._db)
+        self._forget_prefetched()
 
     def remove(self, *objects):
         cursor = self.instance._db.cursor()
@@ -206,33 +244,26 @@ class ManyToManyManager:
                 f"DELETE FROM {self.through_table} WHERE {self.source_column} = ? AND {self.target_column} = ?",
                 (self.instance.id, obj.id),
             )
-        self.instance._db.commit()
+        maybe_commit(self.instance._db)
+        self._forget_prefetched()
 
     def all(self):
+        prefetched = self.instance.__dict__.get("_prefetched", {})
+        if self.field.column_name in prefetched:
+            return list(prefetched[self.field.column_name])
+
+        target = self.field.to
         cursor = self.instance._db.cursor()
+        cursor.row_factory = None
         cursor.execute(
-            f"SELECT {self.target_column} FROM {self.through_table} WHERE {self.source_column} = ?",
+            f"SELECT target.* FROM {target._table_name} target "
+            f"JOIN {self.through_table} through "
+            f"ON through.{self.target_column} = target.{target._pk_field} "
+            f"WHERE through.{self.source_column} = ?",
             (self.instance.id,),
         )
 
-        ids = [row[0] for row in cursor.fetchall()]
-
-        if not ids:
-            return []
-
-        placeholders = ",".join(["?"] * len(ids))
-        target_table = self.field.to._table_name
-
-        cursor.execute(
-            f"SELECT * FROM {target_table} WHERE id IN ({placeholders})", ids
-        )
-
-        results = []
-        for row in cursor.fetchall():
-            obj = self.field.to._from_db(row, cursor.description)
-            results.append(obj)
-
-        return results
+        return target._hydrate(cursor.fetchall(), cursor.description)
 
     def clear(self):
         cursor = self.instance._db.cursor()
@@ -240,9 +271,14 @@ class ManyToManyManager:
             f"DELETE FROM {self.through_table} WHERE {self.source_column} = ?",
             (self.instance.id,),
         )
-        self.instance._db.commit()
+        maybe_commit(self.instance._db)
+        self._forget_prefetched()
 
     def count(self):
+        prefetched = self.instance.__dict__.get("_prefetched", {})
+        if self.field.column_name in prefetched:
+            return len(prefetched[self.field.column_name])
+
         cursor = self.instance._db.cursor()
         cursor.execute(
             f"SELECT COUNT(*) FROM {self.through_table} WHERE {self.source_column} = ?",
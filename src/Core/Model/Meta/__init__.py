@@ -1,4 +1,9 @@
-from Core.Model.Fields import Field, ManyToManyField
+from Core.Model.Fields import (
+    Field,
+    ManyToManyField,
+    ManyToManyDescriptor,
+    DateTimeField,
+)
 
 
 class ModelMeta(type):
@@ -13,7 +18,7 @@ class ModelMeta(type):
             if isinstance(value, ManyToManyField):
                 value.column_name = key
                 many_to_many_fields[key] = value
-                attrs.pop(key)
+                attrs[key] = ManyToManyDescriptor(value)
             elif isinstance(value, Field):
                 value.column_name = key
                 fields[key] = value
@@ -23,4 +28,80 @@ class ModelMeta(type):
         attrs["_many_to_many_fields"] = many_to_many_fields
         attrs["_table_name"] = attrs.get("_table_name", name.lower())
 
+        attrs.update(
+            mcs.compile(attrs["_table_name"], fields, attrs.get("_indexes", ()))
+        )
+
         return super().__new__(mcs, name, bases, attrs)
+
+    @staticmethod
+    def compile(table: str, fields: dict[str, Field], indexes=()) -> dict:
+        """
+        Metadatos y SQL estático del modelo, calculados una sola vez al
+        crear la clase: pk, orden de columnas, conversores, INSERT /
+        UPDATE / DELETE / SELECT por pk e índices.
+        """
+        pk = next((key for key, field in fields.items() if field.primary_key), None)
+        auto = next((key for key, field in fields.items() if field.auto_increment), None)
+
+        insert_columns = [key for key, field in fields.items() if not field.auto_increment]
+        update_columns = [key for key in fields if key != pk]
+
+        # db_index (y ForeignKey) + compuestos de `_indexes`; el nombre lleva
+        # el prefijo idx_<tabla>_ para saber cuáles administra el modelo
+        columns_sets = [(key,) for key, field in fields.items() if field.db_index]
+        for columns in indexes:
+            columns = (columns,) if isinstance(columns, str) else tuple(columns)
+            unknown = [name for name in columns if name not in fields]
+            if unknown:
+                raise ValueError(f"Unknown index fields for {table}: {unknown}")
+            if columns not in columns_sets:
+                columns_sets.append(columns)
+
+        def is_datetime(field, flag):
+            return isinstance(field, DateTimeField) and getattr(field, flag)
+
+        return {
+            "_pk_field": pk,
+            "_auto_field": auto,
+            "_insert_columns": insert_columns,
+            # (nombre, to_sql_value, auto_now_add)
+            "_insert_converters": tuple(
+                (key, fields[key].to_sql_value, is_datetime(fields[key], "auto_now_add"))
+                for key in insert_columns
+            ),
+            # (nombre, to_sql_value, auto_now)
+            "_update_converters": tuple(
+                (key, fields[key].to_sql_value, is_datetime(fields[key], "auto_now"))
+                for key in update_columns
+            ),
+            # Solo los campos cuyo to_python hace algo
+            "_python_converters": {
+                key: field.to_python
+                for key, field in fields.items()
+                if type(field).to_python is not Field.to_python
+            },
+            "_insert_sql": (
+                f"INSERT INTO {table} ({', '.join(insert_columns)}) "
+                f"VALUES ({', '.join(['?'] * len(insert_columns))})"
+            ),
+            "_update_sql": (
+                f"UPDATE {table} SET {', '.join(f'{key} = ?' for key in update_columns)} "
+                f"WHERE {pk} = ?"
+                if pk and update_columns
+                else None
+            ),
+            "_delete_sql": f"DELETE FROM {table} WHERE {pk} = ?" if pk else None,
+            "_select_sql": f"SELECT * FROM {table}",
+            "_select_pk_sql": f"SELECT * FROM {table} WHERE {pk} = ?" if pk else None,
+            # nombre -> CREATE INDEX
+            "_index_sql": {
+                f"idx_{table}_{'_'.join(columns)}": (
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} "
+                    f"ON {table} ({', '.join(columns)})"
+                )
+                for columns in columns_sets
+            },
+            # SQL renderizado por el QuerySet según la forma de la consulta
+            "_query_cache": {},
+        }
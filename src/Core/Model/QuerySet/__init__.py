@@ -1,3 +1,29 @@
+from collections import namedtuple
+from itertools import repeat
+
+# Formas de consulta distintas que se recuerdan por modelo
+QUERY_CACHE_SIZE = 256
+
+# Filas por fetchmany en iterator() y por página en pages()
+ITERATOR_CHUNK_SIZE = 2000
+
+# Máximo de ids por IN (...) en prefetch_related (límite clásico de SQLite)
+PREFETCH_BATCH_SIZE = 999
+
+# (modelo, columnas) -> clase namedtuple de records()
+_record_types = {}
+
+
+def record_type(model, columns):
+    """namedtuple compartido por todas las filas con las mismas columnas"""
+    key = (model, columns)
+    record = _record_types.get(key)
+    if record is None:
+        record = namedtuple(f"{model.__name__}Record", columns, rename=True)
+        _record_types[key] = record
+    return record
+
+
 class QuerySet:
     def __init__(self, model, db):
         self.model = model
@@ -6,6 +32,15 @@ class QuerySet:
         self._order = []
         self._limit = None
         self._offset = None
+        # Modo de lectura: None (instancias), values, values_list o records
+        self._mode = None
+        self._columns = ()
+        self._flat = False
+        # ForeignKey con JOIN y relaciones precargadas con IN (...)
+        self._related = ()
+        self._prefetch = ()
+        # Resultado ya evaluado (len, bool, iter e índices lo reutilizan)
+        self._result_cache = None
     
     def filter(self, **kwargs):
         new = self._clone()
@@ -50,8 +85,65 @@ class QuerySet:
         new._offset = n
         return new
     
+    def _select(self, mode, fields, flat=False):
+        columns = tuple(fields) or tuple(self.model._fields)
+        unknown = [name for name in columns if name not in self.model._fields]
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.model.__name__}: {unknown}")
+        if flat and len(columns) != 1:
+            raise ValueError("flat=True requires exactly one field")
+        
+        new = self._clone()
+        new._mode = mode
+        new._columns = columns
+        new._flat = flat
+        return new
+    
+    def values(self, *fields):
+        """Filas como dicts {campo: valor}, sin construir instancias"""
+        return self._select('values', fields)
+    
+    def values_list(self, *fields, flat=False):
+        """Filas como tuplas (o valores sueltos con flat=True)"""
+        return self._select('values_list', fields, flat)
+    
+    def records(self, *fields):
+        """Filas de solo lectura como namedtuples (sin __dict__ por fila)"""
+        return self._select('records', fields)
+    
+    def select_related(self, *fields):
+        """
+        LEFT JOIN con las ForeignKey indicadas: el objeto relacionado se
+        hidrata de la misma fila (obj.related("user") no consulta).
+        """
+        for name in fields:
+            if not getattr(self.model._fields.get(name), 'is_foreign_key', False):
+                raise ValueError(f"{name} is not a ForeignKey of {self.model.__name__}")
+        
+        new = self._clone()
+        new._related += tuple(name for name in fields if name not in new._related)
+        return new
+    
+    def prefetch_related(self, *fields):
+        """
+        Precarga ForeignKey o ManyToManyField de todo el resultado con una
+        query IN (...) por relación, en vez de una (o dos) por instancia.
+        """
+        for name in fields:
+            field = self.model._fields.get(name)
+            if name not in self.model._many_to_many_fields and not getattr(
+                field, 'is_foreign_key', False
+            ):
+                raise ValueError(f"{name} is not a relation of {self.model.__name__}")
+        
+        new = self._clone()
+        new._prefetch += tuple(name for name in fields if name not in new._prefetch)
+        return new
+    
     def first(self):
-        results = self.limit(1).execute()
+        results = self._result_cache
+        if results is None:
+            results = self.limit(1).execute()
         return results[0] if results else None
     
     def get(self, **kwargs):
@@ -63,46 +155,329 @@ class QuerySet:
         return results[0]
     
     def count(self):
-        sql = f"SELECT COUNT(*) FROM {self.model._table_name}"
-        where, params = self._build_where()
-        if where:
-            sql += f" WHERE {where}"
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        sql, params = self._render('count')
         
         cursor = self.db.cursor()
         cursor.execute(sql, params)
         return cursor.fetchone()[0]
     
     def exists(self):
+        if self._result_cache is not None:
+            return bool(self._result_cache)
         return self.count() > 0
     
     def execute(self):
-        sql = f"SELECT * FROM {self.model._table_name}"
+        """Ejecuta siempre el SELECT y deja el resultado en el cache"""
+        sql, params = self._render('select')
+        
+        cursor = self.db.cursor()
+        cursor.row_factory = None
+        cursor.execute(sql, params)
+        
+        self._result_cache = self._build_rows(cursor.fetchall(), cursor.description)
+        return self._result_cache
+    
+    def _fetch_all(self):
+        if self._result_cache is None:
+            self.execute()
+        return self._result_cache
+    
+    def _build_rows(self, rows, description):
+        if self._mode is not None:
+            return self._convert_rows(rows)
+        
+        if self._related:
+            objects = self._hydrate_related(rows)
+        else:
+            objects = self.model._hydrate(rows, description)
+        
+        for name in self._prefetch:
+            if name in self.model._many_to_many_fields:
+                self._prefetch_many(objects, name)
+            else:
+                self._prefetch_foreign(objects, name)
+        return objects
+    
+    def _hydrate_related(self, rows):
+        """Parte cada fila del JOIN: primero el modelo, luego cada ForeignKey"""
+        model = self.model
+        width = len(model._fields)
+        objects = model._hydrate(
+            [row[:width] for row in rows], [(name,) for name in model._fields]
+        )
         
-        where, params = self._build_where()
+        start = width
+        for name in self._related:
+            target = model._fields[name].to
+            end = start + len(target._fields)
+            pk_index = list(target._fields).index(target._pk_field)
+            
+            # Una instancia por pk aunque se repita en muchas filas
+            unique = {}
+            for row in rows:
+                if row[start + pk_index] is not None:
+                    unique.setdefault(row[start + pk_index], row[start:end])
+            related = dict(zip(unique, target._hydrate(
+                unique.values(), [(column,) for column in target._fields]
+            )))
+            
+            for obj, row in zip(objects, rows):
+                obj.__dict__.setdefault('_related', {})[name] = related.get(
+                    row[start + pk_index]
+                )
+            start = end
+        return objects
+    
+    def _fetch_in(self, sql, ids):
+        """Ejecuta `sql` con IN (...) sobre `ids`, de a PREFETCH_BATCH_SIZE"""
+        rows, description = [], None
+        for start in range(0, len(ids), PREFETCH_BATCH_SIZE):
+            chunk = ids[start:start + PREFETCH_BATCH_SIZE]
+            cursor = self.db.cursor()
+            cursor.row_factory = None
+            cursor.execute(sql.format(', '.join(['?'] * len(chunk))), chunk)
+            rows += cursor.fetchall()
+            description = cursor.description
+        return rows, description
+    
+    def _prefetch_foreign(self, objects, name):
+        target = self.model._fields[name].to
+        ids = list({getattr(obj, name) for obj in objects} - {None})
+        
+        found = {}
+        if ids:
+            rows, description = self._fetch_in(
+                f"{target._select_sql} WHERE {target._pk_field} IN ({{}})", ids
+            )
+            for obj in target._hydrate(rows, description):
+                found[getattr(obj, target._pk_field)] = obj
+        
+        for obj in objects:
+            obj.__dict__.setdefault('_related', {})[name] = found.get(getattr(obj, name))
+    
+    def _prefetch_many(self, objects, name):
+        field = self.model._many_to_many_fields[name]
+        target = field.to
+        pk = self.model._pk_field
+        ids = list({getattr(obj, pk) for obj in objects})
+        
+        grouped = {}
+        if ids:
+            rows, description = self._fetch_in(
+                f"SELECT through.{field.source_column}, target.* "
+                f"FROM {field.through_table} through "
+                f"JOIN {target._table_name} target "
+                f"ON target.{target._pk_field} = through.{field.target_column} "
+                f"WHERE through.{field.source_column} IN ({{}})",
+                ids,
+            )
+            # Columna del pk del destino (la 0 es el id de origen)
+            key = 1 + list(target._fields).index(target._pk_field)
+            unique = {}
+            for row in rows:
+                unique.setdefault(row[key], row[1:])
+            related = dict(zip(unique, target._hydrate(unique.values(), description[1:])))
+            
+            for row in rows:
+                grouped.setdefault(row[0], []).append(related[row[key]])
+        
+        for obj in objects:
+            obj.__dict__.setdefault('_prefetched', {})[name] = grouped.get(getattr(obj, pk), [])
+    
+    def iterator(self, chunk_size=ITERATOR_CHUNK_SIZE):
+        """
+        Recorre el resultado con fetchmany: en memoria solo hay `chunk_size`
+        filas a la vez, hidratadas a medida que se consumen.
+        """
+        sql, params = self._render('select')
+        
+        cursor = self.db.cursor()
+        cursor.row_factory = None
+        cursor.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from self._build_rows(rows, cursor.description)
+        finally:
+            cursor.close()
+    
+    def _pk_direction(self):
+        pk = self.model._pk_field
+        if not pk:
+            raise ValueError(f"{self.model.__name__} has no primary key")
+        for field, direction in self._order:
+            if field != pk:
+                raise ValueError("Keyset pagination requires ordering only by the primary key")
+            return pk, direction
+        return pk, 'ASC'
+    
+    def after_pk(self, value):
+        """
+        Keyset: filas después de `value` según el orden por pk (ASC por
+        defecto, o DESC con order_by('-id')). Usa el índice del pk en vez de
+        recorrer y descartar filas como OFFSET.
+        """
+        pk, direction = self._pk_direction()
+        new = self._clone()
+        if not new._order:
+            new._order.append((pk, direction))
+        new._filters.append((pk, '>' if direction == 'ASC' else '<', value))
+        return new
+    
+    def _pk_of(self, row):
+        pk = self.model._pk_field
+        if self._mode is None:
+            return getattr(row, pk)
+        if self._mode == 'values':
+            return row[pk]
+        if self._flat:
+            return row
+        return row[self._columns.index(pk)]
+    
+    def pages(self, size=ITERATOR_CHUNK_SIZE):
+        """
+        Páginas de `size` filas con keyset (after_pk), sin OFFSET. Un
+        offset() del queryset solo se aplica a la primera página: las
+        siguientes arrancan después del último pk visto. Un limit() del
+        queryset acota el total de filas, no el de cada página.
+        """
+        pk, _ = self._pk_direction()
+        if self._mode is not None and pk not in self._columns:
+            raise ValueError("pages() needs the primary key among the selected fields")
+        
+        remaining = self._limit
+        rest = self.offset(None)
+        last = None
+        while remaining is None or remaining > 0:
+            limit = size if remaining is None else min(size, remaining)
+            query = self if last is None else rest.after_pk(last)
+            rows = query.limit(limit).execute()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < limit:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            last = self._pk_of(rows[-1])
+    
+    def _convert_rows(self, rows):
+        """Aplica to_python por columna y arma values / values_list / records"""
+        columns = self._columns
+        converters = [
+            (index, self.model._python_converters[name])
+            for index, name in enumerate(columns)
+            if name in self.model._python_converters
+        ]
+        
+        if converters:
+            converted = []
+            for row in rows:
+                row = list(row)
+                for index, to_python in converters:
+                    row[index] = to_python(row[index])
+                converted.append(row)
+            rows = converted
+        
+        if self._mode == 'values':
+            return [dict(zip(columns, row)) for row in rows]
+        if self._mode == 'records':
+            # tuple.__new__ directo: evita la llamada a _make por fila
+            record = record_type(self.model, columns)
+            return list(map(tuple.__new__, repeat(record), rows))
+        if self._flat:
+            return [row[0] for row in rows]
+        return [tuple(row) for row in rows] if converters else rows
+    
+    def _joined(self, kind):
+        return kind == 'select' and self._mode is None and bool(self._related)
+    
+    def _shape(self, kind):
+        """Todo lo que define el texto del SQL (los valores van como parámetros)"""
+        return (
+            kind,
+            self._columns if kind == 'select' else (),
+            self._related if self._joined(kind) else (),
+            tuple((field, op) for field, op, _ in self._filters),
+            tuple(self._order),
+            bool(self._limit),
+            bool(self._offset),
+        )
+    
+    def _render(self, kind):
+        """SQL cacheado en el modelo por forma de la consulta + sus parámetros"""
+        shape = self._shape(kind)
+        cache = self.model._query_cache
+        sql = cache.get(shape)
+        if sql is None:
+            sql = self._build_sql(kind)
+            if len(cache) >= QUERY_CACHE_SIZE:
+                cache.clear()
+            cache[shape] = sql
+        
+        params = [value for _, _, value in self._filters]
+        if kind == 'select':
+            if self._limit:
+                params.append(self._limit)
+            if self._offset:
+                params.append(self._offset)
+        return sql, params
+    
+    def _build_sql(self, kind):
+        table = self.model._table_name
+        # Con JOIN las columnas del modelo van calificadas con su tabla
+        prefix = f"{table}." if self._joined(kind) else ""
+        
+        if kind == 'count':
+            sql = f"SELECT COUNT(*) FROM {table}"
+        elif prefix:
+            sql = self._build_join(table)
+        elif self._columns:
+            sql = f"SELECT {', '.join(self._columns)} FROM {table}"
+        else:
+            sql = f"SELECT * FROM {table}"
+        
+        where, _ = self._build_where(prefix)
         if where:
             sql += f" WHERE {where}"
         
+        if kind == 'count':
+            return sql
+        
         if self._order:
-            order_sql = ", ".join([f"{field} {direction}" for field, direction in self._order])
+            order_sql = ", ".join(
+                [f"{prefix}{field} {direction}" for field, direction in self._order]
+            )
             sql += f" ORDER BY {order_sql}"
         
         if self._limit:
-            sql += f" LIMIT {self._limit}"
+            sql += " LIMIT ?"
         
         if self._offset:
-            sql += f" OFFSET {self._offset}"
+            # SQLite exige LIMIT para usar OFFSET
+            sql += " OFFSET ?" if self._limit else " LIMIT -1 OFFSET ?"
         
-        cursor = self.db.cursor()
-        cursor.execute(sql, params)
-        
-        results = []
-        for row in cursor.fetchall():
-            obj = self.model._from_db(row, cursor.description)
-            results.append(obj)
-        
-        return results
+        return sql
     
-    def _build_where(self):
+    def _build_join(self, table):
+        """SELECT con las columnas del modelo y de cada ForeignKey, en orden"""
+        columns = [f"{table}.{name}" for name in self.model._fields]
+        joins = []
+        for index, name in enumerate(self._related):
+            target = self.model._fields[name].to
+            alias = f"related_{index}"
+            columns += [f"{alias}.{column}" for column in target._fields]
+            joins.append(
+                f"LEFT JOIN {target._table_name} {alias} "
+                f"ON {alias}.{target._pk_field} = {table}.{name}"
+            )
+        return f"SELECT {', '.join(columns)} FROM {table} {' '.join(joins)}"
+    
+    def _build_where(self, prefix=""):
         if not self._filters:
             return "", []
         
@@ -110,7 +485,7 @@ class QuerySet:
         params = []
         
         for field, op, value in self._filters:
-            conditions.append(f"{field} {op} ?")
+            conditions.append(f"{prefix}{field} {op} ?")
             params.append(value)
         
         return " AND ".join(conditions), params
@@ -121,15 +496,25 @@ class QuerySet:
         new._order = self._order.copy()
         new._limit = self._limit
         new._offset = self._offset
+        new._mode = self._mode
+        new._columns = self._columns
+        new._flat = self._flat
+        new._related = self._related
+        new._prefetch = self._prefetch
         return new
     
     def __iter__(self):
-        return iter(self.execute())
+        return iter(self._fetch_all())
     
     def __len__(self):
-        return self.count()
+        return len(self._fetch_all())
+    
+    def __bool__(self):
+        return bool(self._fetch_all())
     
     def __getitem__(self, key):
+        if self._result_cache is not None:
+            return self._result_cache[key]
         if isinstance(key, slice):
             new = self._clone()
             if key.start:
@@ -0,0 +1,75 @@
+"""
+Unidad de trabajo para las escrituras del ORM.
+
+Dentro de `atomic()` los `save()`, `delete()`, `bulk_create()` y los
+managers many-to-many no hacen commit: todo se confirma una sola vez al
+salir del bloque, o se revierte si hubo una excepción. Los bloques
+anidados usan SAVEPOINT, así que un error interno solo deshace su parte.
+
+    with atomic(db):
+        for row in rows:
+            User.create(**row)
+"""
+
+from contextlib import contextmanager
+import threading
+
+# id(conexión) -> profundidad de atomic() abiertos sobre ella
+_depths: dict[int, int] = {}
+_lock = threading.Lock()
+
+
+def _key(db) -> int:
+    # ThreadLocalConnection: la conexión real del thread, no el proxy compartido
+    return id(getattr(db, "connection", db))
+
+
+def in_atomic(db) -> bool:
+    return _depths.get(_key(db), 0) > 0
+
+
+def maybe_commit(db):
+    """Commit inmediato, salvo que haya un atomic() abierto en la conexión"""
+    if not in_atomic(db):
+        db.commit()
+
+
+@contextmanager
+def atomic(db):
+    """
+    Transacción sobre `db`. El bloque más externo hace BEGIN/COMMIT (o
+    ROLLBACK); los internos, SAVEPOINT/RELEASE (o ROLLBACK TO).
+    """
+    key = _key(db)
+    with _lock:
+        depth = _depths.get(key, 0)
+        _depths[key] = depth + 1
+
+    # Si ya hay una transacción implícita abierta, también se anida
+    savepoint = f"atomic_{depth}" if depth or db.in_transaction else None
+    try:
+        db.execute(f"SAVEPOINT {savepoint}" if savepoint else "BEGIN")
+        try:
+            yield db
+        except BaseException:
+            if savepoint:
+                db.execute(f"ROLLBACK TO {savepoint}")
+                db.execute(f"RELEASE {savepoint}")
+            else:
+                db.rollback()
+            raise
+
+        if savepoint:
+            db.execute(f"RELEASE {savepoint}")
+        else:
+            try:
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+    finally:
+        with _lock:
+            if depth:
+                _depths[key] = depth
+            else:
+                _depths.pop(key, None)
@@ -1,5 +1,6 @@
 from Core.Model.Meta import ModelMeta
 from Core.Model.QuerySet import QuerySet
+from Core.Model.Transaction import atomic, in_atomic, maybe_commit
 
 from Core.Model.Fields import DateTimeField
 
@@ -10,7 +11,11 @@ class Model(metaclass=ModelMeta):
     _fields = {}
     _many_to_many_fields = {}
     _table_name = ""
+    # Índices compuestos, ej: _indexes = [("user", "created_at")]
+    _indexes = ()
     _db = None
+    # Conexión opcional de solo lectura para las consultas
+    _read_db = None
 
     def __init__(self, **kwargs):
         self._is_new = True
@@ -19,12 +24,20 @@ class Model(metaclass=ModelMeta):
             value = kwargs.get(name, field.default)
             setattr(self, name, value)
 
-        for name, field in self._many_to_many_fields.items():
-            setattr(self, name, field.get_manager(self))
-
     @classmethod
-    def setup_db(cls, db):
+    def setup_db(cls, db, read_db=None):
         cls._db = db
+        cls._read_db = read_db
+
+    @classmethod
+    def _reader(cls):
+        """
+        Conexión para leer: la de solo lectura, salvo dentro de atomic(),
+        donde hay que ver las escrituras todavía sin confirmar.
+        """
+        if cls._read_db is None or in_atomic(cls._db):
+            return cls._db
+        return cls._read_db
 
     @classmethod
     def create_table(cls):
@@ -33,21 +46,57 @@ class Model(metaclass=ModelMeta):
 
         cursor = cls._db.cursor()
         cursor.execute(sql)
-        cls._db.commit()
+        maybe_commit(cls._db)
 
         for field in cls._many_to_many_fields.values():
             field.create_through_table(cls)
 
+        cls.sync_indexes()
+
+    @classmethod
+    def sync_indexes(cls) -> tuple[list[str], list[str]]:
+        """
+        Deja en la base exactamente los índices declarados (db_index,
+        ForeignKey y `_indexes`): crea los que faltan y borra los idx_<tabla>_
+        que ya no están declarados. Es idempotente; devuelve (creados, borrados).
+        """
+        cursor = cls._db.cursor()
+        cursor.execute(f"PRAGMA index_list({cls._table_name})")
+        # (seq, name, unique, origin, partial): origin "c" = CREATE INDEX
+        existing = {row[1] for row in cursor.fetchall() if row[3] == "c"}
+        prefix = f"idx_{cls._table_name}_"
+
+        created = [name for name in cls._index_sql if name not in existing]
+        dropped = [
+            name
+            for name in existing
+            if name.startswith(prefix) and name not in cls._index_sql
+        ]
+        if not created and not dropped:
+            return created, dropped
+
+        with atomic(cls._db):
+            for name in dropped:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            for name in created:
+                cursor.execute(cls._index_sql[name])
+        return created, dropped
+
     @classmethod
     def drop_table(cls):
         sql = f"DROP TABLE IF EXISTS {cls._table_name}"
         cursor = cls._db.cursor()
         cursor.execute(sql)
-        cls._db.commit()
+        maybe_commit(cls._db)
+
+    @classmethod
+    def atomic(cls):
+        """Unidad de trabajo sobre la conexión del modelo (ver Core.Model.Transaction)"""
+        return atomic(cls._db)
 
     @classmethod
     def all(cls):
-        return QuerySet(cls, cls._db)
+        return QuerySet(cls, cls._reader())
 
     @classmethod
     def filter(cls, **kwargs):
@@ -55,6 +104,14 @@ class Model(metaclass=ModelMeta):
 
     @classmethod
     def get(cls, **kwargs):
+        # Búsqueda por pk: SQL precompilado, sin pasar por el QuerySet
+        if len(kwargs) == 1 and cls._pk_field in kwargs:
+            cursor = cls._cursor()
+            cursor.execute(cls._select_pk_sql, [kwargs[cls._pk_field]])
+            row = cursor.fetchone()
+            if row is None:
+                raise Exception(f"{cls.__name__} not found")
+            return cls._from_db(row, cursor.description)
         return cls.all().get(**kwargs)
 
     @classmethod
@@ -69,110 +126,178 @@ class Model(metaclass=ModelMeta):
         else:
             self._update()
 
-    def _insert(self):
-        fields_to_insert = {}
-        for name, field in self._fields.items():
-            if field.auto_increment:
-                continue
-
+    def _insert_params(self) -> list:
+        """Valores en el orden de `_insert_columns`"""
+        params = []
+        for name, to_sql_value, auto_now_add in self._insert_converters:
             value = getattr(self, name, None)
-
-            if (
-                isinstance(field, DateTimeField)
-                and field.auto_now_add
-                and value is None
-            ):
+            if auto_now_add and value is None:
                 value = datetime.now()
                 setattr(self, name, value)
+            params.append(to_sql_value(value))
+        return params
 
-            fields_to_insert[name] = field.to_sql_value(value)
-
-        names = list(fields_to_insert.keys())
-        values = list(fields_to_insert.values())
-        placeholders = ", ".join(["?"] * len(values))
-
-        sql = f"INSERT INTO {self._table_name} ({', '.join(names)}) VALUES ({placeholders})"
-
+    def _insert(self):
         cursor = self._db.cursor()
-        cursor.execute(sql, values)
-        self._db.commit()
+        cursor.execute(self._insert_sql, self._insert_params())
+        maybe_commit(self._db)
 
-        for name, field in self._fields.items():
-            if field.auto_increment:
-                setattr(self, name, cursor.lastrowid)
+        if self._auto_field:
+            setattr(self, self._auto_field, cursor.lastrowid)
 
         self._is_new = False
 
-    def _update(self):
-        pk_field = None
-        pk_value = None
-        for name, field in self._fields.items():
-            if field.primary_key:
-                pk_field = name
-                pk_value = getattr(self, name)
-                break
+    @classmethod
+    def bulk_create(cls, objs: list["Model"], batch_size: int = None) -> list["Model"]:
+        """
+        Inserta los objetos con executemany (de a `batch_size` filas) dentro
+        de una sola transacción. Los ids autoincrementales se rellenan a
+        partir de last_insert_rowid() de cada lote.
+        """
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        batch_size = batch_size or len(objs)
+        with atomic(cls._db):
+            cursor = cls._db.cursor()
+            for start in range(0, len(objs), batch_size):
+                batch = objs[start : start + batch_size]
+                cursor.executemany(
+                    cls._insert_sql, [obj._insert_params() for obj in batch]
+                )
+                if cls._auto_field:
+                    cursor.execute("SELECT last_insert_rowid()")
+                    last_id = cursor.fetchone()[0]
+                    # Dentro de la transacción los ids AUTOINCREMENT son consecutivos
+                    for offset, obj in enumerate(batch, last_id - len(batch) + 1):
+                        setattr(obj, cls._auto_field, offset)
+
+        for obj in objs:
+            obj._is_new = False
+        return objs
 
+    @classmethod
+    def bulk_update(
+        cls, objs: list["Model"], fields: list[str], batch_size: int = None
+    ) -> int:
+        """
+        Actualiza `fields` de los objetos con un UPDATE ... WHERE pk = ?
+        ejecutado con executemany. Los campos auto_now se refrescan igual
+        que en save(). Devuelve las filas afectadas.
+        """
+        objs = list(objs)
+        if not objs:
+            return 0
+
+        pk_field = cls._pk_field
         if not pk_field:
             raise Exception("Cannot update without primary key")
 
-        sets = []
-        values = []
-        for name, field in self._fields.items():
-            if name == pk_field:
-                continue
-
-            value = getattr(self, name)
-
-            if isinstance(field, DateTimeField) and field.auto_now:
-                value = datetime.now()
-                setattr(self, name, value)
+        unknown = [name for name in fields if name not in cls._fields]
+        if unknown:
+            raise ValueError(f"Unknown fields for {cls.__name__}: {unknown}")
+
+        names = [name for name in fields if name != pk_field]
+        names += [
+            name
+            for name, field in cls._fields.items()
+            if isinstance(field, DateTimeField) and field.auto_now and name not in names
+        ]
+        if not names:
+            return 0
+
+        sets = ", ".join(f"{name} = ?" for name in names)
+        sql = f"UPDATE {cls._table_name} SET {sets} WHERE {pk_field} = ?"
+        now = datetime.now()
+
+        def params(obj):
+            values = []
+            for name in names:
+                field = cls._fields[name]
+                if isinstance(field, DateTimeField) and field.auto_now:
+                    setattr(obj, name, now)
+                values.append(field.to_sql_value(getattr(obj, name)))
+            values.append(getattr(obj, pk_field))
+            return values
+
+        batch_size = batch_size or len(objs)
+        updated = 0
+        with atomic(cls._db):
+            cursor = cls._db.cursor()
+            for start in range(0, len(objs), batch_size):
+                batch = objs[start : start + batch_size]
+                cursor.executemany(sql, [params(obj) for obj in batch])
+                updated += cursor.rowcount
+        return updated
 
-            sets.append(f"{name} = ?")
-            values.append(field.to_sql_value(value))
+    def _update(self):
+        if not self._pk_field:
+            raise Exception("Cannot update without primary key")
+        if self._update_sql is None:
+            return
 
-        values.append(pk_value)
-        sql = f"UPDATE {self._table_name} SET {', '.join(sets)} WHERE {pk_field} = ?"
+        values = []
+        for name, to_sql_value, auto_now in self._update_converters:
+            if auto_now:
+                setattr(self, name, datetime.now())
+            values.append(to_sql_value(getattr(self, name)))
+        values.append(getattr(self, self._pk_field))
 
         cursor = self._db.cursor()
-        cursor.execute(sql, values)
-        self._db.commit()
+        cursor.execute(self._update_sql, values)
+        maybe_commit(self._db)
 
-    def delete(self):
-        pk_field = None
-        pk_value = None
-        for name, field in self._fields.items():
-            if field.primary_key:
-                pk_field = name
-                pk_value = getattr(self, name)
-                break
+    def related(self, name: str):
+        """Objeto de la ForeignKey `name` (sin query si vino con select_related)"""
+        return self._fields[name].get_related_object(self)
 
-        if not pk_field:
+    def delete(self):
+        if not self._pk_field:
             raise Exception("Cannot delete without primary key")
 
-        sql = f"DELETE FROM {self._table_name} WHERE {pk_field} = ?"
         cursor = self._db.cursor()
-        cursor.execute(sql, [pk_value])
-        self._db.commit()
+        cursor.execute(self._delete_sql, [getattr(self, self._pk_field)])
+        maybe_commit(self._db)
 
     @classmethod
-    def _from_db(cls, row, description):
-        obj = cls.__new__(cls)
-        obj._is_new = False
-
-        for i, col in enumerate(description):
-            name = col[0]
-            value = row[i]
-
-            if name in cls._fields:
-                field = cls._fields[name]
-                value = field.to_python(value)
+    def _cursor(cls):
+        """Cursor para lecturas que se hidratan: filas como tuplas, sin sqlite3.Row"""
+        cursor = cls._reader().cursor()
+        cursor.row_factory = None
+        return cursor
 
-            setattr(obj, name, value)
-
-        for name, field in cls._many_to_many_fields.items():
-            setattr(obj, name, field.get_manager(obj))
+    @classmethod
+    def _hydrate(cls, rows, description) -> list["Model"]:
+        """
+        Construye instancias desde filas de un mismo cursor. El mapeo de
+        columnas a conversores se calcula una vez; los campos sin conversión
+        se copian tal cual y cada objeto recibe su __dict__ de una vez.
+        """
+        names = tuple(col[0] for col in description)
+        converters = [
+            (index, name, cls._python_converters[name])
+            for index, name in enumerate(names)
+            if name in cls._python_converters
+        ]
+        new = cls.__new__
+
+        objects = []
+        for row in rows:
+            values = dict(zip(names, row))
+            for index, name, to_python in converters:
+                values[name] = to_python(row[index])
+            values["_is_new"] = False
+
+            obj = new(cls)
+            obj.__dict__ = values
+            objects.append(obj)
+
+        return objects
 
-        return obj
+    @classmethod
+    def _from_db(cls, row, description):
+        return cls._hydrate((row,), description)[0]
 
     def __repr__(self):
         fields_str = ", ".join([f"{k}={getattr(self, k)}" for k in self._fields.keys()])
@@ -1,47 +1,192 @@
-import tensorflow as tf
-from tensorflow import keras as ks
 import numpy as np
+import hashlib
 import os
 
+from Core.Logger import Logger
+
+from .batching import MicroBatcher
+from .compiled import CompiledModel, export_model
+from .registry import ModelRegistry, ModelNotReady, ModelState
+from .cache import PredictionCache
+
 # TODO: Esto puede ser un Repository XD
 # TODO: Falta Diagramas...
 LOAD_PATH = "./model_hours_study_saved.keras"
-loaded_model = None
+# Pesos exportados a NumPy: evita cargar TensorFlow en cada worker
+COMPILED_PATH = "./model_hours_study_saved.npz"
+
+# Ventana del micro-batching: tamaño máximo del batch y espera máxima (µs)
+BATCH_MAX_SIZE = 64
+BATCH_MAX_WAIT_US = 2000
+
+# Batch de warm-up que se ejecuta al terminar la carga (traza el grafo en Keras)
+WARMUP_BATCH = [1.0, 2.0, 5.0, 8.0]
+
+# Entradas máximas por petición de predicción en lote
+PREDICT_MAX_INPUTS = 10_000
+
+# Cache de resultados: entradas máximas, TTL (s) y cuantización de la entrada
+CACHE_MAX_SIZE = 4096
+CACHE_TTL = 600
+CACHE_QUANTUM = 1e-3
+
 
-try:
+def _compiled_is_fresh() -> bool:
+    """El .npz existe y no es más viejo que el .keras"""
+    if not os.path.exists(COMPILED_PATH):
+        return False
     if not os.path.exists(LOAD_PATH):
-        raise FileNotFoundError(f"El directorio del modelo no existe en: {LOAD_PATH}")
+        return True
+    return os.path.getmtime(COMPILED_PATH) >= os.path.getmtime(LOAD_PATH)
+
+
+def _load_model():
+    if _compiled_is_fresh():
+        return CompiledModel.load(COMPILED_PATH)
+
+    if not os.path.exists(LOAD_PATH):
+        raise FileNotFoundError(
+            f"El directorio del modelo no existe en: {LOAD_PATH}. "
+            "Asegúrate de ejecutar el script de entrenamiento primero."
+        )
+
+    # TensorFlow solo se importa si hace falta exportar el modelo
+    from tensorflow import keras as ks
+
+    model = ks.models.load_model(LOAD_PATH)
+
+    try:
+        export_model(model, COMPILED_PATH)
+        return CompiledModel.load(COMPILED_PATH)
+    except Exception as e:
+        # Sigue sirviendo con Keras, pero sin el camino rápido en NumPy
+        Logger.warning(
+            f"No se pudo exportar el modelo a {COMPILED_PATH}, se usa Keras: {e}"
+        )
+        return model
+
+
+def export_compiled() -> bool:
+    """
+    Exporta el .keras a COMPILED_PATH si el .npz falta o quedó viejo, sin
+    cargar el modelo en el registry. En prefork se llama en el padre antes
+    del fork: así los workers solo leen el .npz y no lo reescriben a la vez.
+    Devuelve si hay un .npz al día.
+    """
+    if _compiled_is_fresh():
+        return True
+    if not os.path.exists(LOAD_PATH):
+        return False
+
+    try:
+        from tensorflow import keras as ks
+
+        export_model(ks.models.load_model(LOAD_PATH), COMPILED_PATH)
+        return True
+    except Exception as e:
+        Logger.warning(f"No se pudo exportar el modelo a {COMPILED_PATH}: {e}")
+        return False
 
-    print("Cargando el modelo de Keras (Formato SavedModel)...")
 
-    loaded_model = ks.models.load_model(LOAD_PATH)
-    print("✅ Modelo cargado exitosamente.")
+def _fingerprint() -> str:
+    """Hash del archivo de pesos que se acaba de cargar"""
+    path = COMPILED_PATH if _compiled_is_fresh() else LOAD_PATH
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
 
-except FileNotFoundError as e:
-    print(f"❌ ERROR: {e}")
-    print(
-        "Asegúrate de ejecutar el script de entrenamiento con model.export() primero."
-    )
 
-except Exception as e:
-    print(f"❌ ERROR inesperado al cargar el modelo: {e}")
+def _forward(model, hours: list[float]) -> list[float]:
+    """Un solo forward pass vectorizado para todo el batch"""
+    input_data = np.asarray(hours, dtype=np.float32).reshape(-1, 1)
+    if isinstance(model, CompiledModel):
+        output = model.predict(input_data)
+    else:
+        output = model(input_data, training=False)
+    return np.asarray(output, dtype=np.float32).reshape(-1).tolist()
+
+
+model_registry = ModelRegistry(
+    _load_model,
+    warmup=_forward,
+    warmup_batch=WARMUP_BATCH,
+    fingerprint=_fingerprint,
+    watch=[LOAD_PATH, COMPILED_PATH],
+)
+
+prediction_cache = PredictionCache(
+    maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL, quantum=CACHE_QUANTUM
+)
+model_registry.on_load(prediction_cache.clear)
+
+
+def _predict_batch(hours: list[float]) -> list[float]:
+    return _forward(model_registry.model, hours)
+
+
+batcher = MicroBatcher(
+    _predict_batch, max_batch_size=BATCH_MAX_SIZE, max_wait_us=BATCH_MAX_WAIT_US
+)
 
 
 def predict_note(hours: float):
     """
     Función de predicción para la nota de examen.
+
+    Lanza ModelNotReady si el modelo sigue cargando o falló al cargar.
     """
-    if loaded_model is None:
-        return {"error": "Modelo no cargado. Revisa los logs de inicio."}
+    model_registry.get()
+    model_registry.maybe_reload()
 
-    try:
-        input_data = np.array([[hours]], dtype=np.float32)
+    fingerprint = model_registry.fingerprint
 
-        prediction = loaded_model.predict(input_data)[0][0]
+    try:
+        prediction = prediction_cache.get(fingerprint, hours)
+        if prediction is PredictionCache.MISS:
+            prediction = float(batcher.predict(float(hours)))
+            prediction_cache.set(fingerprint, hours, prediction)
+            model_registry.record_prediction()
 
         return {
             "hours_studied": hours,
-            "predicted_note": float(prediction),
+            "predicted_note": prediction,
+        }
+    except Exception as e:
+        return {"error": f"Error durante la predicción: {str(e)}"}
+
+
+def predict_notes(hours: list[float]):
+    """
+    Predicción en lote: las entradas que no están en el cache pasan por el
+    modelo en un solo forward pass (sin pasar por el micro-batcher).
+
+    Lanza ModelNotReady si el modelo sigue cargando o falló al cargar.
+    """
+    model_registry.get()
+    model_registry.maybe_reload()
+
+    fingerprint = model_registry.fingerprint
+
+    try:
+        predictions = [prediction_cache.get(fingerprint, value) for value in hours]
+        missing = [
+            index
+            for index, prediction in enumerate(predictions)
+            if prediction is PredictionCache.MISS
+        ]
+
+        if missing:
+            outputs = _forward(model_registry.model, [float(hours[index]) for index in missing])
+            for index, output in zip(missing, outputs):
+                predictions[index] = output
+                prediction_cache.set(fingerprint, hours[index], output)
+            model_registry.record_prediction()
+
+        return {
+            "hours_studied": list(hours),
+            "predicted_notes": predictions,
         }
     except Exception as e:
         return {"error": f"Error durante la predicción: {str(e)}"}
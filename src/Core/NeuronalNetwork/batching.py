@@ -0,0 +1,167 @@
+from concurrent.futures import Future
+import threading
+import queue
+import time
+import os
+
+
+class MicroBatcher:
+    """
+    Agrupa peticiones de inferencia concurrentes en un solo batch.
+
+    Cada llamada a `submit` encola un valor y devuelve un Future. Un worker
+    recoge hasta `max_batch_size` valores o espera como máximo `max_wait_us`
+    microsegundos, ejecuta `predict_fn` una sola vez con todo el batch y
+    reparte cada resultado a su Future.
+    """
+
+    def __init__(
+        self,
+        predict_fn: callable,
+        max_batch_size: int = 64,
+        max_wait_us: int = 2000,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser >= 1")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_us = max_wait_us
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.running = False
+
+        self.batch_sizes: dict[int, int] = {}
+        self.batches = 0
+        self.items = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _ensure_worker(self):
+        """Arranca el worker al primer uso (y de nuevo tras un fork)"""
+        if self.running and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self.running and self._pid == os.getpid():
+                return
+
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self.running = True
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+
+    def submit(self, value) -> Future:
+        """Encola un valor y devuelve el Future con su predicción"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((value, future, time.perf_counter()))
+        return future
+
+    def predict(self, value, timeout: float = None):
+        """Atajo bloqueante: encola y espera el resultado"""
+        return self.submit(value).result(timeout=timeout)
+
+    def _collect(self, first) -> list:
+        """Junta items hasta llenar el batch o agotar la ventana de espera"""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_us / 1_000_000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _worker(self):
+        """Worker que ejecuta los batches en un thread separado"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = self._collect(first)
+            self._run(batch)
+
+    def _run(self, batch: list):
+        started = time.perf_counter()
+        values = [value for value, _, _ in batch]
+        futures = [future for _, future, _ in batch]
+
+        self._record(batch, started)
+
+        try:
+            results = self.predict_fn(values)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        if len(results) != len(futures):
+            error = RuntimeError(
+                f"predict_fn devolvió {len(results)} resultados para {len(futures)} entradas"
+            )
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def _record(self, batch: list, started: float):
+        size = len(batch)
+        with self._lock:
+            self.batch_sizes[size] = self.batch_sizes.get(size, 0) + 1
+            self.batches += 1
+            self.items += size
+            for _, _, enqueued in batch:
+                waited = started - enqueued
+                self.wait_total += waited
+                if waited > self.wait_max:
+                    self.wait_max = waited
+
+    def stats(self) -> dict[str, any]:
+        """Contadores: histograma de tamaños de batch y tiempo en cola"""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+                "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+                "avg_queue_wait_us": (
+                    self.wait_total / self.items * 1_000_000 if self.items else 0.0
+                ),
+                "max_queue_wait_us": self.wait_max * 1_000_000,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.batch_sizes = {}
+            self.batches = 0
+            self.items = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def shutdown(self, timeout: float = 2):
+        """Detiene el worker después de vaciar la cola"""
+        if not self.running or self._pid != os.getpid():
+            return
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self.running = False
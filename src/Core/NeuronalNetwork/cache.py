@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+class PredictionCache:
+    """
+    Cache LRU con TTL para resultados de inferencia.
+
+    La clave es (fingerprint del modelo, entrada cuantizada), así que un
+    modelo nuevo nunca devuelve resultados del anterior; además `clear` se
+    llama cada vez que el registry carga un modelo.
+    """
+
+    MISS = object()
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 600, quantum: float = 1e-3):
+        if maxsize < 1:
+            raise ValueError("maxsize debe ser >= 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.quantum = quantum
+
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def key(self, fingerprint: str, value: float) -> tuple:
+        """Cuantiza la entrada para que 2.0 y 2.0000001 compartan entrada"""
+        return (fingerprint, round(float(value) / self.quantum))
+
+    def get(self, fingerprint: str, value: float):
+        """Devuelve el resultado cacheado o PredictionCache.MISS"""
+        key = self.key(fingerprint, value)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return self.MISS
+
+            result, expires_at = entry
+            if self.ttl and expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return self.MISS
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def set(self, fingerprint: str, value: float, result):
+        key = self.key(fingerprint, value)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._data[key] = (result, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, *args):
+        """Invalida todo el cache (se usa como listener del registry)"""
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict[str, any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,160 @@
+"""
+Forward pass en NumPy puro para modelos Sequential exportados de Keras.
+
+`export_model` lee los pesos de un stack Dense/ReLU/Sigmoid/Dropout y los
+guarda en un .npz; `CompiledModel` lo evalúa con multiplicaciones de
+matrices, sin importar TensorFlow. Dropout se elimina en inferencia.
+"""
+
+import numpy as np
+import tempfile
+import json
+import sys
+import os
+
+
+def _linear(x):
+    return x
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _sigmoid(x):
+    # Forma estable para valores negativos grandes
+    out = np.empty_like(x)
+    pos = x >= 0
+    out[pos] = 1.0 / (1.0 + np.exp(-x[pos]))
+    exp_x = np.exp(x[~pos])
+    out[~pos] = exp_x / (1.0 + exp_x)
+    return out
+
+
+def _tanh(x):
+    return np.tanh(x, out=x)
+
+
+def _softmax(x):
+    shifted = x - x.max(axis=-1, keepdims=True)
+    exp_x = np.exp(shifted)
+    return exp_x / exp_x.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS: dict[str, callable] = {
+    "linear": _linear,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": _tanh,
+    "softmax": _softmax,
+}
+
+# Capas que no hacen nada en inferencia
+PASSTHROUGH_LAYERS = ("InputLayer", "Dropout")
+
+
+def _activation_name(activation) -> str:
+    name = getattr(activation, "__name__", None) or str(activation)
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Activación no soportada: {name}")
+    return name
+
+
+def export_model(model, path: str) -> str:
+    """
+    Exporta un modelo Sequential de Keras a un .npz compacto. Se escribe en
+    un temporal del mismo directorio y se renombra con os.replace: quien
+    lea `path` ve el archivo anterior o el nuevo completo, nunca uno a medias.
+    """
+    spec = []
+    arrays = {}
+
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+
+        if kind in PASSTHROUGH_LAYERS:
+            continue
+
+        if kind == "Dense":
+            weights = layer.get_weights()
+            index = len(spec)
+            arrays[f"kernel_{index}"] = np.asarray(weights[0], dtype=np.float32)
+            if len(weights) > 1:
+                arrays[f"bias_{index}"] = np.asarray(weights[1], dtype=np.float32)
+            spec.append(
+                {
+                    "type": "dense",
+                    "activation": _activation_name(layer.activation),
+                    "bias": len(weights) > 1,
+                }
+            )
+        elif kind == "Activation":
+            spec.append(
+                {"type": "activation", "activation": _activation_name(layer.activation)}
+            )
+        elif kind == "ReLU":
+            spec.append({"type": "activation", "activation": "relu"})
+        else:
+            raise ValueError(f"Capa no soportada para exportar: {kind}")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.savez(file, spec=np.array(json.dumps(spec)), **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return path
+
+
+class CompiledModel:
+    """Runtime ligero: evalúa las capas exportadas con NumPy"""
+
+    def __init__(self, layers: list[tuple]):
+        # Cada capa es (kernel | None, bias | None, activación)
+        self.layers = layers
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledModel":
+        with np.load(path, allow_pickle=False) as data:
+            spec = json.loads(str(data["spec"]))
+            layers = []
+            for index, layer in enumerate(spec):
+                activation = ACTIVATIONS[layer["activation"]]
+                if layer["type"] == "dense":
+                    kernel = np.ascontiguousarray(data[f"kernel_{index}"])
+                    bias = data[f"bias_{index}"] if layer["bias"] else None
+                    layers.append((kernel, bias, activation))
+                else:
+                    layers.append((None, None, activation))
+        return cls(layers)
+
+    def predict(self, x) -> np.ndarray:
+        """Forward pass: matmul + bias + activación por capa"""
+        out = np.asarray(x, dtype=np.float32)
+        if out.ndim == 1:
+            out = out.reshape(-1, 1)
+
+        for kernel, bias, activation in self.layers:
+            if kernel is not None:
+                out = out @ kernel
+                if bias is not None:
+                    out += bias
+            else:
+                out = out.copy()
+            out = activation(out)
+
+        return out
+
+    __call__ = predict
+
+
+if __name__ == "__main__":
+    # python -m Core.NeuronalNetwork.compiled modelo.keras modelo.npz
+    from tensorflow import keras as ks
+
+    source, target = sys.argv[1], sys.argv[2]
+    export_model(ks.models.load_model(source), target)
+    print(f"✅ Modelo exportado a {target}")
@@ -0,0 +1,269 @@
+from Core.Logger import Logger
+
+import threading
+import time
+import os
+
+
+class ModelState:
+    """Estados posibles del modelo dentro del registry"""
+
+    IDLE = "idle"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class ModelNotReady(Exception):
+    """El modelo todavía está cargando o falló al cargar"""
+
+    def __init__(self, state: str, error: str = None):
+        self.state = state
+        self.error = error
+        message = f"Modelo no disponible (estado: {state})"
+        if error:
+            message += f": {error}"
+        super().__init__(message)
+
+
+class ModelRegistry:
+    """
+    Carga el modelo en un thread aparte (al arrancar o en el primer uso),
+    ejecuta un batch de warm-up y expone el estado loading/ready/failed
+    para que la capa HTTP no encole peticiones detrás de un modelo frío.
+    Una carga fallida se reintenta con backoff exponencial, o enseguida si
+    cambia alguno de los archivos vigilados.
+    """
+
+    def __init__(
+        self,
+        loader: callable,
+        warmup: callable = None,
+        warmup_batch: list = None,
+        fingerprint: callable = None,
+        watch: list[str] = None,
+        watch_interval: float = 5.0,
+        retry_min: float = 1.0,
+        retry_max: float = 60.0,
+    ):
+        self.loader = loader
+        self.warmup = warmup
+        self.warmup_batch = warmup_batch or []
+        self.fingerprint_fn = fingerprint
+        self.watch = watch or []
+        self.watch_interval = watch_interval
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+
+        self.model = None
+        self.state = ModelState.IDLE
+        self.error = None
+        self.version = 0
+        self.fingerprint = None
+
+        self._listeners: list[callable] = []
+        self._mtimes = {}
+        self._checked_at = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._pid = None
+
+        self.started_at = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.ready_seconds = None
+        self.first_prediction_seconds = None
+
+    def start(self):
+        """
+        Arranca la carga en segundo plano (idempotente, reinicia tras un fork).
+        Tras un fallo solo reintenta cuando pasó el backoff.
+        """
+        with self._lock:
+            if self.state == ModelState.READY:
+                return
+            if self._pid == os.getpid():
+                if self.state == ModelState.LOADING:
+                    return
+                if self.state == ModelState.FAILED:
+                    if time.monotonic() < self._retry_at:
+                        return
+                    Logger.info(f"Reintentando la carga del modelo ({self._failures})")
+
+            self._begin_load()
+
+    def _begin_load(self):
+        """Con `_lock` tomado: primera carga (o reintento) en estado loading"""
+        self.error = None
+        self.state = ModelState.LOADING
+        self._ready = threading.Event()
+        self.started_at = time.perf_counter()
+        self.first_prediction_seconds = None
+        self._spawn()
+
+    def _spawn(self):
+        """Con `_lock` tomado: lanza el thread que ejecuta `_load`"""
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._load, daemon=True)
+        self._thread.start()
+
+    def _loading(self) -> bool:
+        """Con `_lock` tomado: hay una carga en curso en este proceso"""
+        return (
+            self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def reload(self):
+        """Vuelve a cargar el modelo desde disco; el actual sigue sirviendo mientras tanto"""
+        with self._lock:
+            if self.state == ModelState.READY and self._pid == os.getpid():
+                if not self._loading():
+                    self._spawn()
+                return
+            self.state = ModelState.IDLE
+            self._pid = None
+        self.start()
+
+    def on_load(self, listener: callable):
+        """Registra un callback que recibe el modelo cada vez que se carga uno nuevo"""
+        self._listeners.append(listener)
+        return listener
+
+    def _stat_watched(self) -> dict[str, float]:
+        mtimes = {}
+        for path in self.watch:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def maybe_reload(self):
+        """
+        Recarga el modelo si alguno de los archivos vigilados cambió; si la
+        última carga falló, reintenta sin esperar el backoff
+        """
+        if not self.watch or self.state not in (ModelState.READY, ModelState.FAILED):
+            return
+
+        now = time.monotonic()
+        if now - self._checked_at < self.watch_interval:
+            return
+
+        # Comparar y actualizar `_mtimes` y lanzar la carga es una sola
+        # operación: threads que ven el cambio a la vez cargan una sola vez
+        with self._lock:
+            if now - self._checked_at < self.watch_interval:
+                return
+            self._checked_at = now
+            if self._loading():
+                return
+
+            mtimes = self._stat_watched()
+            if mtimes == self._mtimes:
+                return
+            Logger.info("Archivo del modelo modificado, recargando...")
+            self._mtimes = mtimes
+            if self.state == ModelState.FAILED:
+                self._retry_at = 0.0
+                self._begin_load()
+            elif self.state == ModelState.READY:
+                self._spawn()
+
+    def _load(self):
+        ready = self._ready
+        try:
+            Logger.start("Cargando el modelo en segundo plano...")
+            begin = time.perf_counter()
+            model = self.loader()
+            mtimes = self._stat_watched()
+            fingerprint = self.fingerprint_fn() if self.fingerprint_fn else None
+            self.load_seconds = time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            if self.warmup and self.warmup_batch:
+                self.warmup(model, self.warmup_batch)
+            self.warmup_seconds = time.perf_counter() - begin
+
+            if self.state != ModelState.READY:
+                self.ready_seconds = time.perf_counter() - self.started_at
+
+            self.model = model
+            self.version += 1
+            self.fingerprint = fingerprint or str(self.version)
+            self._mtimes = mtimes
+            self.error = None
+            self._failures = 0
+            self.state = ModelState.READY
+
+            for listener in self._listeners:
+                listener(model)
+            Logger.success(
+                f"Modelo listo en {self.ready_seconds * 1000:.1f} ms "
+                f"(carga {self.load_seconds * 1000:.1f} ms, "
+                f"warm-up {self.warmup_seconds * 1000:.1f} ms)"
+            )
+        except Exception as e:
+            self.error = str(e)
+            if self.model is None:
+                self._failures += 1
+                backoff = self.retry_min * 2 ** (self._failures - 1)
+                self._retry_at = time.monotonic() + min(backoff, self.retry_max)
+                self._mtimes = self._stat_watched()
+                self.state = ModelState.FAILED
+            Logger.error(f"Error al cargar el modelo: {e}")
+        finally:
+            ready.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Espera a que termine la carga; True si el modelo quedó listo"""
+        self.start()
+        self._ready.wait(timeout)
+        return self.state == ModelState.READY
+
+    def get(self, timeout: float = 0):
+        """Devuelve el modelo o lanza ModelNotReady (carga perezosa)"""
+        if self.state != ModelState.READY:
+            # Sin modelo no se llega a predecir: se mira acá si aparecieron
+            # los archivos
+            self.maybe_reload()
+            self.start()
+            if timeout:
+                self._ready.wait(timeout)
+
+        if self.state != ModelState.READY:
+            raise ModelNotReady(self.state, self.error)
+        return self.model
+
+    @property
+    def ready(self) -> bool:
+        return self.state == ModelState.READY
+
+    def record_prediction(self):
+        """Registra el tiempo de arranque en frío hasta la primera predicción"""
+        if self.first_prediction_seconds is None and self.started_at is not None:
+            self.first_prediction_seconds = time.perf_counter() - self.started_at
+            Logger.info(
+                f"Primera predicción a {self.first_prediction_seconds * 1000:.1f} ms del arranque"
+            )
+
+    def status(self) -> dict[str, any]:
+        def ms(seconds):
+            return round(seconds * 1000, 3) if seconds is not None else None
+
+        return {
+            "state": self.state,
+            "error": self.error,
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "load_ms": ms(self.load_seconds),
+            "warmup_ms": ms(self.warmup_seconds),
+            "ready_ms": ms(self.ready_seconds),
+            "first_prediction_ms": ms(self.first_prediction_seconds),
+        }
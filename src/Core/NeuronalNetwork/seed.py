@@ -3,7 +3,10 @@ from tensorflow import keras as ks
 import numpy as np
 import os
 
+from Core.NeuronalNetwork.compiled import export_model
+
 SAVE_PATH = "./model_hours_study_saved.keras"
+COMPILED_PATH = "./model_hours_study_saved.npz"
 
 if os.path.exists(SAVE_PATH) and not os.path.isdir(SAVE_PATH):
     print(f"--- 🔄 Cargando Modelo Existente de: {SAVE_PATH} ---")
@@ -39,3 +42,7 @@ if model is None:
     print(f"\n--- 💾 Guardando el Modelo en {SAVE_PATH} ---")
     model.save(SAVE_PATH)
     print("✅ Modelo guardado exitosamente.")
+
+print(f"\n--- 📦 Exportando pesos a NumPy en {COMPILED_PATH} ---")
+export_model(model, COMPILED_PATH)
+print("✅ Modelo exportado exitosamente.")
@@ -2,10 +2,26 @@ from Core.Model import Model
 
 
 class Serializer:
+    @staticmethod
+    def _names(fields, exclude: list[str], include: list[str]) -> list[str]:
+        return [
+            name
+            for name in fields
+            if (not include or name in include) and name not in exclude
+        ]
+
+    @staticmethod
+    def _is_record(instance) -> bool:
+        # namedtuple de QuerySet.records(): su `_fields` es una tupla de nombres
+        return isinstance(instance, tuple) and hasattr(instance, "_asdict")
+
     @staticmethod
     def serialize(
         model_instance: Model, exclude: list[str] = None, include: list[str] = None
     ) -> dict:
+        if Serializer._is_record(model_instance):
+            return Serializer.serialize_many([model_instance], exclude, include)[0]
+
         if not hasattr(model_instance, "_fields"):
             raise ValueError("Object is not a Model instance")
 
@@ -30,7 +46,29 @@ class Serializer:
         exclude: list[str] = None,
         include: list[str] = None,
     ) -> list[dict]:
+        instances = list(model_instances)
+        if not instances:
+            return []
+
+        exclude = exclude or []
+        first = instances[0]
+
+        # records(): los índices de las columnas se calculan una sola vez
+        if Serializer._is_record(first):
+            names = Serializer._names(first._fields, exclude, include)
+            if names == list(first._fields):
+                return [dict(zip(names, row)) for row in instances]
+            indexes = [first._fields.index(name) for name in names]
+            return [
+                {name: row[index] for name, index in zip(names, indexes)}
+                for row in instances
+            ]
+
+        if not hasattr(first, "_fields"):
+            raise ValueError("Object is not a Model instance")
+
+        names = Serializer._names(first._fields.keys(), exclude, include)
         return [
-            Serializer.serialize(instance, exclude, include)
-            for instance in model_instances
+            {name: getattr(instance, name, None) for name in names}
+            for instance in instances
         ]
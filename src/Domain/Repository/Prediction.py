@@ -1,5 +1,5 @@
 from Domain.Service.Prediction import PredictionService
-from Core.NeuronalNetwork import predict_note
+from Core.NeuronalNetwork import predict_note, predict_notes
 from Core.Logger import Logger
 
 
@@ -23,3 +23,19 @@ class InterfasePrediction(PredictionService):
         except Exception as e:
             Logger.log(f"❌ Error en create_prediction: {str(e)}")
             raise
+
+    def create_many_for_user(self, user_id: int, prompts: list[float]):
+        try:
+            predict = predict_notes(prompts)
+
+            if "error" in predict:
+                Logger.log(f"❌ Error en predicción: {predict['error']}")
+                raise ValueError(predict["error"])
+
+            results = predict["predicted_notes"]
+            Logger.log(f"✅ {len(results)} predicciones completadas")
+
+            return self.create_predictions(user_id, prompts, results)
+        except Exception as e:
+            Logger.log(f"❌ Error en create_predictions: {str(e)}")
+            raise
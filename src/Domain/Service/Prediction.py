@@ -12,3 +12,20 @@ class PredictionService(BaseService[Prediction]):
 
     def get_by_user(self, user: int) -> Prediction | None:
         return self.model.filter(user=user).order_by("-id")
+
+    def get_records_by_user(self, user: int):
+        """Solo lectura: namedtuples en vez de instancias (se evalúa una vez)"""
+        return self.get_by_user(user).records()
+
+    def iter_records(self, chunk_size: int = 2000):
+        """Exportaciones y recorridos completos en memoria constante (fetchmany)"""
+        return self.model.all().order_by("id").records().iterator(chunk_size)
+
+    def create_predictions(
+        self, user: int, prompts: list[float], results: list[float]
+    ) -> list[Prediction]:
+        predictions = [
+            self.model(user=user, prompt=prompt, response=result)
+            for prompt, result in zip(prompts, results)
+        ]
+        return self.model.bulk_create(predictions)
@@ -13,7 +13,7 @@ class BaseService(Generic[T]):
     def __init__(self, model: type[T]):
         self.model = model
         db = GlobalSqlite.get_database()
-        self.model.setup_db(db)
+        self.model.setup_db(db, GlobalSqlite.get_reader())
         self.model.create_table()
 
     def create(self, **kwargs) -> T:
@@ -0,0 +1,28 @@
+from Core.Channels import WebSocketHandler
+from Core.Channels.Router import WebSocketRouter
+from Core.Channels.Message import WebSocketMessage
+from Core.NeuronalNetwork import ModelNotReady, predict_note
+
+ws_router = WebSocketRouter()
+
+
+@ws_router.on("ping")
+def ping(msg: WebSocketMessage):
+    msg.emit("pong", msg.data)
+
+
+@ws_router.on("predict")
+def predict(msg: WebSocketMessage):
+    hours = msg.data.get("hours") if isinstance(msg.data, dict) else None
+
+    if isinstance(hours, bool) or not isinstance(hours, (int, float)):
+        return msg.emit("error", {"message": "hours must be a number"})
+
+    try:
+        msg.emit("prediction", predict_note(hours))
+    except ModelNotReady as e:
+        msg.emit("error", {"message": "Model not ready", "state": e.state})
+
+
+def makeChannels(handler: type[WebSocketHandler]):
+    handler.router = ws_router
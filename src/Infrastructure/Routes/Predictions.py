@@ -4,6 +4,7 @@ from Core.Api.Middleware.validate_fields import validate_fields
 
 from Application.Controller.Predictions import (
     create_prediction,
+    create_predictions_batch,
     get_by_user,
     # get_by_id,
     # update_prediction,
@@ -15,6 +16,9 @@ def register_prediction_routes(router: Router):
     router.route("/predictions", methods=["POST"])(
         require_json(validate_fields("user", "prompt")(create_prediction))
     )
+    router.route("/predictions/batch", methods=["POST"])(
+        require_json(validate_fields("user", "prompts")(create_predictions_batch))
+    )
     router.route("/predictions/:user", methods=["GET"])(get_by_user)
 
     # router.get("/predictions/:id")(get_by_id)
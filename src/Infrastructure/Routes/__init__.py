@@ -6,6 +6,7 @@ from Core.Api.Response import Response
 from Core.Api.Request import Request
 
 from Core.Api import RestAPIHandler
+from Core.NeuronalNetwork import model_registry, batcher, prediction_cache
 
 router = Router()
 
@@ -22,6 +23,19 @@ def get_users(req, res: Response):
     )
 
 
+@router.route("/health", methods=["GET"])
+def get_health(req, res: Response):
+    status = model_registry.status()
+    res.json(
+        {
+            "model": status,
+            "batching": batcher.stats(),
+            "cache": prediction_cache.stats(),
+        },
+        200 if model_registry.ready else 503,
+    )
+
+
 register_prediction_routes(router)
 register_user_routes(router)
 
@@ -3,6 +3,11 @@ import numpy as np
 import pandas as pd
 from unittest.mock import MagicMock, Mock
 import tensorflow as tf
+import os, sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 @pytest.fixture
 def clean_dataset():
@@ -0,0 +1,680 @@
+import pytest
+import threading
+import asyncio
+import socket
+import json
+import http.client
+import io
+
+from Core.Api.Router import Router
+from Core.Api.Request import Request
+from Core.Api.Request.body import (
+    BodyStream,
+    RequestBodyError,
+    decode_chunked,
+    iter_json_array,
+    loads,
+)
+from Core.Api.Response import Response
+from Core.Api import RestAPIHandler
+from Core.Api.Server import ThreadPoolHTTPServer
+from Core.Api.Server.aio import AsyncHTTPServer
+
+
+def make_router():
+    router = Router()
+
+    @router.get("/")
+    def index(req: Request, res: Response):
+        res.json({"message": "Hello Word!!"})
+
+    @router.post("/echo")
+    def echo(req: Request, res: Response):
+        res.json({"body": req.body}, 201)
+
+    @router.get("/user/:name")
+    def user(req: Request, res: Response):
+        res.json({"name": req.params["name"], "q": req.query.get("q")})
+
+    @router.get("/async")
+    async def coroutine(req: Request, res: Response):
+        await asyncio.sleep(0)
+        res.text("async", 200)
+
+    @router.post("/async/echo")
+    async def coroutine_echo(req: Request, res: Response):
+        res.json({"body": req.body}, 201)
+
+    @router.post("/ignore")
+    def ignore(req: Request, res: Response):
+        res.json({"ignored": True})
+
+    @router.get("/boom")
+    def boom(req: Request, res: Response):
+        raise RuntimeError("fallo")
+
+    @router.get("/cancelled")
+    async def cancelled(req: Request, res: Response):
+        raise asyncio.CancelledError()
+
+    return router
+
+
+@pytest.fixture
+def async_server():
+    """Servidor asyncio en un thread aparte, en un puerto libre"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = AsyncHTTPServer(("127.0.0.1", port), router=make_router(), max_requests=3)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            threading.Event().wait(0.02)
+
+    yield server, port
+    server.shutdown()
+    thread.join(timeout=2)
+    server.server_close()
+
+
+@pytest.fixture
+def threaded_server():
+    """ThreadPoolHTTPServer con RestAPIHandler y un límite de 3 peticiones"""
+
+    class Handler(RestAPIHandler):
+        router = make_router()
+        max_requests = 3
+        timeout = 1
+
+    server = ThreadPoolHTTPServer(("127.0.0.1", 0), Handler, max_workers=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server, server.server_address[1]
+    server.shutdown()
+    thread.join(timeout=2)
+    server.server_close()
+
+
+def read_response(sock_file):
+    status = sock_file.readline()
+    headers = {}
+    while True:
+        line = sock_file.readline().decode().strip()
+        if not line:
+            break
+        key, value = line.split(":", 1)
+        headers[key.lower()] = value.strip()
+    body = sock_file.read(int(headers.get("content-length", 0)))
+    return int(status.split()[1]), headers, body
+
+
+class TestAsyncServer:
+    """Tests para el front end HTTP sobre asyncio"""
+
+    def test_routes_and_params(self, async_server):
+        """Test: Usa el mismo Router, con params y query"""
+        _, port = async_server
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+
+        conn.request("GET", "/user/ana?q=1")
+        response = conn.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read()) == {"name": "ana", "q": "1"}
+
+        conn.request("POST", "/echo", body=json.dumps({"a": 1}))
+        response = conn.getresponse()
+        assert response.status == 201
+        assert json.loads(response.read()) == {"body": {"a": 1}}
+
+    def test_not_found_and_errors(self, async_server):
+        """Test: 404 para rutas desconocidas y 500 si el handler falla"""
+        _, port = async_server
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+
+        conn.request("GET", "/nope")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 404
+
+        conn.request("GET", "/boom")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 500
+
+    def test_coroutine_body_errors(self, async_server):
+        """Test: Un body inválido en un handler async da 400, no 500"""
+        _, port = async_server
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+        conn.request("POST", "/async/echo", body=b"{no es json")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 400
+
+    def test_cancelled_handler(self, async_server):
+        """Test: Si la tarea del handler se cancela se responde 500"""
+        _, port = async_server
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+        conn.request("GET", "/cancelled")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 500
+
+    def test_coroutine_handler(self, async_server):
+        """Test: Los handlers async se ejecutan en el loop"""
+        _, port = async_server
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/async")
+        response = conn.getresponse()
+        assert response.read() == b"async"
+
+    def test_pipelining_and_max_requests(self, async_server):
+        """Test: Peticiones en pipeline se responden en orden y se respeta el límite"""
+        _, port = async_server
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.sendall(
+                b"GET /user/a HTTP/1.1\r\nHost: x\r\n\r\n"
+                b"GET /user/b HTTP/1.1\r\nHost: x\r\n\r\n"
+                b"GET /user/c HTTP/1.1\r\nHost: x\r\n\r\n"
+            )
+            sock_file = sock.makefile("rb")
+
+            names = []
+            for _ in range(3):
+                status, headers, body = read_response(sock_file)
+                names.append(json.loads(body)["name"])
+
+            assert names == ["a", "b", "c"]
+            assert headers["connection"] == "close"
+            assert sock_file.read() == b""
+
+
+    def test_pipelined_error_after_pending_request(self, async_server):
+        """Test: Un error de parseo se responde después de las peticiones previas"""
+        _, port = async_server
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(b"GET /async HTTP/1.1\r\nHost: x\r\n\r\nMALFORMADA\r\n\r\n")
+            sock_file = sock.makefile("rb")
+
+            status, _, body = read_response(sock_file)
+            assert (status, body) == (200, b"async")
+            status, headers, _ = read_response(sock_file)
+            assert status == 400
+            assert headers["connection"] == "close"
+            assert sock_file.read() == b""
+
+
+class TestKeepAlive:
+    """Tests para conexiones persistentes en RestAPIHandler"""
+
+    def test_reuses_connection(self, threaded_server):
+        """Test: Varias peticiones viajan por el mismo socket con Content-Length"""
+        _, port = threaded_server
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+
+        conn.request("GET", "/user/ana")
+        response = conn.getresponse()
+        body = response.read()
+        sock = conn.sock
+
+        assert response.version == 11
+        assert int(response.getheader("Content-Length")) == len(body)
+        assert response.getheader("Connection") is None
+
+        conn.request("POST", "/echo", body=json.dumps({"a": 1}))
+        response = conn.getresponse()
+        assert json.loads(response.read()) == {"body": {"a": 1}}
+        assert conn.sock is sock
+
+    def test_unread_body_is_drained(self, threaded_server):
+        """Test: Un body que el handler no lee no contamina la siguiente petición"""
+        _, port = threaded_server
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+
+        conn.request("POST", "/ignore", body=json.dumps({"a": 1}))
+        assert json.loads(conn.getresponse().read()) == {"ignored": True}
+
+        conn.request("GET", "/user/bob")
+        assert json.loads(conn.getresponse().read())["name"] == "bob"
+
+    def test_max_requests_closes(self, threaded_server):
+        """Test: Al llegar al límite se responde Connection: close"""
+        _, port = threaded_server
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock_file = sock.makefile("rb")
+            for name in "abc":
+                sock.sendall(f"GET /user/{name} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+                status, headers, body = read_response(sock_file)
+                assert json.loads(body)["name"] == name
+
+            assert headers["connection"] == "close"
+            assert sock_file.read() == b""
+
+    def test_handler_error_keeps_connection(self, threaded_server):
+        """Test: Un error en el handler responde 500 y la conexión sigue viva"""
+        _, port = threaded_server
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+
+        conn.request("GET", "/boom")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 500
+
+        conn.request("GET", "/")
+        assert conn.getresponse().status == 200
+
+    def test_idle_timeout(self, threaded_server):
+        """Test: El servidor cierra la conexión ociosa al vencer el timeout"""
+        _, port = threaded_server
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.settimeout(5)
+            assert sock.recv(1) == b""
+
+    def test_idle_timeout_between_requests(self, threaded_server):
+        """Test: Una conexión keep-alive ociosa también se cierra al vencer"""
+        _, port = threaded_server
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.sendall(b"GET /user/ana HTTP/1.1\r\nHost: x\r\n\r\n")
+            sock_file = sock.makefile("rb")
+            assert read_response(sock_file)[0] == 200
+
+            sock.settimeout(5)
+            assert sock_file.read() == b""
+
+
+class TestAdmission:
+    """Tests para la admisión de conexiones de ThreadPoolHTTPServer"""
+
+    @pytest.fixture
+    def make_server(self):
+        servers = []
+
+        def make(max_workers):
+            class Handler(RestAPIHandler):
+                router = make_router()
+                timeout = 10
+
+            server = ThreadPoolHTTPServer(
+                ("127.0.0.1", 0), Handler, max_workers=max_workers
+            )
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            servers.append((server, thread))
+            return server, server.server_address[1]
+
+        yield make
+        for server, thread in servers:
+            server.shutdown()
+            thread.join(timeout=2)
+            server.server_close()
+
+    def test_shutdown_while_waiting_for_worker(self, make_server):
+        """Test: shutdown() no se cuelga con el accept esperando un thread"""
+        server, port = make_server(max_workers=1)
+        busy = socket.create_connection(("127.0.0.1", port))
+        waiting = socket.create_connection(("127.0.0.1", port))
+        threading.Event().wait(0.2)
+
+        stopper = threading.Thread(target=server.shutdown)
+        stopper.start()
+        stopper.join(timeout=3)
+        assert not stopper.is_alive()
+
+        waiting.settimeout(5)
+        assert waiting.recv(1) == b""
+        busy.close()
+        waiting.close()
+
+    def test_accepts_only_with_free_worker(self, make_server):
+        """Test: Sin threads libres las conexiones no se encolan en el executor"""
+        server, port = make_server(max_workers=1)
+        busy = socket.create_connection(("127.0.0.1", port))
+        waiting = [socket.create_connection(("127.0.0.1", port)) for _ in range(3)]
+        threading.Event().wait(0.2)
+
+        assert server.executor._work_queue.qsize() == 0
+
+        busy.close()
+        waiting[0].sendall(b"GET /user/ana HTTP/1.1\r\nHost: x\r\n\r\n")
+        waiting[0].settimeout(5)
+        status, _, body = read_response(waiting[0].makefile("rb"))
+        assert json.loads(body)["name"] == "ana"
+        for sock in waiting:
+            sock.close()
+
+
+    def test_idle_keep_alive_does_not_hold_workers(self, make_server):
+        """Test: Clientes keep-alive ociosos no demoran la petición de otro"""
+        import time
+
+        _, port = make_server(max_workers=2)
+        idle = []
+        for _ in range(4):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/user/ana")
+            assert conn.getresponse().read()
+            idle.append(conn)
+
+        begin = time.monotonic()
+        other = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        other.request("GET", "/user/bob")
+        assert json.loads(other.getresponse().read())["name"] == "bob"
+        assert time.monotonic() - begin < 1
+
+        # Las conexiones ociosas siguen vivas y se retoman
+        for conn in idle:
+            conn.request("GET", "/user/ana")
+            assert json.loads(conn.getresponse().read())["name"] == "ana"
+            assert conn.sock is not None
+            conn.close()
+        other.close()
+
+
+def linear_find_route(router: Router, method: str, path: str):
+    """La búsqueda original: regex por regex en orden de registro"""
+    clean_path = path.split("?")[0]
+    for route in router.routes.get(method, []):
+        match = route["pattern"].match(clean_path)
+        if match:
+            return route["handler"], match.groupdict()
+    return None, {}
+
+
+class TestRouter:
+    """Tests para la resolución de rutas con el árbol de segmentos"""
+
+    def test_static_and_params(self):
+        """Test: Resuelve rutas estáticas, params y query strings"""
+        router = make_router()
+
+        handler, params = router.find_route("GET", "/user/ana?q=1")
+        assert handler.__name__ == "user"
+        assert params == {"name": "ana"}
+
+        assert router.find_route("GET", "/")[0].__name__ == "index"
+        assert router.find_route("GET", "/user/") == (None, {})
+        assert router.find_route("GET", "/user/a/b") == (None, {})
+        assert router.find_route("DELETE", "/") == (None, {})
+
+    def test_static_wins_and_backtracking(self):
+        """Test: Un segmento estático tiene prioridad y se retrocede si no cierra"""
+        router = Router()
+        router.get("/user/:id")(lambda req, res: None)
+        router.get("/user/me")(lambda req, res: None)
+        router.get("/user/me/:name")(lambda req, res: None)
+        router.get("/user/:id/posts")(lambda req, res: None)
+
+        assert router.find_route("GET", "/user/me")[1] == {}
+        assert router.find_route("GET", "/user/me/ana")[1] == {"name": "ana"}
+        assert router.find_route("GET", "/user/me/posts")[1] == {"name": "posts"}
+        assert router.find_route("GET", "/user/7/posts")[1] == {"id": "7"}
+
+    def test_regex_fallback(self):
+        """Test: Params dentro de un segmento siguen funcionando con regex"""
+        router = Router()
+        router.get("/file/:name.json")(lambda req, res: None)
+
+        handler, params = router.find_route("GET", "/file/data.json")
+        assert handler is not None
+        assert params == {"name": "data"}
+
+    def test_matches_linear_search(self):
+        """Test: Mismo resultado que la búsqueda lineal para rutas sin ambigüedad"""
+        router = Router()
+        for i in range(50):
+            router.get(f"/api/v{i % 3}/resource{i}/:id")(lambda req, res: None)
+            router.get(f"/api/v{i % 3}/resource{i}/:id/items/:item")(
+                lambda req, res: None
+            )
+
+        for path in ["/api/v1/resource4/9", "/api/v2/resource8/1/items/x", "/nope"]:
+            assert router.find_route("GET", path) == linear_find_route(
+                router, "GET", path
+            )
+
+    def test_cache_is_invalidated(self):
+        """Test: Registrar una ruta invalida los resultados cacheados"""
+        router = Router()
+        assert router.find_route("GET", "/late") == (None, {})
+
+        router.get("/late")(lambda req, res: None)
+        assert router.find_route("GET", "/late")[0] is not None
+
+    def test_params_are_not_shared(self):
+        """Test: Cada llamada recibe su propio dict de params"""
+        router = make_router()
+        _, first = router.find_route("GET", "/user/ana")
+        first["name"] = "otro"
+        assert router.find_route("GET", "/user/ana")[1] == {"name": "ana"}
+
+
+class TestRequestBody:
+    """Tests para la lectura del body (límites, chunked y streaming)"""
+
+    def test_content_length_limit_before_reading(self):
+        """Test: Con Content-Length mayor al límite no se lee nada"""
+        rfile = io.BytesIO(b"x" * 100)
+        with pytest.raises(RequestBodyError) as error:
+            BodyStream(rfile, {"Content-Length": "100"}, max_size=10)
+        assert error.value.status == 413
+        assert rfile.tell() == 0
+
+    def test_chunked(self):
+        """Test: Decodifica chunked con extensiones y trailers"""
+        raw = b"4;ext=1\r\n[1, \r\n3\r\n2, \r\n2\r\n3]\r\n0\r\nX-Trailer: 1\r\n\r\nNEXT"
+        rfile = io.BytesIO(raw)
+        stream = BodyStream(rfile, {"Transfer-Encoding": "chunked"})
+        assert loads(stream.readall()) == [1, 2, 3]
+        assert rfile.read() == b"NEXT"
+
+        assert decode_chunked(raw, 0) == (b"[1, 2, 3]", len(raw) - 4)
+        assert decode_chunked(raw[:12], 0) is None
+
+    def test_chunked_limit(self):
+        """Test: El límite se aplica mientras llegan los chunks"""
+        raw = b"8\r\n12345678\r\n8\r\n12345678\r\n0\r\n\r\n"
+        stream = BodyStream(io.BytesIO(raw), {"Transfer-Encoding": "chunked"}, 10)
+        with pytest.raises(RequestBodyError) as error:
+            stream.readall()
+        assert error.value.status == 413
+
+        with pytest.raises(RequestBodyError):
+            decode_chunked(raw, 0, max_size=10)
+
+    def test_iter_json_array(self):
+        """Test: Itera el array aunque los valores queden partidos entre lecturas"""
+        data = [123456, -1.5e3, "ñandú", {"a": [1, 2]}, None, True, []]
+        raw = json.dumps(data, ensure_ascii=False).encode()
+        stream = BodyStream(io.BytesIO(raw), {"Content-Length": str(len(raw))})
+        assert list(iter_json_array(stream, chunk_size=3)) == data
+
+        empty = BodyStream(io.BytesIO(b" [ ] "), {"Content-Length": "5"})
+        assert list(iter_json_array(empty, chunk_size=2)) == []
+
+    @pytest.mark.parametrize(
+        "raw", [b'{"a": 1}', b"[1, 2", b"[1 2]", b"[1,]", b"[1] x", b"[\xff]"]
+    )
+    def test_iter_json_array_errors(self, raw):
+        """Test: JSON inválido o incompleto lanza RequestBodyError(400)"""
+        stream = BodyStream(io.BytesIO(raw), {"Content-Length": str(len(raw))})
+        with pytest.raises(RequestBodyError) as error:
+            list(iter_json_array(stream, chunk_size=2))
+        assert error.value.status == 400
+
+    def test_server_errors(self, threaded_server):
+        """Test: JSON inválido responde 400 y un body enorme 413"""
+        server, port = threaded_server
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+
+        conn.request("POST", "/echo", body=b"{no es json")
+        response = conn.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read()) == {"error": "JSON inválido"}
+
+        server.RequestHandlerClass.max_body_size = 16
+        conn.request("POST", "/echo", body=json.dumps({"a": "x" * 32}))
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 413
+
+    @pytest.mark.parametrize("server_fixture", ["threaded_server", "async_server"])
+    def test_chunked_request(self, server_fixture, request):
+        """Test: Ambos front ends aceptan bodies chunked"""
+        _, port = request.getfixturevalue(server_fixture)
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+
+        chunks = iter([b'{"a": ', b"[1, 2]}"])
+        conn.request("POST", "/echo", body=chunks, encode_chunked=True)
+        response = conn.getresponse()
+        assert json.loads(response.read()) == {"body": {"a": [1, 2]}}
+
+        conn.request("GET", "/user/ana")
+        assert json.loads(conn.getresponse().read())["name"] == "ana"
+
+
+@pytest.fixture
+def predictions_server(tmp_path, monkeypatch):
+    """ThreadPoolHTTPServer con las rutas de predicciones sobre SQLite en memoria"""
+    import sqlite3
+    from Core.Database import GlobalSqlite
+
+    # Importar las rutas crea los servicios, que abren GlobalSqlite: que
+    # sea un archivo temporal y no ./sqlite3.db del directorio actual
+    monkeypatch.setattr(GlobalSqlite, "_instance", None)
+    monkeypatch.setattr(GlobalSqlite, "path", GlobalSqlite.path)
+    monkeypatch.setattr(GlobalSqlite, "options", GlobalSqlite.options)
+    GlobalSqlite.configure(str(tmp_path / "app.db"))
+
+    from Domain.Model.User import User
+    from Domain.Model.Predicts import Prediction
+    from Infrastructure.Routes.Predictions import register_prediction_routes
+
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    previous = [(model, model._db, model._read_db) for model in (User, Prediction)]
+    for model in (User, Prediction):
+        model.setup_db(db)
+        model.create_table()
+    user = User.create(username="ana", password="x")
+    Prediction.bulk_create(
+        [Prediction(user=user.id, prompt=i, response=i * 2) for i in range(20)]
+    )
+
+    class Handler(RestAPIHandler):
+        router = Router()
+
+    register_prediction_routes(Handler.router)
+    server = ThreadPoolHTTPServer(("127.0.0.1", 0), Handler, max_workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield db, server.server_address[1]
+    server.shutdown()
+    thread.join(timeout=2)
+    server.server_close()
+    for model, connection, reader in previous:
+        model.setup_db(connection, reader)
+    db.close()
+
+
+class TestQueryCount:
+    """Tests que fijan cuántas queries SQL hace cada endpoint"""
+
+    def test_predictions_by_user(self, predictions_server):
+        """Test: GET /predictions/:user hace un solo SELECT (sin COUNT aparte)"""
+        from Core.Database.queries import assert_num_queries
+
+        db, port = predictions_server
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+        with assert_num_queries(db, 1) as captured:
+            connection.request("GET", "/predictions/1")
+            response = connection.getresponse()
+            data = json.loads(response.read())
+
+        assert response.status == 200
+        assert len(data["data"]) == 20
+        assert "COUNT" not in captured.queries[0]
+        connection.close()
+
+
+class TestPredictionsBatch:
+    """Tests para POST /predictions/batch"""
+
+    @pytest.fixture
+    def batch_server(self, predictions_server, monkeypatch):
+        # Sin modelo: la nota predicha es el doble de las horas
+        monkeypatch.setattr(
+            "Domain.Repository.Prediction.predict_notes",
+            lambda hours: {"predicted_notes": [value * 2 for value in hours]},
+        )
+        return predictions_server
+
+    def post(self, port, body):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("POST", "/predictions/batch", body=json.dumps(body))
+        response = connection.getresponse()
+        data = json.loads(response.read())
+        connection.close()
+        return response.status, data
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"user": 1, "prompts": []},
+            {"user": 1, "prompts": 3},
+            {"user": 1, "prompts": [1, "dos"]},
+            {"user": 1, "prompts": [True]},
+            {"user": 1},
+        ],
+    )
+    def test_invalid_prompts(self, batch_server, body):
+        """Test: 400 si prompts falta, está vacío o no son números"""
+        from Domain.Model.Predicts import Prediction
+
+        _, port = batch_server
+        status, _ = self.post(port, body)
+
+        assert status == 400
+        assert Prediction.all().count() == 20
+
+    def test_too_many_prompts(self, batch_server):
+        """Test: 413 con más de PREDICT_MAX_INPUTS valores, sin predecir nada"""
+        from Core.NeuronalNetwork import PREDICT_MAX_INPUTS
+        from Domain.Model.Predicts import Prediction
+
+        _, port = batch_server
+        status, data = self.post(
+            port, {"user": 1, "prompts": [1] * (PREDICT_MAX_INPUTS + 1)}
+        )
+
+        assert status == 413
+        assert str(PREDICT_MAX_INPUTS) in data["message"]
+        assert Prediction.all().count() == 20
+
+    def test_single_executemany(self, batch_server):
+        """Test: Todas las filas se insertan con un executemany en una transacción"""
+        from Core.Database.queries import capture_queries
+
+        db, port = batch_server
+        with capture_queries(db) as captured:
+            status, data = self.post(port, {"user": 1, "prompts": [1, 2.5, 4]})
+
+        assert status == 201
+        assert [item["response"] for item in data["data"]] == [2, 5.0, 8]
+        assert [item["id"] for item in data["data"]] == [21, 22, 23]
+
+        statements = [sql.upper() for sql in captured.statements]
+        inserts = [sql for sql in statements if sql.startswith("INSERT")]
+        assert len(inserts) == 3
+        # Un solo lote: un last_insert_rowid() y un commit para las 3 filas
+        assert sum("LAST_INSERT_ROWID" in sql for sql in statements) == 1
+        assert sum(sql.startswith("COMMIT") for sql in statements) == 1
@@ -0,0 +1,429 @@
+import pytest
+import base64
+import json
+import os
+import socket
+import struct
+import threading
+import time
+
+from Core.Channels import WebSocketHandler
+from Core.Channels.Router import WebSocketRouter
+from Core.Channels.Message import WebSocketMessage
+from Core.Channels.Server import WebSocketServer
+from Core.Channels.Frame import (
+    MAX_MESSAGE_SIZE,
+    OP_BINARY,
+    OP_CLOSE,
+    OP_CONTINUATION,
+    OP_PING,
+    OP_TEXT,
+    NUMPY_UNMASK_MIN,
+    FrameError,
+    FrameParser,
+    encode_frame,
+    unmask,
+)
+
+
+def make_router():
+    router = WebSocketRouter()
+
+    @router.on("echo")
+    def echo(msg: WebSocketMessage):
+        msg.emit("echo", msg.data)
+
+    @router.on("shout")
+    def shout(msg: WebSocketMessage):
+        msg.broadcast("shout", msg.data, include_self=True)
+
+    @router.on("slow")
+    def slow(msg: WebSocketMessage):
+        time.sleep(0.05)
+        msg.emit("slow", msg.data)
+
+    return router
+
+
+@pytest.fixture
+def ws_server():
+    """WebSocketServer en un thread aparte, en un puerto libre"""
+    server = WebSocketServer(("127.0.0.1", 0), router=make_router(), max_workers=4)
+    thread = server.serve_in_thread()
+
+    yield server, server.server_address[1]
+    server.shutdown()
+    thread.join(timeout=2)
+    server.server_close()
+
+
+def handshake_request(key: str = None) -> bytes:
+    key = key or base64.b64encode(os.urandom(16)).decode()
+    return (
+        "GET / HTTP/1.1\r\n"
+        "Host: localhost\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\n"
+        "Sec-WebSocket-Version: 13\r\n\r\n"
+    ).encode()
+
+
+def client_frame(payload: bytes, opcode: int = 0x1, fin: bool = True) -> bytes:
+    """Frame del cliente: siempre con máscara"""
+    mask = os.urandom(4)
+    length = len(payload)
+    first = (0x80 if fin else 0) | opcode
+    if length < 126:
+        header = struct.pack(">BB", first, 0x80 | length)
+    elif length < 65536:
+        header = struct.pack(">BBH", first, 0x80 | 126, length)
+    else:
+        header = struct.pack(">BBQ", first, 0x80 | 127, length)
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return header + mask + masked
+
+
+def event_frame(event: str, data) -> bytes:
+    return client_frame(json.dumps({"event": event, "data": data}).encode())
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("conexión cerrada")
+        data += chunk
+    return data
+
+
+def recv_frame(sock: socket.socket):
+    """(opcode, payload) de un frame del servidor (sin máscara)"""
+    byte1, byte2 = recv_exact(sock, 2)
+    length = byte2 & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", recv_exact(sock, 8))[0]
+    return byte1 & 0x0F, recv_exact(sock, length)
+
+
+def recv_event(sock: socket.socket):
+    opcode, payload = recv_frame(sock)
+    assert opcode == 0x1
+    message = json.loads(payload)
+    return message["event"], message["data"]
+
+
+def connect(port: int) -> socket.socket:
+    """Conecta, hace el handshake y consume el evento 'connected'"""
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    sock.sendall(handshake_request())
+    head = b""
+    while not head.endswith(b"\r\n\r\n"):
+        head += recv_exact(sock, 1)
+    assert head.startswith(b"HTTP/1.1 101")
+    assert recv_event(sock)[0] == "connected"
+    return sock
+
+
+def wait_for(condition, timeout: float = 2):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestWebSocketServer:
+    """Tests para Core.Channels.Server"""
+
+    def test_handshake_and_event(self, ws_server):
+        """Test: Handshake, evento 'connected' y respuesta de un handler"""
+        server, port = ws_server
+        with connect(port) as sock:
+            sock.sendall(event_frame("echo", {"text": "hola"}))
+            assert recv_event(sock) == ("echo", {"text": "hola"})
+
+    def test_handshake_split_in_pieces(self, ws_server):
+        """Test: El handshake puede llegar en varios paquetes"""
+        server, port = ws_server
+        request = handshake_request()
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            for i in range(0, len(request), 7):
+                sock.sendall(request[i : i + 7])
+                time.sleep(0.001)
+            assert recv_exact(sock, 12) == b"HTTP/1.1 101"
+
+    def test_invalid_handshake(self, ws_server):
+        """Test: Sin Sec-WebSocket-Key responde 400 y cierra"""
+        server, port = ws_server
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            assert sock.recv(1024).startswith(b"HTTP/1.1 400")
+            assert sock.recv(1024) == b""
+
+    def test_frame_split_across_packets(self, ws_server):
+        """Test: Un frame que llega byte a byte se arma en el buffer"""
+        server, port = ws_server
+        frame = event_frame("echo", {"n": 1})
+        with connect(port) as sock:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            for byte in frame:
+                sock.sendall(bytes([byte]))
+            assert recv_event(sock) == ("echo", {"n": 1})
+
+    def test_coalesced_frames_in_order(self, ws_server):
+        """Test: Varios frames en un solo paquete se despachan en orden"""
+        server, port = ws_server
+        with connect(port) as sock:
+            sock.sendall(b"".join(event_frame("slow", i) for i in range(3)))
+            sock.sendall(b"".join(event_frame("echo", i) for i in range(3, 6)))
+            events = [recv_event(sock)[1] for _ in range(6)]
+        assert events == list(range(6))
+
+    def test_extended_length(self, ws_server):
+        """Test: Payloads con longitud de 16 y 64 bits"""
+        server, port = ws_server
+        with connect(port) as sock:
+            for size in (200, 70000):
+                sock.sendall(event_frame("echo", "x" * size))
+                assert recv_event(sock) == ("echo", "x" * size)
+
+    def test_ping_and_close(self, ws_server):
+        """Test: Ping recibe pong con el mismo payload; close se responde y cierra"""
+        server, port = ws_server
+        with connect(port) as sock:
+            assert wait_for(lambda: len(server.router.clients) == 1)
+            sock.sendall(client_frame(b"latido", opcode=0x9))
+            assert recv_frame(sock) == (0xA, b"latido")
+
+            sock.sendall(client_frame(struct.pack(">H", 1000), opcode=0x8))
+            opcode, payload = recv_frame(sock)
+            assert opcode == 0x8 and struct.unpack(">H", payload)[0] == 1000
+            assert sock.recv(1024) == b""
+
+        assert wait_for(lambda: not server.router.clients)
+
+    def test_message_too_big(self, ws_server):
+        """Test: Un frame mayor que el límite cierra con 1009 sin leer el payload"""
+        server, port = ws_server
+        with connect(port) as sock:
+            header = struct.pack(">BBQ", 0x81, 0x80 | 127, MAX_MESSAGE_SIZE + 1)
+            sock.sendall(header + os.urandom(4))
+            opcode, payload = recv_frame(sock)
+            assert opcode == 0x8 and struct.unpack(">H", payload)[0] == 1009
+
+    def test_broadcast(self, ws_server):
+        """Test: Un broadcast desde el executor llega a todos los clientes"""
+        server, port = ws_server
+        clients = [connect(port) for _ in range(3)]
+        try:
+            assert wait_for(lambda: len(server.router.clients) == 3)
+            clients[0].sendall(event_frame("shout", "hola"))
+            for sock in clients:
+                assert recv_event(sock) == ("shout", "hola")
+        finally:
+            for sock in clients:
+                sock.close()
+
+        assert wait_for(lambda: not server.router.clients)
+
+    def test_many_clients_one_thread(self, ws_server):
+        """Test: Cientos de conexiones abiertas no crean threads"""
+        server, port = ws_server
+        threads = threading.active_count()
+        clients = [connect(port) for _ in range(200)]
+        try:
+            assert wait_for(lambda: len(server.router.clients) == 200)
+            assert threading.active_count() == threads
+
+            clients[-1].sendall(event_frame("echo", "último"))
+            assert recv_event(clients[-1]) == ("echo", "último")
+        finally:
+            for sock in clients:
+                sock.close()
+
+
+def parse(*chunks, **kwargs):
+    """Frames que entrega un FrameParser al recibir `chunks` en orden"""
+    parser = FrameParser(**kwargs)
+    frames = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        frames.extend(parser)
+    return frames
+
+
+class TestFrameParser:
+    """Tests para Core.Channels.Frame"""
+
+    def test_partial_frame(self):
+        """Test: Un frame partido en muchos pedazos se entrega una vez completo"""
+        frame = client_frame("á".encode() * 3000)
+        chunks = [frame[i : i + 1000] for i in range(0, len(frame), 1000)]
+        assert parse(*chunks) == [(OP_TEXT, "á" * 3000)]
+
+    def test_header_split(self):
+        """Test: La longitud extendida y la máscara también pueden llegar partidas"""
+        frame = client_frame(b"x" * 300)
+        assert parse(frame[:1], frame[1:3], frame[3:6], frame[6:]) == [
+            (OP_TEXT, "x" * 300)
+        ]
+
+    def test_coalesced_frames(self):
+        """Test: Varios frames en un solo bloque, el último incompleto"""
+        data = client_frame(b"uno") + client_frame(b"dos") + client_frame(b"tres")
+        parser = FrameParser()
+        parser.feed(data[:-2])
+        assert list(parser) == [(OP_TEXT, "uno"), (OP_TEXT, "dos")]
+        parser.feed(data[-2:])
+        assert list(parser) == [(OP_TEXT, "tres")]
+
+    def test_consumed_bytes_are_discarded(self):
+        """Test: El buffer no crece con los frames ya leídos"""
+        parser = FrameParser()
+        for _ in range(100):
+            parser.feed(client_frame(b"x" * 1000))
+            assert list(parser) == [(OP_TEXT, "x" * 1000)]
+        assert len(parser.buffer) < 2000
+
+    def test_large_payload_is_not_corrupted(self):
+        """Test: Un payload de 1 MB llega intacto"""
+        payload = os.urandom(MAX_MESSAGE_SIZE)
+        frame = client_frame(payload, opcode=OP_BINARY)
+        chunks = [frame[i : i + 65536] for i in range(0, len(frame), 65536)]
+        assert parse(*chunks) == [(OP_BINARY, payload)]
+
+    def test_fragmented_message_with_control_frame(self):
+        """Test: Fragmentos reensamblados; un ping en el medio se entrega antes"""
+        data = (
+            client_frame(b"ho", opcode=OP_TEXT, fin=False)
+            + client_frame(b"la", opcode=OP_CONTINUATION, fin=False)
+            + client_frame(b"?", opcode=OP_PING)
+            + client_frame(b" mundo", opcode=OP_CONTINUATION)
+        )
+        assert parse(data) == [(OP_PING, b"?"), (OP_TEXT, "hola mundo")]
+
+    @pytest.mark.parametrize(
+        "data, code",
+        [
+            (client_frame(b"x", opcode=OP_CONTINUATION), 1002),
+            (
+                client_frame(b"a", fin=False) + client_frame(b"b"),
+                1002,
+            ),
+            (struct.pack(">BB", 0x81, 3) + b"abc", 1002),
+            (client_frame(b"x" * 126, opcode=OP_PING), 1002),
+            (client_frame(b"x", opcode=0x3), 1002),
+            (client_frame(b"\xff\xfe"), 1007),
+            (client_frame(b"x" * 101), 1009),
+            (
+                client_frame(b"x" * 60, fin=False)
+                + client_frame(b"x" * 60, opcode=OP_CONTINUATION),
+                1009,
+            ),
+        ],
+    )
+    def test_protocol_errors(self, data, code):
+        """Test: Violaciones del protocolo lanzan FrameError con su código"""
+        with pytest.raises(FrameError) as error:
+            parse(data, max_message_size=100)
+        assert error.value.code == code
+
+    @pytest.mark.parametrize(
+        "size",
+        [0, 1, 3, 4, 5, 127, NUMPY_UNMASK_MIN - 1, NUMPY_UNMASK_MIN, 65539, 1 << 20],
+    )
+    def test_unmask_matches_byte_loop(self, size):
+        """Test: unmask en bloque da lo mismo que el XOR byte a byte"""
+        data = os.urandom(size + 3)
+        mask = os.urandom(4)
+        # Desalineado, como el payload dentro del buffer del parser
+        view = memoryview(data)[3:]
+
+        expected = bytearray(view)
+        for i in range(len(expected)):
+            expected[i] ^= mask[i % 4]
+
+        assert unmask(view, mask) == bytes(expected)
+        assert unmask(unmask(view, mask), mask) == bytes(view)
+
+    def test_decode_frame_compat(self):
+        """Test: decode_frame sigue decodificando un frame suelto"""
+        handler = WebSocketHandler(None, ("127.0.0.1", 1))
+
+        assert handler.decode_frame(client_frame(b"hola")) == "hola"
+        assert handler.decode_frame(encode_frame("sin mascara")) == "sin mascara"
+        assert handler.decode_frame(client_frame(b"x" * 70000)) == "x" * 70000
+        assert handler.decode_frame(client_frame(b"hola")[:4]) is None
+        assert handler.decode_frame(b"\x8f\x80") is None
+
+    def test_encode_frame(self):
+        """Test: encode_frame usa la longitud de 7, 16 o 64 bits"""
+        assert encode_frame("hola") == b"\x81\x04hola"
+        assert encode_frame(b"x" * 200, OP_BINARY)[:4] == b"\x82\x7e\x00\xc8"
+        assert encode_frame(b"x" * 70000)[:2] == b"\x81\x7f"
+        parser = FrameParser(require_mask=False)
+        parser.feed(encode_frame("x" * 70000) + encode_frame(b"", OP_CLOSE))
+        assert list(parser) == [(OP_TEXT, "x" * 70000), (OP_CLOSE, b"")]
+
+
+class TestBlockingHandler:
+    """Tests para WebSocketHandler.handle (un socket por thread)"""
+
+    @pytest.fixture
+    def client(self):
+        """Handler bloqueante atendiendo un extremo de un socketpair"""
+
+        class Handler(WebSocketHandler):
+            router = make_router()
+
+        server_side, client_side = socket.socketpair()
+        client_side.settimeout(5)
+        handler = Handler(server_side, ("127.0.0.1", 1))
+        thread = threading.Thread(target=handler.handle, daemon=True)
+        thread.start()
+        yield client_side, handler
+        client_side.close()
+        thread.join(timeout=2)
+
+    def handshake(self, sock, extra: bytes = b""):
+        sock.sendall(handshake_request() + extra)
+        head = b""
+        while not head.endswith(b"\r\n\r\n"):
+            head += recv_exact(sock, 1)
+        assert head.startswith(b"HTTP/1.1 101")
+        assert recv_event(sock)[0] == "connected"
+
+    def test_frames_after_handshake_and_large_message(self, client):
+        """Test: Un frame pegado al handshake y otro de más de 4 KB llegan bien"""
+        sock, handler = client
+        self.handshake(sock, extra=event_frame("echo", "primero"))
+        assert recv_event(sock) == ("echo", "primero")
+
+        sock.sendall(event_frame("echo", "x" * 100000) + event_frame("echo", "fin"))
+        assert recv_event(sock) == ("echo", "x" * 100000)
+        assert recv_event(sock) == ("echo", "fin")
+
+    def test_ping_and_close(self, client):
+        """Test: Ping responde pong; close responde close y termina handle()"""
+        sock, handler = client
+        self.handshake(sock)
+        sock.sendall(client_frame(b"hola", opcode=OP_PING))
+        assert recv_frame(sock) == (0xA, b"hola")
+
+        sock.sendall(client_frame(b"", opcode=OP_CLOSE))
+        assert recv_frame(sock)[0] == OP_CLOSE
+        assert sock.recv(1024) == b""
+        assert not handler.connected
+
+    def test_invalid_frame_closes(self, client):
+        """Test: Un frame sin máscara cierra con 1002"""
+        sock, handler = client
+        self.handshake(sock)
+        sock.sendall(struct.pack(">BB", 0x81, 2) + b"hi")
+        opcode, payload = recv_frame(sock)
+        assert opcode == OP_CLOSE and struct.unpack(">H", payload)[0] == 1002
@@ -0,0 +1,169 @@
+import pytest
+import sqlite3
+import threading
+
+from Core.Database.pool import SqliteOptions, ThreadLocalConnection
+from Core.Model import Model
+from Core.Model.Fields import IntegerField, TextField
+
+
+class Note(Model):
+    id = IntegerField(primary_key=True, auto_increment=True)
+    text = TextField(null=False)
+
+    _table_name = "notes"
+
+
+def in_thread(func):
+    """Ejecuta `func` en otro thread y devuelve su resultado"""
+    result = {}
+
+    def run():
+        try:
+            result["value"] = func()
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join(timeout=5)
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Conexiones de escritura y de solo lectura sobre un archivo temporal"""
+    path = str(tmp_path / "test.db")
+    options = SqliteOptions(cache_size=-2000, busy_timeout=200)
+    writer = ThreadLocalConnection(path, options)
+    Note.setup_db(writer)
+    Note.create_table()
+    reader = ThreadLocalConnection(path, options, readonly=True)
+    Note.setup_db(writer, reader)
+    yield writer, reader
+    writer.close_all()
+    reader.close_all()
+
+
+class TestThreadLocalConnection:
+    """Tests para Core.Database.pool"""
+
+    def test_pragmas(self, pool):
+        """Test: WAL, synchronous=NORMAL y las opciones configuradas"""
+        writer, reader = pool
+
+        assert writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert writer.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert writer.execute("PRAGMA cache_size").fetchone()[0] == -2000
+        assert reader.execute("PRAGMA busy_timeout").fetchone()[0] == 200
+        assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert isinstance(writer.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+
+    def test_one_connection_per_thread(self, pool):
+        """Test: Cada thread tiene la suya y el mismo thread la reutiliza"""
+        writer, _ = pool
+
+        assert writer.connection is writer.connection
+        other, count = in_thread(lambda: (writer.connection, writer.open_connections))
+        assert other is not writer.connection
+        assert count == 2
+
+    def test_thread_exit_closes_connection(self, pool):
+        """Test: La conexión de un thread se cierra cuando el thread termina"""
+        writer, _ = pool
+        writer.connection
+        db = in_thread(lambda: writer.connection)
+
+        assert writer.open_connections == 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
+        assert writer.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_close_then_thread_exit(self, pool):
+        """Test: Un thread que ya cerró su conexión no cierra la de otro"""
+        writer, _ = pool
+        writer.connection
+
+        def use_and_close():
+            writer.execute("SELECT 1")
+            writer.close()
+            return writer.open_connections
+
+        assert in_thread(use_and_close) == 1
+        assert writer.execute("SELECT 1").fetchone()[0] == 1
+        assert writer.open_connections == 1
+
+    def test_fork_opens_new_connections(self, pool, monkeypatch):
+        """Test: Si cambia el pid no se reutilizan las conexiones del padre"""
+        import os
+
+        writer, _ = pool
+        parent = writer.connection
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+
+        assert writer.connection is not parent
+        assert writer.open_connections == 1
+
+    def test_close_all_after_fork_keeps_parent_connections(self, pool, monkeypatch):
+        """Test: En el hijo, close_all descarta las del padre sin cerrarlas"""
+        import os
+
+        writer, _ = pool
+        parent = writer.connection
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+
+        writer.close_all()
+        assert writer.open_connections == 0
+        assert parent.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_reader_is_read_only(self, pool):
+        """Test: El pool de lectura no puede escribir"""
+        _, reader = pool
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("INSERT INTO notes (text) VALUES ('x')")
+
+    def test_readers_do_not_wait_for_writes(self, pool):
+        """Test: Con una escritura abierta, otro thread lee el último commit"""
+        writer, reader = pool
+        Note.create(text="confirmada")
+
+        with Note.atomic():
+            Note.create(text="pendiente")
+            # El mismo thread, dentro de atomic(), lee por la de escritura
+            assert Note.all().count() == 2
+            texts = in_thread(lambda: Note.all().values_list("text", flat=True).execute())
+
+        assert texts == ["confirmada"]
+        assert Note.all().count() == 2
+
+    def test_atomic_is_per_thread(self, pool):
+        """Test: Un atomic() abierto en un thread no frena los commits de otro"""
+        writer, reader = pool
+        inside, done = threading.Event(), threading.Event()
+
+        def slow_block():
+            with Note.atomic():
+                inside.set()
+                done.wait(5)
+
+        thread = threading.Thread(target=slow_block)
+        thread.start()
+        inside.wait(5)
+        try:
+            Note.create(text="fuera")
+            assert in_thread(lambda: Note.all().count()) == 1
+        finally:
+            done.set()
+            thread.join(timeout=5)
+
+    def test_trace_callback_reaches_every_thread(self, pool):
+        """Test: capture_queries ve lo que ejecutan los otros threads"""
+        from Core.Database.queries import capture_queries
+
+        writer, reader = pool
+        with capture_queries(reader) as captured:
+            in_thread(lambda: Note.all().execute())
+
+        assert len(captured) == 1
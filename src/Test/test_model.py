@@ -0,0 +1,615 @@
+import pytest
+import sqlite3
+from datetime import datetime
+
+from Core.Model import Model
+from Core.Model.Fields import (
+    IntegerField,
+    TextField,
+    FloatField,
+    ForeignKey,
+    BooleanField,
+    DateTimeField,
+    ManyToManyField,
+)
+
+
+class Author(Model):
+    id = IntegerField(primary_key=True, auto_increment=True)
+    name = TextField(null=False)
+
+    _table_name = "authors"
+
+
+class Book(Model):
+    id = IntegerField(primary_key=True, auto_increment=True)
+    title = TextField(null=False, unique=True)
+    price = FloatField(null=True)
+    author = ForeignKey(Author, related_name="books")
+
+    _table_name = "books"
+
+
+class Tag(Model):
+    id = IntegerField(primary_key=True, auto_increment=True)
+    label = TextField(null=False)
+    active = BooleanField(default=1)
+    created_at = DateTimeField(auto_now_add=True)
+    books = ManyToManyField(Book)
+
+    _table_name = "tags"
+
+
+@pytest.fixture
+def db():
+    """Base de datos en memoria con las tablas de prueba"""
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    for model in (Author, Book, Tag):
+        model.setup_db(connection)
+        model.create_table()
+    yield connection
+    connection.close()
+
+
+class TestBulkCreate:
+    """Tests para Model.bulk_create"""
+
+    def test_inserts_and_backfills_ids(self, db):
+        """Test: Inserta todo y rellena los ids en orden"""
+        Author.create(name="previo")
+        books = [Book(title=f"t{i}", price=i * 1.5, author=1) for i in range(50)]
+
+        created = Book.bulk_create(books)
+
+        assert created == books
+        assert [book.id for book in books] == list(range(1, 51))
+        assert Book.all().count() == 50
+        assert Book.get(id=37).title == "t36"
+        assert not books[0]._is_new
+
+    def test_single_transaction(self, db):
+        """Test: Se hace un solo commit"""
+        statements = []
+        db.set_trace_callback(statements.append)
+
+        Book.bulk_create([Book(title=f"t{i}", author=1) for i in range(10)])
+
+        commits = [sql for sql in statements if sql.upper().startswith("COMMIT")]
+        assert len(commits) == 1
+
+    def test_rollback_on_error(self, db):
+        """Test: Si una fila falla no se inserta ninguna"""
+        Book.create(title="repetido", author=1)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            Book.bulk_create([Book(title="nuevo", author=1), Book(title="repetido")])
+
+        assert Book.all().count() == 1
+
+    def test_batches(self, db):
+        """Test: Con batch_size se ejecuta por lotes y los ids siguen en orden"""
+        statements = []
+        db.set_trace_callback(statements.append)
+
+        books = Book.bulk_create(
+            [Book(title=f"t{i}", author=1) for i in range(25)], batch_size=10
+        )
+
+        assert [book.id for book in books] == list(range(1, 26))
+        rowids = [sql for sql in statements if "last_insert_rowid" in sql]
+        assert len(rowids) == 3
+
+    def test_empty(self, db):
+        """Test: Una lista vacía no toca la base de datos"""
+        assert Book.bulk_create([]) == []
+
+
+class TestBulkUpdate:
+    """Tests para Model.bulk_update"""
+
+    def test_updates_only_given_fields(self, db):
+        """Test: Actualiza los campos indicados de todas las filas"""
+        books = Book.bulk_create(
+            [Book(title=f"t{i}", price=1.0, author=1) for i in range(30)]
+        )
+        for book in books:
+            book.price = book.id * 2.0
+            book.title = "no se guarda"
+
+        assert Book.bulk_update(books, ["price"], batch_size=7) == 30
+
+        stored = Book.get(id=12)
+        assert stored.price == 24.0
+        assert stored.title == "t11"
+
+    def test_unknown_field(self, db):
+        """Test: Un campo inexistente es un error"""
+        with pytest.raises(ValueError):
+            Book.bulk_update([Book(title="x")], ["nope"])
+
+
+class TestAtomic:
+    """Tests para la unidad de trabajo atomic()"""
+
+    def test_single_commit(self, db):
+        """Test: Las escrituras dentro del bloque se confirman una sola vez"""
+        statements = []
+        db.set_trace_callback(statements.append)
+
+        with Author.atomic():
+            author = Author.create(name="ana")
+            for i in range(5):
+                Book.create(title=f"t{i}", author=author.id)
+            author.name = "ana maría"
+            author.save()
+
+        commits = [sql for sql in statements if sql.upper().startswith("COMMIT")]
+        assert len(commits) == 1
+        assert Book.all().count() == 5
+        assert not db.in_transaction
+
+    def test_rollback_on_exception(self, db):
+        """Test: Una excepción deshace todo el bloque"""
+        with pytest.raises(RuntimeError):
+            with Author.atomic():
+                Author.create(name="ana")
+                raise RuntimeError("fallo")
+
+        assert Author.all().count() == 0
+        assert not db.in_transaction
+
+    def test_nested_savepoint(self, db):
+        """Test: Un bloque anidado que falla solo deshace su parte"""
+        with Author.atomic():
+            Author.create(name="externo")
+            with pytest.raises(sqlite3.IntegrityError):
+                with Book.atomic():
+                    Book.create(title="uno", author=1)
+                    Book.create(title="uno", author=1)
+            Book.create(title="dos", author=1)
+
+        assert Author.all().count() == 1
+        assert [book.title for book in Book.all()] == ["dos"]
+
+    def test_bulk_create_joins_outer_transaction(self, db):
+        """Test: bulk_create dentro de atomic() se revierte con el bloque"""
+        with pytest.raises(RuntimeError):
+            with Book.atomic():
+                Book.bulk_create([Book(title=f"t{i}", author=1) for i in range(3)])
+                raise RuntimeError("fallo")
+
+        assert Book.all().count() == 0
+
+
+class TestCompiledSQL:
+    """Tests para el SQL precompilado por modelo y por forma de consulta"""
+
+    def test_meta_precomputes_statements(self):
+        """Test: El metaclass calcula pk, columnas y SQL estático"""
+        assert Book._pk_field == "id"
+        assert Book._insert_columns == ["title", "price", "author"]
+        assert Book._insert_sql == (
+            "INSERT INTO books (title, price, author) VALUES (?, ?, ?)"
+        )
+        assert Book._update_sql == (
+            "UPDATE books SET title = ?, price = ?, author = ? WHERE id = ?"
+        )
+        assert Book._delete_sql == "DELETE FROM books WHERE id = ?"
+        assert Book._python_converters == {}
+
+    def test_queryset_sql_cached_by_shape(self, db):
+        """Test: Misma forma de consulta, mismo SQL aunque cambien los valores"""
+        Book.bulk_create([Book(title=f"t{i}", price=i, author=1) for i in range(10)])
+        Book._query_cache.clear()
+
+        cheap = Book.filter(price__lt=3).order_by("-price")
+        pricey = Book.filter(price__lt=8).order_by("-price")
+
+        assert [book.price for book in cheap] == [2, 1, 0]
+        assert len(pricey.execute()) == 8
+        assert len(Book._query_cache) == 1
+        assert cheap._render("select")[0] is pricey._render("select")[0]
+
+    def test_limit_and_offset_are_parameters(self, db):
+        """Test: LIMIT/OFFSET van como parámetros; OFFSET solo también funciona"""
+        Book.bulk_create([Book(title=f"t{i}", author=1) for i in range(10)])
+
+        page = Book.all().order_by("id")[2:5]
+        assert [book.id for book in page] == [3, 4, 5]
+
+        rest = Book.all().order_by("id").offset(7)
+        assert [book.id for book in rest] == [8, 9, 10]
+
+    def test_get_by_pk(self, db):
+        """Test: get() por pk usa el SELECT precompilado"""
+        Author.create(name="ana")
+        statements = []
+        db.set_trace_callback(statements.append)
+
+        assert Author.get(id=1).name == "ana"
+        assert statements == ["SELECT * FROM authors WHERE id = 1"]
+
+        with pytest.raises(Exception):
+            Author.get(id=99)
+
+
+class TestHydration:
+    """Tests para la construcción de instancias desde filas"""
+
+    def test_converters_and_identity(self, db):
+        """Test: Solo se convierten los campos con to_python propio"""
+        Tag.create(label="a", active=False)
+
+        tag = Tag.all().execute()[0]
+
+        assert set(Tag._python_converters) == {"active", "created_at"}
+        assert tag.active is False
+        assert isinstance(tag.created_at, datetime)
+        assert tag.label == "a"
+        assert not tag._is_new
+
+    def test_many_to_many_manager_is_lazy(self, db):
+        """Test: El manager m2m se crea al primer acceso y se reutiliza"""
+        book = Book.create(title="libro", author=1)
+        Tag.create(label="a")
+
+        tag = Tag.get(id=1)
+        assert "books" not in tag.__dict__
+
+        tag.books.add(book)
+        assert tag.books is tag.__dict__["books"]
+        assert [b.title for b in Tag.get(id=1).books.all()] == ["libro"]
+        assert isinstance(Tag.books, ManyToManyField)
+
+
+class TestReadModes:
+    """Tests para values(), values_list() y records()"""
+
+    @pytest.fixture
+    def tags(self, db):
+        Tag.create(label="a", active=True)
+        Tag.create(label="b", active=False)
+
+    def test_values(self, tags):
+        """Test: Dicts con las columnas pedidas y conversión aplicada"""
+        rows = Tag.all().order_by("id").values("label", "active").execute()
+        assert rows == [{"label": "a", "active": True}, {"label": "b", "active": False}]
+
+    def test_values_list(self, tags):
+        """Test: Tuplas, o valores sueltos con flat=True"""
+        assert Tag.all().order_by("id").values_list("id", "label").execute() == [
+            (1, "a"),
+            (2, "b"),
+        ]
+        assert Tag.filter(active=True).values_list("label", flat=True).execute() == [
+            "a"
+        ]
+        with pytest.raises(ValueError):
+            Tag.all().values_list("id", "label", flat=True)
+
+    def test_records(self, tags):
+        """Test: namedtuples sin __dict__ con todos los campos por defecto"""
+        records = Tag.all().order_by("-id").records().execute()
+
+        assert records[0].label == "b"
+        assert records[0].active is False
+        assert isinstance(records[0].created_at, datetime)
+        assert not hasattr(records[0], "__dict__")
+        assert type(records[0]) is type(records[1])
+
+    def test_unknown_field(self, tags):
+        """Test: Solo se aceptan campos del modelo"""
+        with pytest.raises(ValueError):
+            Tag.all().values("label; DROP TABLE tags")
+
+    def test_serializer_fast_path(self, tags):
+        """Test: El Serializer acepta records con include/exclude"""
+        from Core.Serializer import Serializer
+
+        records = Tag.all().order_by("id").records("id", "label", "active").execute()
+        instances = Tag.all().order_by("id").execute()
+
+        assert Serializer.serialize_many(records, exclude=["active"]) == [
+            {"id": 1, "label": "a"},
+            {"id": 2, "label": "b"},
+        ]
+        assert Serializer.serialize_many(records) == [
+            {key: value for key, value in row.items() if key != "created_at"}
+            for row in Serializer.serialize_many(instances)
+        ]
+        assert Serializer.serialize(records[0], include=["label"]) == {"label": "a"}
+
+
+class TestStreaming:
+    """Tests para iterator(), after_pk() y pages()"""
+
+    @pytest.fixture
+    def authors(self, db):
+        Author.bulk_create([Author(name=f"a{i}") for i in range(25)])
+
+    def test_iterator_fetchmany(self, authors, db):
+        """Test: iterator() es perezoso y devuelve todas las filas en orden"""
+        rows = Author.all().order_by("id").iterator(chunk_size=4)
+
+        first = next(rows)
+        assert isinstance(first, Author)
+        assert first.name == "a0"
+        assert [author.id for author in rows] == list(range(2, 26))
+
+    def test_iterator_read_modes(self, authors):
+        """Test: iterator() respeta values_list() y records()"""
+        names = Author.filter(id__lte=3).order_by("id").values_list("name", flat=True)
+        assert list(names.iterator(chunk_size=2)) == ["a0", "a1", "a2"]
+
+        records = list(Author.all().records("id").iterator(chunk_size=10))
+        assert len(records) == 25
+        assert records[-1].id == 25
+
+    def test_after_pk(self, authors):
+        """Test: Keyset ascendente y descendente sin OFFSET"""
+        query = Author.all().after_pk(20)
+        sql, params = query._render("select")
+
+        assert "OFFSET" not in sql
+        assert [author.id for author in query.execute()] == [21, 22, 23, 24, 25]
+        assert Author.all().order_by("-id").after_pk(3).values_list(
+            "id", flat=True
+        ).execute() == [2, 1]
+
+    def test_after_pk_requires_pk_order(self, authors):
+        """Test: Keyset solo tiene sentido ordenando por el pk"""
+        with pytest.raises(ValueError):
+            Author.all().order_by("name").after_pk(1)
+
+    def test_pages(self, authors):
+        """Test: pages() recorre todo en páginas de tamaño fijo"""
+        pages = list(Author.filter(id__gt=5).pages(size=8))
+
+        assert [len(page) for page in pages] == [8, 8, 4]
+        assert [a.id for page in pages for a in page] == list(range(6, 26))
+
+        ids = [
+            row[0]
+            for page in Author.all().values_list("id", "name").pages(size=10)
+            for row in page
+        ]
+        assert ids == list(range(1, 26))
+        with pytest.raises(ValueError):
+            next(Author.all().values_list("name").pages())
+
+    def test_pages_with_limit(self, authors):
+        """Test: El limit() del queryset acota el total, no cada página"""
+        pages = list(Author.all().order_by("id").limit(18).pages(size=8))
+
+        assert [len(page) for page in pages] == [8, 8, 2]
+        assert [a.id for page in pages for a in page] == list(range(1, 19))
+        assert list(Author.all().limit(0).pages(size=8)) == []
+
+    def test_pages_with_offset(self, authors):
+        """Test: El offset solo salta filas antes de la primera página"""
+        pages = list(Author.all().order_by("id").offset(5).pages(size=8))
+
+        assert [len(page) for page in pages] == [8, 8, 4]
+        assert [a.id for page in pages for a in page] == list(range(6, 26))
+
+
+class TestResultCache:
+    """Tests para el cache de resultados del QuerySet"""
+
+    @pytest.fixture
+    def statements(self, db):
+        Author.bulk_create([Author(name=f"a{i}") for i in range(5)])
+        executed = []
+        db.set_trace_callback(executed.append)
+        yield executed
+        db.set_trace_callback(None)
+
+    def test_single_query(self, statements):
+        """Test: len, bool, iter, índices y count reutilizan un solo SELECT"""
+        query = Author.all().order_by("id")
+
+        assert len(query) == 5
+        assert query
+        assert [author.name for author in query] == [f"a{i}" for i in range(5)]
+        assert query[1].name == "a1"
+        assert [author.id for author in query[1:3]] == [2, 3]
+        assert query[-1].id == 5
+        assert query.count() == 5
+        assert query.first().id == 1
+        assert query.exists()
+        assert len(statements) == 1
+        assert statements[0].startswith("SELECT *")
+
+    def test_empty(self, statements):
+        """Test: bool() de un resultado vacío no lanza COUNT"""
+        query = Author.filter(name="nadie")
+        assert not query
+        assert len(query) == 0
+        assert len(statements) == 1
+
+    def test_clone_and_execute_refresh(self, statements):
+        """Test: Los clones no heredan el cache y execute() vuelve a consultar"""
+        query = Author.all()
+        list(query)
+        Author.create(name="nuevo")
+
+        assert len(query) == 5
+        assert len(query.filter(id__gt=0)) == 6
+        assert len(query.execute()) == 6
+        assert len(query) == 6
+
+    def test_unevaluated_count(self, statements):
+        """Test: Sin cache, count() y el índice siguen consultando a SQLite"""
+        assert Author.all().count() == 5
+        assert Author.all().order_by("id")[2].name == "a2"
+        assert "COUNT" in statements[0]
+        assert "LIMIT" in statements[1]
+
+
+class TestRelations:
+    """Tests para select_related, prefetch_related y assert_num_queries"""
+
+    @pytest.fixture
+    def library(self, db):
+        authors = Author.bulk_create([Author(name=f"a{i}") for i in range(3)])
+        books = Book.bulk_create(
+            [Book(title=f"b{i}", author=authors[i % 3].id) for i in range(9)]
+        )
+        Book.create(title="huerfano", author=None)
+        tags = Tag.bulk_create([Tag(label=f"t{i}") for i in range(3)])
+        tags[0].books.add(*books[:4])
+        tags[1].books.add(books[0])
+        return authors, books, tags
+
+    def test_select_related_one_query(self, library, db):
+        """Test: Un JOIN hidrata libro y autor; related() no vuelve a consultar"""
+        from Core.Database.queries import assert_num_queries
+
+        with assert_num_queries(db, 1) as captured:
+            books = Book.all().select_related("author").order_by("id").execute()
+            names = [book.related("author") and book.related("author").name for book in books]
+
+        assert "LEFT JOIN authors" in captured.queries[0]
+        assert names == [f"a{i % 3}" for i in range(9)] + [None]
+        assert books[0].related("author") is books[3].related("author")
+        assert books[0].author == 1
+        assert isinstance(books[0].author, int)
+
+    def test_select_related_filters_and_modes(self, library, db):
+        """Test: Filtros y orden van calificados; count() y records() no hacen JOIN"""
+        query = Book.filter(id__gt=6).select_related("author").order_by("-id")
+
+        assert [book.id for book in query.execute()] == [10, 9, 8, 7]
+        assert query.count() == 4
+        assert "JOIN" not in query._render("count")[0]
+        assert "JOIN" not in query.records("id")._render("select")[0]
+        authors = [book.related("author") for book in query.iterator(chunk_size=2)]
+        assert authors[0] is None
+        assert [author.name for author in authors[1:]] == ["a2", "a1", "a0"]
+        with pytest.raises(ValueError):
+            Book.all().select_related("title")
+
+    def test_stale_related_is_ignored(self, library, db):
+        """Test: Si cambia la ForeignKey se vuelve a buscar el objeto"""
+        book = Book.all().select_related("author").first()
+        book.author = 3
+        assert book.related("author").name == "a2"
+
+    def test_prefetch_many_to_many(self, library, db):
+        """Test: Una sola query IN para el through table de todo el resultado"""
+        from Core.Database.queries import assert_num_queries
+
+        _, books, _ = library
+        with assert_num_queries(db, 2):
+            tags = Tag.all().prefetch_related("books").order_by("id").execute()
+            labels = [[book.title for book in tag.books.all()] for tag in tags]
+            counts = [tag.books.count() for tag in tags]
+
+        assert sorted(labels[0]) == ["b0", "b1", "b2", "b3"]
+        assert labels[1:] == [["b0"], []]
+        assert counts == [4, 1, 0]
+
+        tags[2].books.add(books[5])
+        assert [book.title for book in tags[2].books.all()] == ["b5"]
+
+    def test_prefetch_foreign_key(self, library, db):
+        """Test: prefetch_related con ForeignKey: una query IN para los autores"""
+        from Core.Database.queries import capture_queries
+
+        with capture_queries(db) as captured:
+            books = Book.all().prefetch_related("author").execute()
+            [book.related("author") for book in books]
+
+        assert len(captured) == 2
+        assert "IN (1, 2, 3)" in captured.queries[1]
+
+    def test_many_to_many_all_single_query(self, library, db):
+        """Test: tag.books.all() sin prefetch es un solo SELECT con JOIN"""
+        from Core.Database.queries import assert_num_queries
+
+        tag = Tag.get(id=1)
+        with assert_num_queries(db, 1):
+            assert len(tag.books.all()) == 4
+
+    def test_assert_num_queries_fails(self, library, db):
+        """Test: El helper lista las queries cuando no coincide el número"""
+        from Core.Database.queries import assert_num_queries
+
+        with pytest.raises(AssertionError, match="Se esperaban 1 queries"):
+            with assert_num_queries(db, 1):
+                Book.all().execute()
+                Author.all().execute()
+
+
+class TestIndexes:
+    """Tests para db_index, _indexes, índices de ForeignKey y sync_indexes"""
+
+    def index_names(self, db, table):
+        return {row[1] for row in db.execute(f"PRAGMA index_list({table})")}
+
+    def test_foreign_key_and_through_table(self, db):
+        """Test: Las ForeignKey y el lado inverso del m2m quedan indexados"""
+        assert "idx_books_author" in self.index_names(db, "books")
+        assert "idx_tags_books_books_id" in self.index_names(db, "tags_books")
+
+    def test_db_index_and_composite(self, db):
+        """Test: db_index=True y `_indexes` generan sus CREATE INDEX"""
+
+        class Event(Model):
+            id = IntegerField(primary_key=True, auto_increment=True)
+            kind = TextField(db_index=True)
+            author = ForeignKey(Author, db_index=False)
+            created_at = DateTimeField(auto_now_add=True)
+
+            _table_name = "events"
+            _indexes = [("kind", "created_at")]
+
+        Event.setup_db(db)
+        Event.create_table()
+
+        assert self.index_names(db, "events") == {
+            "idx_events_kind",
+            "idx_events_kind_created_at",
+        }
+        with pytest.raises(ValueError):
+
+            class Broken(Model):
+                id = IntegerField(primary_key=True)
+                _indexes = [("missing",)]
+
+    def test_sync_is_idempotent(self, db):
+        """Test: Una segunda sync no hace nada y se borran los índices viejos"""
+        assert Book.sync_indexes() == ([], [])
+
+        db.execute("CREATE INDEX idx_books_price ON books (price)")
+        db.execute("CREATE INDEX manual_books_title ON books (title)")
+        assert Book.sync_indexes() == ([], ["idx_books_price"])
+        assert "manual_books_title" in self.index_names(db, "books")
+
+        db.execute("DROP INDEX idx_books_author")
+        assert Book.sync_indexes() == (["idx_books_author"], [])
+
+    def test_predictions_by_user_uses_index(self, db):
+        """Test: El listado por usuario busca por índice, sin scan ni sort"""
+        from Domain.Model.User import User
+        from Domain.Model.Predicts import Prediction
+
+        previous = [(model, model._db, model._read_db) for model in (User, Prediction)]
+        for model in (User, Prediction):
+            model.setup_db(db)
+            model.create_table()
+        try:
+            sql, params = (
+                Prediction.filter(user=1).order_by("-id").records()._render("select")
+            )
+            plan = " ".join(
+                row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            )
+        finally:
+            for model, connection, reader in previous:
+                model.setup_db(connection, reader)
+
+        assert "USING INDEX idx_predcitions_user" in plan
+        assert "SCAN" not in plan
+        assert "TEMP B-TREE" not in plan
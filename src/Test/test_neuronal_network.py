@@ -0,0 +1,479 @@
+import pytest
+import threading
+
+from Core.NeuronalNetwork.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Tests para el micro-batching de inferencia"""
+
+    def test_single_prediction(self):
+        """Test: Una predicción aislada se resuelve en un batch de 1"""
+        batcher = MicroBatcher(lambda xs: [x * 2 for x in xs], max_wait_us=100)
+
+        assert batcher.predict(3.0, timeout=2) == 6.0
+        assert batcher.stats()["batch_size_histogram"] == {1: 1}
+        batcher.shutdown()
+
+    def test_concurrent_requests_are_batched(self):
+        """Test: Peticiones concurrentes comparten un solo forward pass"""
+        calls = []
+
+        def predict_fn(xs):
+            calls.append(len(xs))
+            return [x * 5 + 50 for x in xs]
+
+        batcher = MicroBatcher(predict_fn, max_batch_size=32, max_wait_us=50_000)
+        futures = [batcher.submit(float(i)) for i in range(20)]
+        results = [f.result(timeout=2) for f in futures]
+
+        assert results == [i * 5 + 50 for i in range(20)]
+        assert sum(calls) == 20
+        assert len(calls) < 20
+        stats = batcher.stats()
+        assert stats["items"] == 20
+        assert stats["max_queue_wait_us"] >= 0
+        batcher.shutdown()
+
+    def test_max_batch_size_is_respected(self):
+        """Test: Ningún batch supera max_batch_size"""
+        batcher = MicroBatcher(lambda xs: xs, max_batch_size=4, max_wait_us=50_000)
+        futures = [batcher.submit(i) for i in range(10)]
+        [f.result(timeout=2) for f in futures]
+
+        assert max(batcher.stats()["batch_size_histogram"]) <= 4
+        batcher.shutdown()
+
+    def test_errors_propagate_to_every_caller(self):
+        """Test: Un fallo del modelo llega a todos los Futures del batch"""
+
+        def predict_fn(xs):
+            raise ValueError("modelo roto")
+
+        batcher = MicroBatcher(predict_fn, max_wait_us=10_000)
+        futures = [batcher.submit(i) for i in range(3)]
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=2)
+        batcher.shutdown()
+
+    def test_threads_get_their_own_result(self):
+        """Test: Cada thread recibe el resultado de su propia entrada"""
+        batcher = MicroBatcher(lambda xs: [x + 1 for x in xs], max_wait_us=5_000)
+        results = {}
+
+        def worker(i):
+            results[i] = batcher.predict(i, timeout=2)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(50)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == {i: i + 1 for i in range(50)}
+        batcher.shutdown()
+
+
+class TestCompiledModel:
+    """Tests para el forward pass compilado en NumPy"""
+
+    def test_dense_relu_sigmoid(self):
+        """Test: El runtime aplica matmul, bias y activaciones"""
+        import numpy as np
+        from Core.NeuronalNetwork.compiled import CompiledModel, ACTIVATIONS
+
+        kernel = np.array([[1.0, -1.0]], dtype=np.float32)
+        bias = np.array([0.5, 0.5], dtype=np.float32)
+        head = np.array([[1.0], [1.0]], dtype=np.float32)
+        model = CompiledModel(
+            [
+                (kernel, bias, ACTIVATIONS["relu"]),
+                (head, None, ACTIVATIONS["sigmoid"]),
+            ]
+        )
+
+        output = model.predict([[2.0], [-2.0]])
+        expected = 1 / (1 + np.exp(-np.array([[2.5], [2.5]])))
+
+        assert output.shape == (2, 1)
+        np.testing.assert_allclose(output, expected, rtol=1e-6)
+
+    @staticmethod
+    def fake_model(kernel, bias):
+        """Objeto con la forma de un Sequential de una Dense, sin TensorFlow"""
+
+        def linear(x):
+            return x
+
+        class Dense:
+            activation = staticmethod(linear)
+
+            def get_weights(self):
+                return [kernel, bias]
+
+        class Sequential:
+            layers = [Dense()]
+
+        return Sequential()
+
+    def test_export_replaces_atomically(self, tmp_path):
+        """Test: El .npz se escribe en un temporal y se renombra"""
+        import numpy as np
+        from Core.NeuronalNetwork.compiled import CompiledModel, export_model
+
+        path = str(tmp_path / "model.npz")
+        kernel = np.array([[2.0]], dtype=np.float32)
+        model = self.fake_model(kernel, np.array([1.0], dtype=np.float32))
+
+        compiled = CompiledModel.load(export_model(model, path))
+
+        np.testing.assert_allclose(compiled.predict([[3.0]]), [[7.0]])
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["model.npz"]
+
+    def test_failed_export_keeps_previous_file(self, tmp_path, monkeypatch):
+        """Test: Si la escritura falla a medias el .npz anterior queda intacto"""
+        import numpy as np
+        from Core.NeuronalNetwork import compiled
+        from Core.NeuronalNetwork.compiled import CompiledModel, export_model
+
+        path = str(tmp_path / "model.npz")
+        bias = np.array([0.0], dtype=np.float32)
+        previous = self.fake_model(np.array([[2.0]], dtype=np.float32), bias)
+        new = self.fake_model(np.array([[5.0]], dtype=np.float32), bias)
+        export_model(previous, path)
+
+        def broken_savez(file, **arrays):
+            file.write(b"PK\x03\x04 a medias")
+            raise OSError("disco lleno")
+
+        monkeypatch.setattr(compiled.np, "savez", broken_savez)
+        with pytest.raises(OSError):
+            export_model(new, path)
+        monkeypatch.undo()
+
+        assert CompiledModel.load(path).predict([[1.0]]).tolist() == [[2.0]]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["model.npz"]
+
+    def test_parity_with_keras_predict(self, tmp_path):
+        """Test: Misma salida que model.predict con Dropout eliminado"""
+        import numpy as np
+        tf = pytest.importorskip("tensorflow")
+        from Core.NeuronalNetwork.compiled import CompiledModel, export_model
+
+        model = tf.keras.Sequential(
+            [
+                tf.keras.layers.Dense(32, activation="relu", input_shape=(10,)),
+                tf.keras.layers.Dropout(0.3),
+                tf.keras.layers.Dense(16, activation="relu"),
+                tf.keras.layers.Dropout(0.2),
+                tf.keras.layers.Dense(1, activation="sigmoid"),
+            ]
+        )
+        X = np.random.randn(64, 10).astype(np.float32)
+
+        path = export_model(model, str(tmp_path / "model.npz"))
+        compiled = CompiledModel.load(path)
+
+        np.testing.assert_allclose(
+            compiled.predict(X), model.predict(X, verbose=0), rtol=1e-5, atol=1e-6
+        )
+
+    def test_parity_single_dense(self, tmp_path):
+        """Test: El modelo de horas de estudio (Dense(1)) da el mismo resultado"""
+        import numpy as np
+        tf = pytest.importorskip("tensorflow")
+        from Core.NeuronalNetwork.compiled import CompiledModel, export_model
+
+        model = tf.keras.Sequential([tf.keras.layers.Dense(units=1, input_shape=[1])])
+        hours = np.array([[1.0], [2.0], [5.0], [8.0]], dtype=np.float32)
+
+        compiled = CompiledModel.load(export_model(model, str(tmp_path / "m.npz")))
+
+        np.testing.assert_allclose(
+            compiled.predict(hours), model.predict(hours, verbose=0), rtol=1e-6
+        )
+
+
+class TestModelRegistry:
+    """Tests para la carga perezosa del modelo"""
+
+    def test_loading_then_ready(self):
+        """Test: Mientras carga lanza ModelNotReady, luego queda listo"""
+        from Core.NeuronalNetwork.registry import (
+            ModelRegistry,
+            ModelNotReady,
+            ModelState,
+        )
+
+        gate = threading.Event()
+
+        def loader():
+            gate.wait(2)
+            return "modelo"
+
+        registry = ModelRegistry(loader)
+
+        with pytest.raises(ModelNotReady) as info:
+            registry.get()
+        assert info.value.state == ModelState.LOADING
+
+        gate.set()
+        assert registry.wait(timeout=2)
+        assert registry.get() == "modelo"
+        assert registry.status()["ready_ms"] is not None
+
+    def test_failed_load_exposes_error(self):
+        """Test: Un fallo de carga queda en estado failed con el error"""
+        from Core.NeuronalNetwork.registry import (
+            ModelRegistry,
+            ModelNotReady,
+            ModelState,
+        )
+
+        def loader():
+            raise FileNotFoundError("no existe")
+
+        registry = ModelRegistry(loader)
+        assert not registry.wait(timeout=2)
+
+        with pytest.raises(ModelNotReady) as info:
+            registry.get()
+        assert info.value.state == ModelState.FAILED
+        assert "no existe" in info.value.error
+
+    def test_failed_load_is_retried_with_backoff(self, monkeypatch):
+        """Test: Tras un fallo, get() reintenta solo cuando pasó el backoff"""
+        from Core.NeuronalNetwork import registry as module
+        from Core.NeuronalNetwork.registry import ModelRegistry, ModelNotReady
+
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        attempts = []
+
+        def loader():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise FileNotFoundError("no existe")
+            return "modelo"
+
+        registry = ModelRegistry(loader, retry_min=1.0, retry_max=60.0)
+        assert not registry.wait(timeout=2)
+
+        with pytest.raises(ModelNotReady):
+            registry.get()
+        assert len(attempts) == 1
+
+        now[0] += 1.0
+        with pytest.raises(ModelNotReady):
+            registry.get(timeout=2)
+        assert len(attempts) == 2
+
+        # El segundo fallo duplica la espera
+        now[0] += 1.0
+        with pytest.raises(ModelNotReady):
+            registry.get()
+        assert len(attempts) == 2
+
+        now[0] += 1.0
+        assert registry.get(timeout=2) == "modelo"
+        assert len(attempts) == 3
+
+    def test_failed_load_retries_when_file_appears(self, tmp_path):
+        """Test: Si aparece el archivo vigilado se reintenta sin esperar el backoff"""
+        from Core.NeuronalNetwork.registry import ModelRegistry
+
+        path = tmp_path / "modelo.npz"
+
+        def loader():
+            return path.read_text()
+
+        registry = ModelRegistry(
+            loader, watch=[str(path)], watch_interval=0, retry_min=3600
+        )
+        assert not registry.wait(timeout=2)
+
+        path.write_text("modelo")
+        assert registry.get(timeout=2) == "modelo"
+
+    def test_concurrent_change_reloads_once(self, tmp_path):
+        """Test: Threads que ven el mismo cambio de archivo recargan una vez"""
+        import os
+        from Core.NeuronalNetwork.registry import ModelRegistry
+
+        path = tmp_path / "model.keras"
+        path.write_text("v1")
+        gate = threading.Event()
+        loads = []
+
+        def loader():
+            loads.append(path.read_text())
+            if len(loads) > 1:
+                gate.wait(2)
+            return path.read_text()
+
+        registry = ModelRegistry(loader, watch=[str(path)], watch_interval=0)
+        assert registry.wait(timeout=2)
+
+        path.write_text("v2")
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+        threads = [threading.Thread(target=registry.maybe_reload) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Con la recarga en curso, otro cambio tampoco lanza una segunda
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+        registry.maybe_reload()
+        gate.set()
+        registry._thread.join(2)
+
+        assert loads == ["v1", "v2"]
+        assert registry.get() == "v2"
+
+    def test_warmup_runs_before_ready(self):
+        """Test: El batch de warm-up se ejecuta antes de marcar ready"""
+        from Core.NeuronalNetwork.registry import ModelRegistry
+
+        seen = []
+        registry = ModelRegistry(
+            lambda: "modelo",
+            warmup=lambda model, batch: seen.append((model, batch)),
+            warmup_batch=[1.0, 2.0],
+        )
+
+        assert registry.wait(timeout=2)
+        assert seen == [("modelo", [1.0, 2.0])]
+
+    def test_first_prediction_is_recorded(self):
+        """Test: Se mide el tiempo de arranque en frío a la primera predicción"""
+        from Core.NeuronalNetwork.registry import ModelRegistry
+
+        registry = ModelRegistry(lambda: "modelo")
+        registry.wait(timeout=2)
+        registry.record_prediction()
+
+        assert registry.status()["first_prediction_ms"] >= registry.status()["ready_ms"]
+
+
+class TestPredictionCache:
+    """Tests para el cache de predicciones"""
+
+    def test_hit_and_miss(self):
+        """Test: La segunda consulta de la misma entrada es un hit"""
+        from Core.NeuronalNetwork.cache import PredictionCache
+
+        cache = PredictionCache(maxsize=10)
+        assert cache.get("v1", 2.0) is PredictionCache.MISS
+
+        cache.set("v1", 2.0, 60.0)
+        assert cache.get("v1", 2.0) == 60.0
+        assert cache.get("v1", 2.0000001) == 60.0  # entrada cuantizada
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_fingerprint_is_part_of_the_key(self):
+        """Test: Otro modelo no reutiliza resultados del anterior"""
+        from Core.NeuronalNetwork.cache import PredictionCache
+
+        cache = PredictionCache()
+        cache.set("v1", 5.0, 75.0)
+
+        assert cache.get("v2", 5.0) is PredictionCache.MISS
+
+    def test_lru_eviction(self):
+        """Test: Se expulsa la entrada menos usada al superar maxsize"""
+        from Core.NeuronalNetwork.cache import PredictionCache
+
+        cache = PredictionCache(maxsize=2)
+        cache.set("v1", 1.0, 55.0)
+        cache.set("v1", 2.0, 60.0)
+        cache.get("v1", 1.0)
+        cache.set("v1", 3.0, 65.0)
+
+        assert cache.get("v1", 2.0) is PredictionCache.MISS
+        assert cache.get("v1", 1.0) == 55.0
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiration(self, monkeypatch):
+        """Test: Las entradas vencidas cuentan como miss"""
+        from Core.NeuronalNetwork import cache as cache_module
+
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        cache = cache_module.PredictionCache(ttl=10)
+        cache.set("v1", 8.0, 90.0)
+        now[0] += 11
+
+        assert cache.get("v1", 8.0) is cache_module.PredictionCache.MISS
+        assert cache.stats()["expirations"] == 1
+
+    def test_registry_load_invalidates(self):
+        """Test: Cargar un modelo nuevo vacía el cache"""
+        from Core.NeuronalNetwork.cache import PredictionCache
+        from Core.NeuronalNetwork.registry import ModelRegistry
+
+        cache = PredictionCache()
+        cache.set("viejo", 1.0, 55.0)
+
+        registry = ModelRegistry(lambda: "modelo")
+        registry.on_load(cache.clear)
+        registry.wait(timeout=2)
+
+        assert len(cache) == 0
+        assert registry.fingerprint == "1"
+
+
+class TestPredictNotes:
+    """Tests para la predicción en lote"""
+
+    @pytest.fixture
+    def network(self, monkeypatch):
+        import numpy as np
+        import Core.NeuronalNetwork as network
+        from Core.NeuronalNetwork.cache import PredictionCache
+        from Core.NeuronalNetwork.compiled import CompiledModel, ACTIVATIONS
+        from Core.NeuronalNetwork.registry import ModelRegistry
+
+        kernel = np.array([[5.0]], np.float32)
+        bias = np.array([50.0], np.float32)
+        model = CompiledModel([(kernel, bias, ACTIVATIONS["linear"])])
+        calls = []
+        forward = network._forward
+
+        def counting_forward(model, hours):
+            calls.append(list(hours))
+            return forward(model, hours)
+
+        registry = ModelRegistry(lambda: model)
+        registry.wait(timeout=2)
+        monkeypatch.setattr(network, "model_registry", registry)
+        monkeypatch.setattr(network, "prediction_cache", PredictionCache())
+        monkeypatch.setattr(network, "_forward", counting_forward)
+        return network, calls
+
+    def test_one_forward_pass_for_misses(self, network):
+        """Test: Solo las entradas fuera del cache pasan por el modelo, en un pass"""
+        network, calls = network
+        network.predict_notes([2.0])
+
+        result = network.predict_notes([1.0, 2.0, 3.0])
+
+        assert result["predicted_notes"] == pytest.approx([55.0, 60.0, 65.0])
+        assert calls == [[2.0], [1.0, 3.0]]
+
+    def test_not_ready(self, monkeypatch):
+        """Test: Lanza ModelNotReady mientras el modelo carga"""
+        import Core.NeuronalNetwork as network
+        from Core.NeuronalNetwork.registry import ModelRegistry, ModelNotReady
+
+        registry = ModelRegistry(lambda: threading.Event().wait(1))
+        monkeypatch.setattr(network, "model_registry", registry)
+
+        with pytest.raises(ModelNotReady):
+            network.predict_notes([1.0])
@@ -1,23 +1,117 @@
 from Core.Logger import Logger
 from Core.Api import RestAPIHandler
+from Core.Api.Server import ThreadPoolHTTPServer, PreforkServer
+from Core.Api.Server.aio import AsyncHTTPServer
+from Core.Channels import WebSocketHandler
+from Core.Channels.Server import WebSocketServer
+from Core.Database import GlobalSqlite
+from Core.Model import Model
 from Infrastructure.Routes import makeRouter
+from Infrastructure.Channels import makeChannels
+from Core.NeuronalNetwork import model_registry, export_compiled
 
+import argparse
+import signal
 import time
 import socketserver
 
 makeRouter(RestAPIHandler)
+makeChannels(WebSocketHandler)
+
+SERVER_MODES = ("single", "threaded", "prefork", "async")
+DEFAULT_WS_PORT = 8765
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="REST API Server")
+    parser.add_argument("--host", default="")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--mode", choices=SERVER_MODES, default="single")
+    parser.add_argument("--threads", type=int, default=32, help="Threads por proceso")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (prefork)")
+    parser.add_argument(
+        "--ws-port",
+        type=int,
+        default=None,
+        help=f"Puerto WebSocket (0 lo desactiva; {DEFAULT_WS_PORT} salvo en prefork)",
+    )
+    args = parser.parse_args(argv)
+
+    # En prefork el padre forkea (y reemplaza) workers todo el tiempo: un
+    # event loop en un thread del padre se copiaría a cada hijo sin su
+    # thread, con el socket y los locks que tuviera tomados en ese momento
+    if args.ws_port is None:
+        args.ws_port = 0 if args.mode == "prefork" else DEFAULT_WS_PORT
+    elif args.ws_port and args.mode == "prefork":
+        parser.error("--ws-port no es compatible con --mode prefork")
+    return args
+
+
+def _models(base=Model):
+    for model in base.__subclasses__():
+        yield model
+        yield from _models(model)
+
+
+def _after_fork():
+    """Cada worker abre sus propias conexiones SQLite y carga su modelo"""
+    db = GlobalSqlite.reconnect()
+    for model in _models():
+        model.setup_db(db, GlobalSqlite.get_reader())
+    model_registry.start()
+
+
+def _terminate(signum, frame):
+    raise KeyboardInterrupt
+
+
+def make_server(args):
+    address = (args.host, args.port)
+
+    if args.mode == "single":
+        return socketserver.TCPServer(address, RestAPIHandler)
+    if args.mode == "threaded":
+        return ThreadPoolHTTPServer(address, RestAPIHandler, max_workers=args.threads)
+    if args.mode == "async":
+        return AsyncHTTPServer(address, RestAPIHandler, max_workers=args.threads)
+    return PreforkServer(
+        address,
+        RestAPIHandler,
+        workers=args.workers,
+        threads=args.threads,
+        post_fork=_after_fork,
+    )
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    signal.signal(signal.SIGTERM, _terminate)
+
     Logger.start("=== REST API Server and Native WebSocket ===\n")
+    # Carga el modelo en segundo plano; mientras tanto /predictions responde 503
+    if args.mode != "prefork":
+        model_registry.start()
+    else:
+        # Un solo export antes del fork; los workers cargan el .npz
+        export_compiled()
+
+    # WebSocket en un thread aparte: un event loop para todos los clientes
+    ws_server = None
+    if args.ws_port:
+        ws_server = WebSocketServer((args.host, args.ws_port), max_workers=args.threads)
+        ws_server.serve_in_thread()
+        print(f"WebSocket running on ws://localhost:{args.ws_port}")
+
     try:
-        # Initialize WebSocket server on thread separate
-        # TODO: Si Quiere Intentar hágale... Yo no quiero estresarme
         time.sleep(0.1)
-        with socketserver.TCPServer(("", 8000), RestAPIHandler) as httpd:
-            print("Server running on http://localhost:8000")
+        with make_server(args) as httpd:
+            print(f"Server running on http://localhost:{args.port} ({args.mode})")
             httpd.serve_forever()
 
     except KeyboardInterrupt:
         Logger.warning("Interrupt signal received (Ctrl+C)")
         Logger.start("Closing servers...")
+        if ws_server is not None:
+            ws_server.shutdown()
+            ws_server.server_close()
         Logger.shutdown()
@@ -20,20 +20,26 @@ def init_model():
     model.train(X_train, y_train, epochs=10)
     logger.info("Model initialized and trained")
 
+def get_token() -> Optional[str]:
+    """Token del header Authorization (con o sin "Bearer ")"""
+    token = request.headers.get('Authorization')
+    
+    # Remover "Bearer " si existe
+    if token and token.startswith('Bearer '):
+        token = token[7:]
+    return token
+
 # Decorador para autenticación
 def require_auth(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        token = request.headers.get('Authorization')
+        token = get_token()
         
         if not token:
             logger.warning("Request without authorization token")
             return jsonify({'error': 'Authorization token required'}), 401
         
-        # Remover "Bearer " si existe
-        if token.startswith('Bearer '):
-            token = token[7:]
-        
+        # Cache en memoria: solo los tokens nuevos o vencidos van a la base
         user_id = db.validate_session(token)
         
         if user_id is None:
@@ -122,6 +128,20 @@ def login():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@app.route('/api/auth/logout', methods=['POST'])
+@require_auth
+def logout(user_id: int):
+    """Endpoint para cerrar la sesión actual"""
+    try:
+        db.delete_session(get_token())
+        logger.info(f"User logged out: user_id={user_id}")
+        return jsonify({'message': 'Logout successful'}), 200
+        
+    except Exception as e:
+        logger.error(f"Logout error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 # ============= ENDPOINTS DE PREDICCIÓN =============
 
 @app.route('/api/predict', methods=['POST'])
@@ -0,0 +1,142 @@
+"""
+Benchmark de validate_session concurrente.
+
+Antes: una conexión nueva por llamada y un lock global alrededor de todo.
+Ahora: un pool acotado de conexiones en modo WAL, sin lock global, con y sin
+el cache de sesiones en memoria. Opcionalmente un thread escribe predicciones
+mientras tanto (--writer). Con --per-request cada llamada corre en un thread
+nuevo, como en el servidor de desarrollo de Flask.
+
+    python scripts/benchmark_database.py --threads 8 --calls 2000 --writer
+    python scripts/benchmark_database.py --threads 8 --calls 500 --per-request
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils.database import Database
+from utils.session_cache import SESSION_CACHE_TTL
+
+
+class LegacyDatabase:
+    """validate_session / save_prediction como estaban antes del pool"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection_lock = threading.Lock()
+
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def validate_session(self, token: str):
+        with self.connection_lock:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT user_id FROM sessions
+                    WHERE token = ? AND expires_at > CURRENT_TIMESTAMP
+                ''', (token,))
+                result = cursor.fetchone()
+                return result['user_id'] if result else None
+
+    def save_prediction(self, user_id, input_text, prediction_text, confidence=None):
+        with self.connection_lock:
+            with self._get_connection() as conn:
+                conn.execute('''
+                    INSERT INTO predictions
+                    (user_id, input_text, prediction_text, confidence)
+                    VALUES (?, ?, ?, ?)
+                ''', (user_id, input_text, prediction_text, confidence))
+                conn.commit()
+
+
+def run(db, token, user_id, threads: int, calls: int, writer: bool, per_request=False):
+    """Devuelve (validaciones por segundo, escrituras hechas)"""
+    stop = threading.Event()
+    writes = [0]
+
+    def write_loop():
+        while not stop.is_set():
+            db.save_prediction(user_id, "bench", "bench", 0.5)
+            writes[0] += 1
+
+    def validate():
+        assert db.validate_session(token) == user_id
+
+    def read_loop():
+        for _ in range(calls):
+            if per_request:
+                request = threading.Thread(target=validate)
+                request.start()
+                request.join()
+            else:
+                validate()
+
+    background = threading.Thread(target=write_loop) if writer else None
+    if background:
+        background.start()
+
+    workers = [threading.Thread(target=read_loop) for _ in range(threads)]
+    begin = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - begin
+
+    stop.set()
+    if background:
+        background.join()
+    return threads * calls / elapsed, writes[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=2000, help="Llamadas por thread")
+    parser.add_argument("--writer", action="store_true", help="Escrituras concurrentes")
+    parser.add_argument("--per-request", action="store_true", help="Un thread por llamada")
+    args = parser.parse_args()
+    options = (args.threads, args.calls, args.writer, args.per_request)
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        pooled = Database(db_path=db_path)
+        user_id = pooled.register_user("bench", "bench@example.com", "bench")
+        token = pooled.create_session(user_id)
+
+        legacy_rate, legacy_writes = run(LegacyDatabase(db_path), token, user_id, *options)
+        # ttl=0: el cache no guarda nada, cada llamada va a la base
+        pooled.sessions.ttl = 0
+        pooled_rate, pooled_writes = run(pooled, token, user_id, *options)
+        pooled.sessions.ttl = SESSION_CACHE_TTL
+        cached_rate, _ = run(pooled, token, user_id, *options)
+        pooled.close()
+
+    print(
+        f"threads={args.threads} llamadas/thread={args.calls} writer={args.writer} "
+        f"per_request={args.per_request}"
+    )
+    print(f"antes (conexión por llamada + lock): {legacy_rate:>10.0f} validaciones/s")
+    print(f"ahora (pool de conexiones, WAL):     {pooled_rate:>10.0f} validaciones/s")
+    print(f"ahora + cache de sesiones:           {cached_rate:>10.0f} validaciones/s")
+    print(f"pool {pooled_rate / legacy_rate:.1f}x, pool + cache {cached_rate / legacy_rate:.1f}x más rápido")
+    if args.writer:
+        print(f"escrituras concurrentes: antes {legacy_writes}, ahora {pooled_writes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -96,6 +96,7 @@ def test_database(temp_db_path):
     Database._initialized = False
     db = Database(db_path=temp_db_path)
     yield db
+    db.close()
     Database._instance = None
     Database._initialized = False
 
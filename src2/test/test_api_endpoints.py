@@ -196,4 +196,14 @@ class TestAPIEndpoints:
         
         assert response.status_code == 200
         assert data['id'] == prediction_id
-        assert data['input_text'] == "Specific test"
\ No newline at end of file
+        assert data['input_text'] == "Specific test"
+    
+    def test_logout_endpoint(self, flask_app, test_token):
+        """Test: Logout invalida el token"""
+        headers = {'Authorization': f'Bearer {test_token}'}
+        
+        response = flask_app.post('/api/auth/logout', headers=headers)
+        assert response.status_code == 200
+        
+        response = flask_app.get('/api/predictions', headers=headers)
+        assert response.status_code == 401
@@ -15,21 +15,20 @@ class TestDatabase:
     
     def test_database_initialization(self, test_database):
         """Test: Base de datos se inicializa con tablas correctas"""
-        conn = test_database._get_connection()
-        cursor = conn.cursor()
-        
-        # Verificar que existen las tablas
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name IN ('users', 'predictions', 'sessions')
-        """)
-        tables = cursor.fetchall()
+        with test_database._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Verificar que existen las tablas
+            cursor.execute("""
+                SELECT name FROM sqlite_master 
+                WHERE type='table' AND name IN ('users', 'predictions', 'sessions')
+            """)
+            tables = cursor.fetchall()
         table_names = [t[0] for t in tables]
         
         assert 'users' in table_names
         assert 'predictions' in table_names
         assert 'sessions' in table_names
-        conn.close()
     
     def test_register_user_success(self, test_database):
         """Test: Registro exitoso de usuario"""
@@ -178,4 +177,175 @@ class TestDatabase:
         assert prediction['user_id'] == test_user['id']
         assert prediction['input_text'] == "Test input"
         assert prediction['prediction_text'] == "NEGATIVE"
-        assert prediction['confidence'] == 0.75
\ No newline at end of file
+        assert prediction['confidence'] == 0.75
+
+class TestConnectionPool:
+    """Tests para el pool de conexiones de Database"""
+    
+    def test_reuses_idle_connection(self, test_database):
+        """Test: Una conexión devuelta al pool se reutiliza, también desde otro thread"""
+        import threading
+        
+        with test_database._get_connection() as conn:
+            pass
+        with test_database._get_connection() as again:
+            assert again is conn
+        
+        other = []
+        
+        def use():
+            with test_database._get_connection() as c:
+                other.append(c)
+        
+        thread = threading.Thread(target=use)
+        thread.start()
+        thread.join()
+        assert other[0] is conn
+    
+    def test_checked_out_connection_is_not_shared(self, test_database):
+        """Test: Mientras una conexión está en uso, otra llamada recibe otra"""
+        with test_database._get_connection() as conn:
+            with test_database._get_connection() as other:
+                assert other is not conn
+    
+    def test_wal_mode(self, test_database):
+        """Test: Las conexiones usan WAL y synchronous=NORMAL"""
+        with test_database._get_connection() as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+    
+    def test_closed_connection_is_replaced(self, test_database, test_user, test_token):
+        """Test: Si se cierra una conexión del pool se abre otra"""
+        with test_database._get_connection() as conn:
+            pass
+        conn.close()
+        assert test_database.validate_session(test_token) == test_user['id']
+    
+    def test_thread_per_request_reuses_connections(self, test_database, test_token, monkeypatch):
+        """Test: Un thread por petición no abre una conexión por petición"""
+        import threading
+        
+        opened = []
+        connect = test_database._connect
+        monkeypatch.setattr(test_database, '_connect', lambda: opened.append(1) or connect())
+        
+        for _ in range(10):
+            thread = threading.Thread(target=test_database.validate_session, args=(test_token,))
+            thread.start()
+            thread.join()
+        
+        assert len(opened) <= 1
+    
+    def test_idle_pool_is_bounded(self, test_database):
+        """Test: Las conexiones que exceden POOL_SIZE se cierran al devolverse"""
+        from contextlib import ExitStack
+        from utils.database import POOL_SIZE
+        
+        with ExitStack() as stack:
+            connections = [
+                stack.enter_context(test_database._get_connection())
+                for _ in range(POOL_SIZE + 2)
+            ]
+        
+        assert len(test_database._idle) == POOL_SIZE
+        assert sum(not test_database._is_open(c) for c in connections) == 2
+    
+    def test_concurrent_reads_and_writes(self, test_database, test_user, test_token):
+        """Test: Lecturas y escrituras concurrentes sin lock global"""
+        import threading
+        
+        errors = []
+        
+        def reader():
+            for _ in range(50):
+                if test_database.validate_session(test_token) != test_user['id']:
+                    errors.append('validate_session')
+        
+        def writer():
+            for i in range(20):
+                test_database.save_prediction(test_user['id'], f"in {i}", "POSITIVE", 0.9)
+        
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        threads += [threading.Thread(target=writer) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert len(test_database.get_user_predictions(test_user['id'], limit=100)) == 40
+
+
+class TestSessionCache:
+    """Tests para el cache de sesiones de validate_session"""
+    
+    def test_hot_token_skips_database(self, test_database, test_user, test_token):
+        """Test: Un token ya validado no vuelve a consultar la base"""
+        statements = []
+        test_database.validate_session(test_token)
+        with test_database._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+        
+        for _ in range(5):
+            assert test_database.validate_session(test_token) == test_user['id']
+        assert statements == []
+        conn.set_trace_callback(None)
+    
+    def test_negative_caching(self, test_database, monkeypatch):
+        """Test: Los tokens inválidos se recuerdan solo NEGATIVE_TTL segundos"""
+        import time
+        from utils.session_cache import NEGATIVE_TTL
+        
+        assert test_database.validate_session('nope') is None
+        entries, hits, misses = test_database.sessions.stats()
+        assert (entries, hits, misses) == (1, 0, 1)
+        assert test_database.validate_session('nope') is None
+        assert test_database.sessions.stats()[1] == 1
+        
+        later = time.monotonic() + NEGATIVE_TTL + 1
+        monkeypatch.setattr(time, 'monotonic', lambda: later)
+        assert test_database.validate_session('nope') is None
+        assert test_database.sessions.stats()[2] == 2
+    
+    def test_ttl_follows_expires_at(self, test_database, test_user):
+        """Test: La entrada no dura más que la sesión"""
+        import time
+        
+        token = test_database.create_session(test_user['id'], expires_in_hours=1 / 3600)
+        assert test_database.validate_session(token) == test_user['id']
+        _, until = test_database.sessions._entries[token]
+        assert until - time.monotonic() <= 1
+    
+    def test_logout_invalidates(self, test_database, test_token):
+        """Test: delete_session borra el token de la base y del cache"""
+        assert test_database.validate_session(test_token) is not None
+        assert test_database.delete_session(test_token) is True
+        assert test_database.validate_session(test_token) is None
+        assert test_database.delete_session(test_token) is False
+    
+    def test_purge_expired_sessions(self, test_database, test_user, test_token):
+        """Test: El barrido borra de la base solo las sesiones vencidas"""
+        expired = test_database.create_session(test_user['id'])
+        with test_database._get_connection() as conn:
+            conn.execute(
+                "UPDATE sessions SET expires_at = datetime('now', '-1 hour') WHERE token = ?",
+                (expired,)
+            )
+        
+        assert test_database.purge_expired_sessions() == 1
+        assert test_database.validate_session(expired) is None
+        assert test_database.validate_session(test_token) == test_user['id']
+    
+    def test_bounded_size(self):
+        """Test: El cache descarta los tokens menos usados al llenarse"""
+        from utils.session_cache import SessionCache, MISSING
+        
+        cache = SessionCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        assert len(cache) == 2
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1
@@ -1,11 +1,20 @@
+import os
 import sqlite3
 import hashlib
 import secrets
+import time
+from contextlib import contextmanager
 from threading import Lock
 from datetime import datetime
 from typing import Optional, Dict, List
 # Logger
 from utils.logger import Logger
+from utils.session_cache import SessionCache, MISSING
+
+# Cada cuánto (s) create_session aprovecha para borrar sesiones vencidas
+SESSION_SWEEP_INTERVAL = 600
+# Conexiones ociosas que se guardan para reutilizar; las que sobran se cierran
+POOL_SIZE = 8
 
 class Database:
     """Singleton Database Manager usando SQLite3"""
@@ -26,23 +35,87 @@ class Database:
         
         self._initialized = True
         self.db_path = db_path
-        self.connection_lock = Lock()
         self.logger = Logger()
         
+        # Pool acotado de conexiones ociosas: cada llamada toma una y la
+        # devuelve, así un servidor con un thread por petición no abre una
+        # conexión nueva por petición. La concurrencia la resuelve SQLite
+        # (WAL + busy_timeout), sin lock global
+        self._pid = os.getpid()
+        self._idle = []
+        self._idle_lock = Lock()
+        
+        # token -> user_id en memoria: validate_session no toca la base para
+        # tokens frecuentes
+        self.sessions = SessionCache()
+        self._last_sweep = time.monotonic()
+        
         # Crear directorio si no existe
-        import os
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
         # Inicializar base de datos
         self._init_db()
         self.logger.info("Database initialized successfully")
     
-    def _get_connection(self):
-        """Obtener conexión thread-safe"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+    def _connect(self):
+        """Nueva conexión en modo WAL: las lecturas no esperan a las escrituras"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
         conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
         return conn
     
+    @contextmanager
+    def _get_connection(self):
+        """
+        Toma una conexión del pool (o abre una) y la devuelve al salir;
+        `with self._get_connection() as conn:` hace commit o rollback como
+        `with conn:`. Las conexiones cerradas o de otro proceso se descartan.
+        """
+        conn = self._checkout()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._checkin(conn)
+    
+    def _checkout(self):
+        with self._idle_lock:
+            if os.getpid() != self._pid:
+                # Las heredadas del padre no se cierran: son del padre
+                self._pid = os.getpid()
+                self._idle = []
+            while self._idle:
+                conn = self._idle.pop()
+                if self._is_open(conn):
+                    return conn
+        return self._connect()
+    
+    def _checkin(self, conn):
+        if not self._is_open(conn):
+            return
+        with self._idle_lock:
+            if os.getpid() == self._pid and len(self._idle) < POOL_SIZE:
+                self._idle.append(conn)
+                return
+        conn.close()
+    
+    @staticmethod
+    def _is_open(conn) -> bool:
+        try:
+            conn.total_changes
+            return True
+        except sqlite3.ProgrammingError:
+            return False
+    
+    def close(self):
+        """Cerrar las conexiones ociosas del pool"""
+        with self._idle_lock:
+            connections, self._idle = self._idle, []
+        for conn in connections:
+            conn.close()
+    
     def _init_db(self):
         """Inicializar tablas de la base de datos"""
         with self._get_connection() as conn:
@@ -98,141 +171,175 @@ class Database:
     
     def register_user(self, username: str, email: str, password: str) -> Optional[int]:
         """Registrar nuevo usuario"""
-        with self.connection_lock:
-            try:
-                salt = self._generate_salt()
-                password_hash = self._hash_password(password, salt)
+        try:
+            salt = self._generate_salt()
+            password_hash = self._hash_password(password, salt)
+            
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO users (username, email, password_hash, salt)
+                    VALUES (?, ?, ?, ?)
+                ''', (username, email, password_hash, salt))
+                conn.commit()
+                user_id = cursor.lastrowid
                 
-                with self._get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        INSERT INTO users (username, email, password_hash, salt)
-                        VALUES (?, ?, ?, ?)
-                    ''', (username, email, password_hash, salt))
-                    conn.commit()
-                    user_id = cursor.lastrowid
-                    
-                self.logger.info(f"User registered: {username} (ID: {user_id})")
-                return user_id
-            except sqlite3.IntegrityError as e:
-                self.logger.error(f"Registration failed: {e}")
-                return None
+            self.logger.info(f"User registered: {username} (ID: {user_id})")
+            return user_id
+        except sqlite3.IntegrityError as e:
+            self.logger.error(f"Registration failed: {e}")
+            return None
     
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
         """Autenticar usuario"""
-        with self.connection_lock:
-            try:
-                with self._get_connection() as conn:
-                    cursor = conn.cursor()
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT id, username, email, password_hash, salt
+                    FROM users WHERE username = ?
+                ''', (username,))
+                
+                user = cursor.fetchone()
+                
+                if user is None:
+                    self.logger.warning(f"Login attempt for non-existent user: {username}")
+                    return None
+                
+                # Verificar password
+                password_hash = self._hash_password(password, user['salt'])
+                
+                if password_hash == user['password_hash']:
+                    # Actualizar last_login
                     cursor.execute('''
-                        SELECT id, username, email, password_hash, salt
-                        FROM users WHERE username = ?
-                    ''', (username,))
-                    
-                    user = cursor.fetchone()
-                    
-                    if user is None:
-                        self.logger.warning(f"Login attempt for non-existent user: {username}")
-                        return None
-                    
-                    # Verificar password
-                    password_hash = self._hash_password(password, user['salt'])
+                        UPDATE users SET last_login = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (user['id'],))
+                    conn.commit()
                     
-                    if password_hash == user['password_hash']:
-                        # Actualizar last_login
-                        cursor.execute('''
-                            UPDATE users SET last_login = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        ''', (user['id'],))
-                        conn.commit()
-                        
-                        self.logger.info(f"User authenticated: {username}")
-                        return {
-                            'id': user['id'],
-                            'username': user['username'],
-                            'email': user['email']
-                        }
-                    else:
-                        self.logger.warning(f"Failed login attempt for user: {username}")
-                        return None
-            except Exception as e:
-                self.logger.error(f"Authentication error: {e}")
-                return None
+                    self.logger.info(f"User authenticated: {username}")
+                    return {
+                        'id': user['id'],
+                        'username': user['username'],
+                        'email': user['email']
+                    }
+                else:
+                    self.logger.warning(f"Failed login attempt for user: {username}")
+                    return None
+        except Exception as e:
+            self.logger.error(f"Authentication error: {e}")
+            return None
     
     def create_session(self, user_id: int, expires_in_hours: int = 24) -> str:
         """Crear sesión de usuario"""
-        with self.connection_lock:
-            token = secrets.token_urlsafe(32)
-            expires_at = datetime.now().timestamp() + (expires_in_hours * 3600)
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO sessions (user_id, token, expires_at)
-                    VALUES (?, ?, datetime(?, 'unixepoch'))
-                ''', (user_id, token, expires_at))
-                conn.commit()
-            
-            self.logger.info(f"Session created for user_id: {user_id}")
-            return token
+        token = secrets.token_urlsafe(32)
+        expires_at = datetime.now().timestamp() + (expires_in_hours * 3600)
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO sessions (user_id, token, expires_at)
+                VALUES (?, ?, datetime(?, 'unixepoch'))
+            ''', (user_id, token, expires_at))
+            conn.commit()
+        
+        self.sessions.invalidate(token)
+        self.logger.info(f"Session created for user_id: {user_id}")
+        
+        if time.monotonic() - self._last_sweep > SESSION_SWEEP_INTERVAL:
+            self.purge_expired_sessions()
+        return token
     
     def validate_session(self, token: str) -> Optional[int]:
-        """Validar token de sesión"""
-        with self.connection_lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT user_id FROM sessions
-                    WHERE token = ? AND expires_at > CURRENT_TIMESTAMP
-                ''', (token,))
-                
-                result = cursor.fetchone()
-                return result['user_id'] if result else None
+        """Validar token de sesión (primero en el cache en memoria)"""
+        user_id = self.sessions.get(token)
+        if user_id is not MISSING:
+            return user_id
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT user_id, CAST(strftime('%s', expires_at) AS INTEGER) AS expires
+                FROM sessions
+                WHERE token = ? AND expires_at > CURRENT_TIMESTAMP
+            ''', (token,))
+            
+            result = cursor.fetchone()
+        
+        if result is None:
+            self.sessions.set(token, None)
+            return None
+        self.sessions.set(token, result['user_id'], result['expires'])
+        return result['user_id']
+    
+    def delete_session(self, token: str) -> bool:
+        """Cerrar sesión (logout): la borra de la base y del cache"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM sessions WHERE token = ?', (token,))
+            conn.commit()
+            deleted = cursor.rowcount > 0
+        
+        self.sessions.invalidate(token)
+        if deleted:
+            self.logger.info("Session closed")
+        return deleted
+    
+    def purge_expired_sessions(self) -> int:
+        """Borrar sesiones vencidas de la base y del cache"""
+        self._last_sweep = time.monotonic()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM sessions WHERE expires_at <= CURRENT_TIMESTAMP')
+            conn.commit()
+            purged = cursor.rowcount
+        
+        self.sessions.purge_expired()
+        if purged:
+            self.logger.info(f"Expired sessions purged: {purged}")
+        return purged
     
     def save_prediction(self, user_id: int, input_text: str, 
                        prediction_text: str, confidence: float = None) -> int:
         """Guardar predicción en la base de datos"""
-        with self.connection_lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO predictions 
-                    (user_id, input_text, prediction_text, confidence)
-                    VALUES (?, ?, ?, ?)
-                ''', (user_id, input_text, prediction_text, confidence))
-                conn.commit()
-                prediction_id = cursor.lastrowid
-            
-            self.logger.info(f"Prediction saved: ID={prediction_id}, user_id={user_id}")
-            return prediction_id
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO predictions 
+                (user_id, input_text, prediction_text, confidence)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, input_text, prediction_text, confidence))
+            conn.commit()
+            prediction_id = cursor.lastrowid
+        
+        self.logger.info(f"Prediction saved: ID={prediction_id}, user_id={user_id}")
+        return prediction_id
     
     def get_user_predictions(self, user_id: int, limit: int = 10) -> List[Dict]:
         """Obtener predicciones de un usuario"""
-        with self.connection_lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, input_text, prediction_text, confidence, created_at
-                    FROM predictions
-                    WHERE user_id = ?
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                ''', (user_id, limit))
-                
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, input_text, prediction_text, confidence, created_at
+                FROM predictions
+                WHERE user_id = ?
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (user_id, limit))
+            
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
     
     def get_prediction_by_id(self, prediction_id: int) -> Optional[Dict]:
         """Obtener predicción por ID"""
-        with self.connection_lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT p.*, u.username
-                    FROM predictions p
-                    JOIN users u ON p.user_id = u.id
-                    WHERE p.id = ?
-                ''', (prediction_id,))
-                
-                row = cursor.fetchone()
-                return dict(row) if row else None
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT p.*, u.username
+                FROM predictions p
+                JOIN users u ON p.user_id = u.id
+                WHERE p.id = ?
+            ''', (prediction_id,))
+            
+            row = cursor.fetchone()
+            return dict(row) if row else None
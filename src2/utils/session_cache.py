@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+# Máximo de tokens en memoria (LRU)
+SESSION_CACHE_SIZE = 10000
+# Un token válido se revalida contra la base como mucho cada tanto (s), por
+# si otro proceso cerró la sesión
+SESSION_CACHE_TTL = 300
+# Tokens inválidos: se recuerdan poco tiempo (s)
+NEGATIVE_TTL = 5
+
+MISSING = object()
+
+
+class SessionCache:
+    """Cache en memoria token -> user_id con vencimiento, acotado (LRU)"""
+    
+    def __init__(self, max_size: int = SESSION_CACHE_SIZE,
+                 ttl: float = SESSION_CACHE_TTL, negative_ttl: float = NEGATIVE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # token -> (user_id | None, vence en monotonic)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, token: str):
+        """user_id, None (token inválido cacheado) o MISSING si hay que consultar"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, token: str, user_id: Optional[int], expires_at: float = None):
+        """
+        Guarda el resultado de validar `token`. `expires_at` (epoch) es el
+        vencimiento de la sesión: la entrada nunca dura más que la sesión.
+        """
+        if user_id is None:
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl
+            if expires_at is not None:
+                ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+        
+        with self._lock:
+            self._entries[token] = (user_id, time.monotonic() + ttl)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+    
+    def purge_expired(self) -> int:
+        """Borra las entradas vencidas; devuelve cuántas"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [token for token, (_, until) in self._entries.items() if until <= now]
+            for token in expired:
+                del self._entries[token]
+        return len(expired)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Tuple[int, int, int]:
+        """(entradas, hits, misses)"""
+        return len(self._entries), self.hits, self.misses
+    
+    def __len__(self):
+        return len(self._entries)